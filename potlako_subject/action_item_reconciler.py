@@ -0,0 +1,193 @@
+from collections import namedtuple, OrderedDict
+
+from django.apps import apps as django_apps
+from edc_action_item.site_action_items import site_action_items
+from edc_constants.constants import DEAD, NEW, OPEN, YES
+from potlako_prn.action_items import DEATH_REPORT_ACTION
+from potlako_prn.action_items import SUBJECT_OFFSTUDY_ACTION
+
+from .action_items import SUBJECT_LOCATOR_ACTION
+
+ActionItemRule = namedtuple(
+    'ActionItemRule',
+    ['model', 'field', 'response', 'reference_model', 'action_name',
+     'subject_identifier_attr', 'repeat'])
+
+action_item_rules = (
+    ActionItemRule(
+        'potlako_subject.patientcallfollowup', 'patient_info_change', YES,
+        'potlako_subject.subjectlocator', SUBJECT_LOCATOR_ACTION,
+        'subject_visit__subject_identifier', True),
+    ActionItemRule(
+        'potlako_subject.subjectvisit', 'survival_status', DEAD,
+        'potlako_prn.deathreport', DEATH_REPORT_ACTION,
+        'subject_identifier', False),
+    ActionItemRule(
+        'potlako_subject.homevisit', 'visit_outcome', DEAD,
+        'potlako_prn.deathreport', DEATH_REPORT_ACTION,
+        'subject_visit__subject_identifier', False),
+    ActionItemRule(
+        'potlako_subject.homevisit', 'visit_outcome', 'ltfu',
+        'potlako_prn.coordinatorexit', SUBJECT_OFFSTUDY_ACTION,
+        'subject_visit__subject_identifier', False),
+    ActionItemRule(
+        'potlako_subject.cancerdxandtx', 'cancer_evaluation', 'unable_to_complete',
+        'potlako_prn.subjectoffstudy', SUBJECT_OFFSTUDY_ACTION,
+        'subject_visit__subject_identifier', False),
+    ActionItemRule(
+        'potlako_subject.cancerdxandtx', 'cancer_treatment', YES,
+        'potlako_prn.subjectoffstudy', SUBJECT_OFFSTUDY_ACTION,
+        'subject_visit__subject_identifier', False),
+)
+
+
+class ActionItemReconciler:
+    """Evaluates (field, response, action) rules for many subjects with
+    set-based queries and creates, reopens or deletes action items.
+
+    For each subject and action, the action item is required if any
+    evaluated rule for that action matches, and the subject has no
+    reference model instance or the matching rule repeats. A required
+    action item is created or reopened. If none of the evaluated rules
+    match, NEW and OPEN action items are deleted.
+
+    Set `dry_run` to only report the changes.
+    """
+
+    def __init__(self, rules=None, dry_run=None):
+        self.rules = rules or action_item_rules
+        self.dry_run = dry_run
+
+    @property
+    def action_item_model_cls(self):
+        reference_model_cls = django_apps.get_model(self.rules[0].reference_model)
+        action_cls = site_action_items.get(reference_model_cls.action_name)
+        return action_cls.action_item_model_cls()
+
+    def reconcile_instance(self, instance):
+        """Reconciles action items for the rules of a single model
+        instance, e.g. from a post_save signal.
+        """
+        rules = [rule for rule in self.rules
+                 if rule.model == instance._meta.label_lower]
+        responses = {}
+        for rule in rules:
+            subject_identifier = instance
+            for attr in rule.subject_identifier_attr.split('__'):
+                subject_identifier = getattr(subject_identifier, attr)
+            responses.update(
+                {(subject_identifier, rule): getattr(instance, rule.field)})
+        return self.apply(rules, responses)
+
+    def reconcile(self, subject_identifiers=None):
+        """Reconciles action items using the latest modified instance of
+        each rule model per subject.
+
+        Pass subject_identifiers to limit the subjects evaluated.
+        """
+        rules_by_model = OrderedDict()
+        for rule in self.rules:
+            rules_by_model.setdefault(rule.model, []).append(rule)
+
+        responses = {}
+        for model, rules in rules_by_model.items():
+            model_cls = django_apps.get_model(model)
+            subject_identifier_attr = rules[0].subject_identifier_attr
+            fields = list(dict.fromkeys(rule.field for rule in rules))
+            queryset = model_cls.objects.order_by('modified')
+            if subject_identifiers is not None:
+                queryset = queryset.filter(
+                    **{f'{subject_identifier_attr}__in': subject_identifiers})
+            for row in queryset.values_list(
+                    subject_identifier_attr, *fields).iterator():
+                values = dict(zip(fields, row[1:]))
+                for rule in rules:
+                    responses.update({(row[0], rule): values.get(rule.field)})
+        return self.apply(self.rules, responses)
+
+    def apply(self, rules, responses):
+        """Compares the required action items for the responses to the
+        existing action items, read in bulk, and applies the changes.
+        Reopened action items are saved one at a time so their history
+        and outgoing transactions are kept.
+
+        Returns a report dictionary.
+        """
+        report = dict(created=[], reopened=[], deleted=[])
+        if not responses:
+            return report
+
+        subject_identifiers = {
+            subject_identifier for subject_identifier, _ in responses}
+        action_names = {rule.action_name for rule in rules}
+
+        matched = {}
+        not_matched = set()
+        for (subject_identifier, rule), response in responses.items():
+            key = (subject_identifier, rule.action_name)
+            if response == rule.response:
+                matched.setdefault(key, []).append(rule)
+            else:
+                not_matched.add(key)
+
+        reference_models = {
+            rule.reference_model for rules in matched.values() for rule in rules
+            if not rule.repeat}
+        with_reference = {}
+        for reference_model in reference_models:
+            reference_model_cls = django_apps.get_model(reference_model)
+            with_reference[reference_model] = set(
+                reference_model_cls.objects.filter(
+                    subject_identifier__in=subject_identifiers).values_list(
+                        'subject_identifier', flat=True))
+
+        action_items = {}
+        for pk, subject_identifier, action_name, status in (
+                self.action_item_model_cls.objects.filter(
+                    subject_identifier__in=subject_identifiers,
+                    action_type__name__in=action_names).values_list(
+                        'pk', 'subject_identifier', 'action_type__name',
+                        'status')):
+            action_items.setdefault(
+                (subject_identifier, action_name), []).append((pk, status))
+
+        create, reopen, delete = [], [], []
+        for key, matched_rules in matched.items():
+            subject_identifier, _ = key
+            trigger = any(
+                rule.repeat or
+                subject_identifier not in with_reference.get(rule.reference_model)
+                for rule in matched_rules)
+            if trigger:
+                existing = action_items.get(key)
+                if not existing:
+                    create.append(key)
+                else:
+                    reopen.extend(
+                        (key, pk) for pk, status in existing if status != OPEN)
+        for key in not_matched - set(matched):
+            delete.extend(
+                (key, pk) for pk, status in action_items.get(key, [])
+                if status in [NEW, OPEN])
+
+        report.update(
+            created=create,
+            reopened=[key for key, _ in reopen],
+            deleted=[key for key, _ in delete])
+
+        if not self.dry_run:
+            if reopen:
+                for action_item in self.action_item_model_cls.objects.filter(
+                        pk__in=[pk for _, pk in reopen]):
+                    action_item.status = OPEN
+                    action_item.save(update_fields=['status'])
+            if delete:
+                self.action_item_model_cls.objects.filter(
+                    pk__in=[pk for _, pk in delete]).delete()
+            for subject_identifier, action_name in create:
+                action_cls = site_action_items.get(action_name)
+                action_cls(subject_identifier=subject_identifier)
+        return report
+
+
+action_item_reconciler = ActionItemReconciler()
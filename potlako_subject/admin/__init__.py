@@ -5,6 +5,7 @@ from potlako_subject.admin.navigation_summary_and_plan_admin import NavigationPl
 from .baseline_clinical_summary_admin import BaselineClincalSummaryAdmin
 from .baseline_roadmap_admin import BaselineRoadMapAdmin
 from .clinician_call_enrollment_admin import ClinicianCallEnrollmentAdmin
+from .due_call_admin import DueCallAdmin
 from .home_visit_admin import HomeVisitAdmin
 from .investigations_ordered_admin import InvestigationsOrderedAdmin
 from .investigations_resulted_admin import InvestigationsResultedAdmin
@@ -15,6 +16,7 @@ from .patient_availability_log_admin import PatientAvailabilityLogEntryAdmin
 from .patient_call_followup_admin import PatientCallFollowUpAdmin
 from .patient_call_initial_admin import PatientCallInitialAdmin
 from .sms_admin import SMSAdmin
+from .sms_reminder_admin import SmsReminderAdmin
 from .subject_consent_admin import SubjectConsentAdmin
 from .subject_locator_admin import SubjectLocatorAdmin
 from .subject_screening_admin import SubjectScreeningAdmin
@@ -0,0 +1,51 @@
+import csv
+
+from django.contrib.auth import get_permission_codename
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from edc_base.utils import get_utcnow
+
+from ..export import ModelExporter
+
+
+class Echo:
+    """A file-like object that returns what is written, for csv.writer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_crf_as_csv(modeladmin, request, queryset):
+    """Streams the selected rows as CSV, read and decrypted in chunks.
+    """
+    exporter = ModelExporter(model_cls=queryset.model)
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(exporter.header)
+        for row in exporter.rows(queryset):
+            yield writer.writerow(row)
+
+    opts = queryset.model._meta
+    filename = f'{opts.model_name}_{get_utcnow().strftime("%Y%m%d%H%M%S")}.csv'
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+export_crf_as_csv.short_description = _('Export selected %(verbose_name_plural)s as CSV')
+export_crf_as_csv.allowed_permissions = ('export',)
+
+
+class ExportActionModelAdminMixin:
+    """Offers export_crf_as_csv to users with the model's export
+    permission.
+    """
+
+    actions = [export_crf_as_csv]
+
+    def has_export_permission(self, request):
+        opts = self.opts
+        codename = get_permission_codename('export', opts)
+        return request.user.has_perm(f'{opts.app_label}.{codename}')
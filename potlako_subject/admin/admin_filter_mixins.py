@@ -1,10 +1,24 @@
 from django.apps import apps as django_apps
+from django.conf import settings
 from django.contrib import admin
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
 from django.utils.translation import gettext_lazy as _
 from ..choices import ENROLLMENT_SITES
+from ..community_arm import INTERVENTION, STANDARD_OF_CARE
+from ..community_arm import community_arm_subjects
 
 
 class FacilityListFilter(admin.SimpleListFilter):
+    """Filters a screening or subject keyed changelist by the facility
+    of the clinician call enrollment, using a subquery.
+
+    Set `identifier_field` to the changelist model's field that matches
+    `enrollment_field` on the clinician call enrollment.
+
+    The sidebar shows the number of rows per facility, cached for
+    POTLAKO_FACILITY_COUNT_CACHE_TIMEOUT seconds.
+    """
     # Human-readable title which will be displayed in the
     # right admin sidebar just above the filter options.
     title = _('Facility')
@@ -12,6 +26,14 @@ class FacilityListFilter(admin.SimpleListFilter):
     # Parameter for the filter that will be used in the URL query.
     parameter_name = 'facility'
 
+    enrollment_model = 'potlako_subject.cliniciancallenrollment'
+    identifier_field = 'screening_identifier'
+    enrollment_field = 'screening_identifier'
+
+    @property
+    def enrollment_cls(self):
+        return django_apps.get_model(self.enrollment_model)
+
     def lookups(self, request, model_admin):
         """
         Returns a list of tuples. The first element in each
@@ -20,7 +42,29 @@ class FacilityListFilter(admin.SimpleListFilter):
         human-readable name for the option that will appear
         in the right sidebar.
         """
-        return ENROLLMENT_SITES
+        counts = self.facility_counts(model_admin.model)
+        return [(facility, f'{name} ({counts.get(facility, 0)})')
+                for facility, name in ENROLLMENT_SITES]
+
+    def facility_counts(self, model_cls):
+        """Returns a dictionary of row count by facility for model_cls,
+        counted in one query.
+        """
+        cache_key = (f'potlako_subject.facility_counts.{model_cls._meta.label_lower}.'
+                     f'{self.identifier_field}')
+        counts = cache.get(cache_key)
+        if counts is None:
+            facility = self.enrollment_cls.objects.filter(
+                **{self.enrollment_field: OuterRef(self.identifier_field)}).values(
+                    'facility')[:1]
+            counts = dict(model_cls.objects.annotate(
+                enrollment_facility=Subquery(facility)).order_by().values(
+                    'enrollment_facility').annotate(
+                        count=Count('pk')).values_list(
+                            'enrollment_facility', 'count'))
+            cache.set(cache_key, counts, getattr(
+                settings, 'POTLAKO_FACILITY_COUNT_CACHE_TIMEOUT', 300))
+        return counts
 
     def queryset(self, request, queryset):
         """
@@ -28,16 +72,43 @@ class FacilityListFilter(admin.SimpleListFilter):
         provided in the query string and retrievable via
         `self.value()`.
         """
-        # Compare the requested value (either '80s' or '90s')
-        # to decide how to filter the queryset.
-        clinician_enrollment_cls = django_apps.get_model(
-            'potlako_subject.cliniciancallenrollment')
+        if not self.value():
+            return queryset
+        identifiers = self.enrollment_cls.objects.filter(
+            facility=self.value()).values(self.enrollment_field)
+        return queryset.filter(
+            **{f'{self.identifier_field}__in': identifiers})
+
+
+class SubjectFacilityListFilter(FacilityListFilter):
+    """Facility filter for changelists keyed by subject identifier.
+    """
 
-        clinician_call_enrol_ids = clinician_enrollment_cls.objects.values_list(
-            'screening_identifier', flat=True).filter(facility=self.value())
+    identifier_field = 'subject_identifier'
+    enrollment_field = 'subject_identifier'
 
-        if clinician_call_enrol_ids:
 
-            return queryset.filter(screening_identifier__in=clinician_call_enrol_ids)
-        else:
+class CommunityArmListFilter(admin.SimpleListFilter):
+    """Filters an appointment keyed changelist by the indexed
+    OnSchedule.community_arm column.
+
+    Set `identifier_field` to the changelist model's lookup for the
+    subject identifier.
+    """
+
+    title = _('Community arm')
+
+    parameter_name = 'community_arm'
+
+    identifier_field = 'appointment__subject_identifier'
+
+    def lookups(self, request, model_admin):
+        return ((INTERVENTION, INTERVENTION),
+                (STANDARD_OF_CARE, STANDARD_OF_CARE))
+
+    def queryset(self, request, queryset):
+        if not self.value():
             return queryset
+        return queryset.filter(
+            **{f'{self.identifier_field}__in': community_arm_subjects(
+                self.value())})
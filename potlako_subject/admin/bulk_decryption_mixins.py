@@ -0,0 +1,43 @@
+from django.forms.models import BaseInlineFormSet
+
+from ..bulk_decryption import bulk_decryptor
+from .changelist import extend_changelist
+
+
+class BulkDecryptionChangeListMixin:
+    """Decrypts the encrypted columns of the changelist page in one
+    batch.
+    """
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = bulk_decryptor.queryset(
+            self.result_list,
+            field_names=self.model_admin.bulk_decrypt_fields)
+
+
+class BulkDecryptionAdminMixin:
+    """Model admin mixin to bulk decrypt the changelist page.
+
+    Set `bulk_decrypt_fields` to limit the encrypted fields decrypted
+    in bulk, otherwise all encrypted fields are.
+    """
+
+    bulk_decrypt_fields = None
+
+    def get_changelist(self, request, **kwargs):
+        return extend_changelist(
+            BulkDecryptionChangeListMixin,
+            super().get_changelist(request, **kwargs))
+
+
+class BulkDecryptionInlineFormSet(BaseInlineFormSet):
+    """Inline formset that decrypts the encrypted fields of its
+    instances in one batch.
+    """
+
+    def get_queryset(self):
+        if not hasattr(self, '_bulk_decrypted'):
+            self._bulk_decrypted = bulk_decryptor.queryset(
+                super().get_queryset())
+        return self._bulk_decrypted
@@ -0,0 +1,11 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def extend_changelist(mixin, changelist):
+    """Returns a ChangeList class with mixin applied to changelist so
+    that model admin mixins can each contribute to the changelist.
+    """
+    if issubclass(changelist, mixin):
+        return changelist
+    return type(changelist.__name__, (mixin, changelist), {})
@@ -5,6 +5,9 @@ from edc_model_admin import audit_fieldset_tuple
 from ..admin_site import potlako_subject_admin
 from ..forms import ClinicianCallEnrollmentForm, NextOfKinForm
 from ..models import ClinicianCallEnrollment, NextOfKin
+from .actions import ExportActionModelAdminMixin
+from .bulk_decryption_mixins import (
+    BulkDecryptionAdminMixin, BulkDecryptionInlineFormSet)
 from .subject_screening_admin import ModelAdminMixin
 
 
@@ -12,6 +15,7 @@ class NextOfKinInlineAdmin(TabularInlineMixin, admin.TabularInline):
 
     model = NextOfKin
     form = NextOfKinForm
+    formset = BulkDecryptionInlineFormSet
     extra = 1
     max_num = 2
 
@@ -28,7 +32,9 @@ class NextOfKinInlineAdmin(TabularInlineMixin, admin.TabularInline):
 
 
 @admin.register(ClinicianCallEnrollment, site=potlako_subject_admin)
-class ClinicianCallEnrollmentAdmin(ModelAdminMixin, admin.ModelAdmin):
+class ClinicianCallEnrollmentAdmin(ExportActionModelAdminMixin,
+                                  BulkDecryptionAdminMixin, ModelAdminMixin,
+                                  admin.ModelAdmin):
 
     form = ClinicianCallEnrollmentForm
     inlines = [NextOfKinInlineAdmin, ]
@@ -132,8 +138,6 @@ class ClinicianCallEnrollmentAdmin(ModelAdminMixin, admin.ModelAdmin):
 
     filter_horizontal = ('symptoms',)
 
-    actions = ['export_crf_as_csv']
-
     search_fields = ('screening_identifier',)
 
     list_display = ('screening_identifier', 'subject_identifier', 'suspected_cancer',
@@ -0,0 +1,54 @@
+from dateutil.relativedelta import relativedelta
+from django.contrib import admin
+from edc_base.utils import get_utcnow
+
+from ..admin_site import potlako_subject_admin
+from ..models import DueCall
+
+
+class DueDateFilter(admin.SimpleListFilter):
+    title = 'Due date'
+    parameter_name = 'due'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('today', 'Due today or overdue'),
+            ('weekly', 'Due within a week'),
+            ('monthly', 'Due within a month')]
+
+    def queryset(self, request, queryset):
+        today = get_utcnow().date()
+        if self.value() == 'today':
+            return queryset.filter(due_date__lte=today)
+        if self.value() == 'weekly':
+            return queryset.filter(due_date__lte=today + relativedelta(days=7))
+        if self.value() == 'monthly':
+            return queryset.filter(due_date__lte=today + relativedelta(months=1))
+        return queryset
+
+
+@admin.register(DueCall, site=potlako_subject_admin)
+class DueCallAdmin(admin.ModelAdmin):
+    """A read-only call worklist, highest priority and earliest due
+    first.
+    """
+
+    list_display = ('subject_identifier', 'screening_identifier', 'source',
+                    'due_date', 'priority')
+
+    list_filter = (DueDateFilter, 'source')
+
+    search_fields = ('subject_identifier', 'screening_identifier')
+
+    ordering = ('priority', 'due_date')
+
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -4,6 +4,7 @@ from edc_model_admin import audit_fieldset_tuple, TabularInlineMixin
 from dateutil.relativedelta import relativedelta
 from ..admin_site import potlako_subject_admin
 from ..forms import MissedCallForm, MissedCallRecordForm
+from ..missed_call_counter import missed_call_records_bulk
 from ..models import MissedCall, MissedCallRecord
 
 from .modeladmin_mixins import CrfModelAdminMixin
@@ -36,18 +37,20 @@ class RepeatCallFilter(admin.SimpleListFilter):
             ('monthly', 'This month')]
 
     def queryset(self, request, queryset):
+        today = get_utcnow().date()
         if self.value() == 'today':
             missedcallrecord_qs = MissedCallRecord.objects.filter(
-                repeat_call=get_utcnow().date())
+                repeat_call=today)
             return self.related_qs(queryset, missedcallrecord_qs)
         if self.value() == 'weekly':
-            one_week = get_utcnow() + relativedelta(days=7)
             missedcallrecord_qs = MissedCallRecord.objects.filter(
-                repeat_call__range=[get_utcnow().date(), one_week.date()])
+                repeat_call__range=[today, today + relativedelta(days=7)])
             return self.related_qs(queryset, missedcallrecord_qs)
         if self.value() == 'monthly':
+            first_day = today.replace(day=1)
             missedcallrecord_qs = MissedCallRecord.objects.filter(
-                repeat_call__month=get_utcnow().month)
+                repeat_call__range=[
+                    first_day, first_day + relativedelta(months=1, days=-1)])
             return self.related_qs(queryset, missedcallrecord_qs)
 
     def related_qs(self, queryset, qs):
@@ -67,3 +70,7 @@ class MissedCallAdmin(CrfModelAdminMixin, admin.ModelAdmin):
         }), audit_fieldset_tuple)
 
     list_filter = (RepeatCallFilter, )
+
+    def save_related(self, request, form, formsets, change):
+        with missed_call_records_bulk():
+            super().save_related(request, form, formsets, change)
@@ -11,18 +11,20 @@ from edc_model_admin import (
     ModelAdminFormInstructionsMixin, ModelAdminInstitutionMixin,
     ModelAdminNextUrlRedirectMixin, ModelAdminReadOnlyMixin,
     ModelAdminRedirectOnDeleteMixin)
-from ..models.model_mixins import BaselineRoadMapMixin
+from ..models.model_mixins import LazyBaselineRoadMap
+from .actions import ExportActionModelAdminMixin
+from .paginator_mixins import PaginatorModelAdminMixin
 from edc_metadata import NextFormGetter
 from edc_visit_tracking.modeladmin_mixins import (
     CrfModelAdminMixin as VisitTrackingCrfModelAdminMixin)
 
 
 class ModelAdminMixin(
-        ModelAdminNextUrlRedirectMixin, ModelAdminFormInstructionsMixin,
-        ModelAdminFormAutoNumberMixin, ModelAdminRevisionMixin,
-        ModelAdminAuditFieldsMixin, ModelAdminReadOnlyMixin,
-        ModelAdminInstitutionMixin, ModelAdminRedirectOnDeleteMixin,
-        ModelAdminSiteMixin):
+        PaginatorModelAdminMixin, ModelAdminNextUrlRedirectMixin,
+        ModelAdminFormInstructionsMixin, ModelAdminFormAutoNumberMixin,
+        ModelAdminRevisionMixin, ModelAdminAuditFieldsMixin,
+        ModelAdminReadOnlyMixin, ModelAdminInstitutionMixin,
+        ModelAdminRedirectOnDeleteMixin, ModelAdminSiteMixin):
 
     list_per_page = 10
     date_hierarchy = 'modified'
@@ -30,14 +32,19 @@ class ModelAdminMixin(
     next_form_getter_cls = NextFormGetter
     extra_context_models = None
 
+    def baseline_roadmap_context(self, request):
+        """Returns lazy Baseline Roadmap values for the
+        `extra_context_models` of this admin.
+        """
+        return LazyBaselineRoadMap(
+            subject_identifier=request.GET.get('subject_identifier'),
+            keys=self.extra_context_models).lazy_items()
+
     def add_view(self, request, form_url='', extra_context=None):
 
         extra_context = extra_context or {}
         if self.extra_context_models:
-            extra_context_dict = BaselineRoadMapMixin(
-                subject_identifier=request.GET.get(
-                    'subject_identifier')).baseline_dict
-            [extra_context.update({key: extra_context_dict.get(key)})for key in self.extra_context_models]
+            extra_context.update(self.baseline_roadmap_context(request))
         return super().add_view(
             request, form_url=form_url, extra_context=extra_context)
 
@@ -45,20 +52,19 @@ class ModelAdminMixin(
 
         extra_context = extra_context or {}
         if self.extra_context_models:
-            extra_context_dict = BaselineRoadMapMixin(
-                subject_identifier=request.GET.get(
-                    'subject_identifier')).baseline_dict
-            [extra_context.update({key: extra_context_dict.get(key)})for key in self.extra_context_models]
+            extra_context.update(self.baseline_roadmap_context(request))
         return super().change_view(
             request, object_id, form_url=form_url, extra_context=extra_context)
 
 
-class CrfModelAdminMixin(VisitTrackingCrfModelAdminMixin,
+class CrfModelAdminMixin(ExportActionModelAdminMixin,
+                         VisitTrackingCrfModelAdminMixin,
                          ModelAdminMixin,
                          FieldsetsModelAdminMixin,
                          FormAsJSONModelAdminMixin,
                          admin.ModelAdmin):
 
+    ordering = ('-modified', '-id')
     post_url_on_delete_name = settings.DASHBOARD_URL_NAMES.get(
         'subject_dashboard_url')
     instructions = (
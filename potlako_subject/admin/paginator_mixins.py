@@ -0,0 +1,200 @@
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .changelist import extend_changelist
+
+KEYSET_VAR = 'after'
+
+
+def cache_timeout():
+    return getattr(settings, 'POTLAKO_ADMIN_COUNT_CACHE_TIMEOUT', 300)
+
+
+def query_cache_key(prefix, queryset, *args):
+    """Returns a cache key for the SQL of queryset and args or None if
+    the queryset cannot match any rows.
+    """
+    try:
+        sql = str(queryset.query)
+    except EmptyResultSet:
+        return None
+    digest = hashlib.md5(f'{sql}{args}'.encode()).hexdigest()
+    return (f'potlako_subject.{prefix}.'
+            f'{queryset.model._meta.label_lower}.{digest}')
+
+
+def estimated_count(model_cls, using=None):
+    """Returns the planner's row estimate for the table of model_cls or
+    None if the database does not keep one.
+    """
+    connection = connections[using or 'default']
+    table = model_cls._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'mysql':
+        sql = ('SELECT table_rows FROM information_schema.tables '
+               'WHERE table_schema = DATABASE() AND table_name = %s')
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that counts an unfiltered changelist from the table
+    estimate above POTLAKO_ADMIN_COUNT_THRESHOLD rows and caches other
+    counts for POTLAKO_ADMIN_COUNT_CACHE_TIMEOUT seconds.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= getattr(
+                    settings, 'POTLAKO_ADMIN_COUNT_THRESHOLD', 10000):
+                self.estimated = True
+                return estimate
+        cache_key = query_cache_key('count', queryset)
+        if cache_key is None:
+            return 0
+        count = cache.get(cache_key)
+        if count is None:
+            count = super().count
+            cache.set(cache_key, count, cache_timeout())
+        return count
+
+
+class CachedDatesQuerySetMixin:
+    """Caches `dates` and `datetimes`, as used by the date hierarchy
+    drill-down, for POTLAKO_ADMIN_COUNT_CACHE_TIMEOUT seconds.
+
+    Clones keep the class so each filtered drill-down level is cached.
+    """
+
+    def cached_values(self, method_name, *args, **kwargs):
+        cache_key = query_cache_key(method_name, self, args, kwargs)
+        if cache_key is None:
+            return []
+        values = cache.get(cache_key)
+        if values is None:
+            values = list(getattr(super(), method_name)(*args, **kwargs))
+            cache.set(cache_key, values, cache_timeout())
+        return values
+
+    def dates(self, *args, **kwargs):
+        return self.cached_values('dates', *args, **kwargs)
+
+    def datetimes(self, *args, **kwargs):
+        return self.cached_values('datetimes', *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def cached_dates_queryset_class(queryset_cls):
+    if issubclass(queryset_cls, CachedDatesQuerySetMixin):
+        return queryset_cls
+    return type(queryset_cls.__name__,
+                (CachedDatesQuerySetMixin, queryset_cls), {})
+
+
+def cache_dates(queryset):
+    """Returns a clone of queryset that caches its date hierarchy
+    dates.
+    """
+    queryset = queryset._chain()
+    queryset.__class__ = cached_dates_queryset_class(queryset.__class__)
+    return queryset
+
+
+class KeysetChangeListMixin:
+    """Pages forward from the last row of the page on (modified, id)
+    instead of by offset when the model admin orders by `keyset_ordering`
+    and no column ordering is selected.
+
+    The date hierarchy reads its dates from the cache.
+    """
+
+    keyset_ordering = ['-modified', '-id']
+    keyset_enabled = False
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYSET_VAR, None)
+        return lookup_params
+
+    def get_queryset(self, request):
+        return cache_dates(super().get_queryset(request))
+
+    def keyset(self, request):
+        """Returns the (modified, id) to page from or None.
+        """
+        self.keyset_enabled = (
+            ORDER_VAR not in self.params
+            and list(self.model_admin.get_ordering(request) or [])
+            == self.keyset_ordering)
+        value = request.GET.get(KEYSET_VAR)
+        if not value or not self.keyset_enabled:
+            return None
+        modified, _, pk = value.rpartition('_')
+        modified = parse_datetime(modified)
+        return (modified, pk) if modified and pk else None
+
+    def get_results(self, request):
+        super().get_results(request)
+        keyset = self.keyset(request)
+        if keyset:
+            modified, pk = keyset
+            self.result_list = self.queryset.filter(
+                Q(modified__lt=modified) | Q(modified=modified, id__lt=pk))[
+                    :self.list_per_page]
+            self.multi_page = True
+
+    @property
+    def next_keyset_url(self):
+        """Returns the url of the page after this one or None.
+        """
+        if not self.keyset_enabled or self.show_all:
+            return None
+        results = list(self.result_list)
+        if len(results) < self.list_per_page:
+            return None
+        last = results[-1]
+        return self.get_query_string(
+            {KEYSET_VAR: f'{last.modified.isoformat()}_{last.pk}'}, [PAGE_VAR])
+
+
+class PaginatorModelAdminMixin:
+    """Model admin mixin for large changelists: cached or estimated
+    counts, a cached date hierarchy and, for model admins ordered by
+    ('-modified', '-id'), keyset paging.
+
+    Model admins that declare no ordering are ordered by
+    ('-modified', '-id').
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_ordering(self, request):
+        return (super().get_ordering(request)
+                or tuple(KeysetChangeListMixin.keyset_ordering))
+
+    def get_changelist(self, request, **kwargs):
+        return extend_changelist(
+            KeysetChangeListMixin, super().get_changelist(request, **kwargs))
@@ -4,6 +4,7 @@ from edc_model_admin import audit_fieldset_tuple
 from ..admin_site import potlako_subject_admin
 from ..forms import SMSForm
 from ..models import SMS
+from .admin_filter_mixins import SubjectFacilityListFilter
 from .modeladmin_mixins import ModelAdminMixin
 
 
@@ -25,3 +26,5 @@ class SMSAdmin(ModelAdminMixin, admin.ModelAdmin):
 
     list_display = ('date_time_form_filled', 'next_ap_date',
                     'date_reminder_sent', 'sms_outcome')
+
+    list_filter = ('sms_outcome', SubjectFacilityListFilter)
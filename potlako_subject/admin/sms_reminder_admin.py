@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from ..admin_site import potlako_subject_admin
+from ..models import SmsReminder
+
+
+@admin.register(SmsReminder, site=potlako_subject_admin)
+class SmsReminderAdmin(admin.ModelAdmin):
+    """A read-only view of the appointment SMS reminders queued for
+    the SMS dispatcher.
+    """
+
+    list_display = ('subject_identifier', 'appt_datetime', 'delivery_status',
+                    'delivery_attempts', 'next_attempt_datetime',
+                    'sent_datetime')
+
+    list_filter = ('delivery_status', )
+
+    search_fields = ('subject_identifier', )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -18,9 +18,12 @@ from ..admin_site import potlako_subject_admin
 from ..forms import SubjectConsentForm
 from ..models import SubjectConsent
 from .admin_filter_mixins import FacilityListFilter
+from .bulk_decryption_mixins import BulkDecryptionAdminMixin
+from .paginator_mixins import PaginatorModelAdminMixin
 
 
-class ModelAdminMixin(ModelAdminNextUrlRedirectMixin,
+class ModelAdminMixin(PaginatorModelAdminMixin,
+                      ModelAdminNextUrlRedirectMixin,
                       ModelAdminFormAutoNumberMixin, ModelAdminRevisionMixin,
                       ModelAdminReplaceLabelTextMixin, ModelAdminAuditFieldsMixin,
                       ModelAdminInstitutionMixin, ModelAdminReadOnlyMixin):
@@ -46,8 +49,8 @@ class ModelAdminMixin(ModelAdminNextUrlRedirectMixin,
 
 
 @admin.register(SubjectConsent, site=potlako_subject_admin)
-class SubjectConsentAdmin(ModelAdminBasicMixin, ModelAdminMixin,
-                          SimpleHistoryAdmin,
+class SubjectConsentAdmin(BulkDecryptionAdminMixin, ModelAdminBasicMixin,
+                          ModelAdminMixin, SimpleHistoryAdmin,
                           admin.ModelAdmin):
 
     form = SubjectConsentForm
@@ -105,6 +108,7 @@ class SubjectConsentAdmin(ModelAdminBasicMixin, ModelAdminMixin,
     list_filter = ('language',
                    'identity_type',
                    'gender',
+                   'community_arm',
                    FacilityListFilter)
 
     search_fields = ('subject_identifier', 'dob', 'screening_identifier')
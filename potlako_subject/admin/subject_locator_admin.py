@@ -17,14 +17,16 @@ from ..fieldsets import (other_indirect_contacts_fieldset,
 from ..fieldsets import subject_contacts_fieldset
 from ..forms import SubjectLocatorForm
 from ..models import SubjectLocator
+from .admin_filter_mixins import SubjectFacilityListFilter
+from .paginator_mixins import PaginatorModelAdminMixin
 
 
 class ModelAdminMixin(
-        ModelAdminNextUrlRedirectMixin, ModelAdminFormInstructionsMixin,
-        ModelAdminFormAutoNumberMixin, ModelAdminRevisionMixin,
-        ModelAdminAuditFieldsMixin, ModelAdminReadOnlyMixin,
-        ModelAdminInstitutionMixin, ModelAdminRedirectOnDeleteMixin,
-        ModelAdminSubjectDashboardMixin):
+        PaginatorModelAdminMixin, ModelAdminNextUrlRedirectMixin,
+        ModelAdminFormInstructionsMixin, ModelAdminFormAutoNumberMixin,
+        ModelAdminRevisionMixin, ModelAdminAuditFieldsMixin,
+        ModelAdminReadOnlyMixin, ModelAdminInstitutionMixin,
+        ModelAdminRedirectOnDeleteMixin, ModelAdminSubjectDashboardMixin):
 
     list_per_page = 10
     date_hierarchy = 'modified'
@@ -79,7 +81,8 @@ class SubjectLocatorAdmin(ModelAdminMixin, admin.ModelAdmin):
         'may_call',
         'may_sms',
         'may_call_work',
-        'may_contact_indirectly')
+        'may_contact_indirectly',
+        SubjectFacilityListFilter)
 
     list_display = (
         'subject_identifier',
@@ -13,9 +13,11 @@ from edc_model_admin.model_admin_audit_fields_mixin import (
 from ..admin_site import potlako_subject_admin
 from ..forms import SubjectScreeningForm
 from ..models import SubjectScreening
+from .paginator_mixins import PaginatorModelAdminMixin
 
 
-class ModelAdminMixin(ModelAdminNextUrlRedirectMixin,
+class ModelAdminMixin(PaginatorModelAdminMixin,
+                      ModelAdminNextUrlRedirectMixin,
                       ModelAdminFormInstructionsMixin,
                       ModelAdminFormAutoNumberMixin, ModelAdminRevisionMixin,
                       ModelAdminAuditFieldsMixin, ModelAdminReadOnlyMixin,
@@ -6,6 +6,7 @@ from edc_visit_tracking.modeladmin_mixins import VisitModelAdminMixin
 from ..admin_site import potlako_subject_admin
 from ..forms import SubjectVisitForm
 from ..models import SubjectVisit
+from .admin_filter_mixins import CommunityArmListFilter
 from .modeladmin_mixins import ModelAdminMixin
 
 
@@ -36,3 +37,7 @@ class SubjectVisitAdmin(
         'reason_unscheduled': admin.VERTICAL,
         'info_source': admin.VERTICAL,
         'survival_status': admin.VERTICAL}
+
+    def get_list_filter(self, request):
+        return tuple(super().get_list_filter(request)) + (
+            CommunityArmListFilter, )
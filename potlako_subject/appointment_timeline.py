@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps as django_apps
+
+_timelines = ContextVar('appointment_timelines', default=None)
+
+
+class AppointmentTimeline:
+    """An ordered, in-memory view of a subject's appointments, loaded in
+    one query the first time it is used.
+
+    Rows are (visit_code, visit_code_sequence, appt_datetime,
+    appt_status) ordered by timepoint and visit code sequence, read
+    through the potlako_appt_timeline_idx index (migration 0007).
+    """
+
+    appointment_model = 'edc_appointment.appointment'
+
+    def __init__(self, subject_identifier=None):
+        self.subject_identifier = subject_identifier
+        self._rows = None
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            appointment_cls = django_apps.get_model(self.appointment_model)
+            self._rows = list(appointment_cls.objects.filter(
+                subject_identifier=self.subject_identifier).order_by(
+                    'timepoint', 'visit_code_sequence').values_list(
+                        'visit_code', 'visit_code_sequence', 'appt_datetime',
+                        'appt_status'))
+        return self._rows
+
+    def exists(self, visit_code=None, visit_code_sequence=None):
+        """Returns True if the appointment for visit_code and
+        visit_code_sequence exists.
+        """
+        visit_code_sequence = int(visit_code_sequence)
+        return any(
+            row[0] == visit_code and row[1] == visit_code_sequence
+            for row in self.rows)
+
+    def latest_appt_datetime(self, visit_code=None):
+        """Returns the latest appt_datetime for visit_code or None.
+        """
+        appt_datetimes = [
+            row[2] for row in self.rows if row[0] == visit_code and row[2]]
+        return max(appt_datetimes) if appt_datetimes else None
+
+    def next_parent_appt_datetime(self, visit_code=None):
+        """Returns the latest appt_datetime of the visit after
+        visit_code, e.g. 2000 for 1000, or None.
+        """
+        return self.latest_appt_datetime(
+            visit_code=str(int(visit_code) + 1000))
+
+    def status_count(self, appt_status=None):
+        return len([row for row in self.rows if row[3] == appt_status])
+
+
+@contextmanager
+def appointment_timeline_scope():
+    """Caches one AppointmentTimeline per subject for the duration of
+    the block, e.g. a request. See AppointmentTimelineMiddleware.
+    """
+    token = _timelines.set({})
+    try:
+        yield
+    finally:
+        _timelines.reset(token)
+
+
+def appointment_timeline(subject_identifier=None):
+    """Returns the AppointmentTimeline for a subject, shared within an
+    appointment_timeline_scope.
+    """
+    timelines = _timelines.get()
+    if timelines is None:
+        return AppointmentTimeline(subject_identifier=subject_identifier)
+    if subject_identifier not in timelines:
+        timelines[subject_identifier] = AppointmentTimeline(
+            subject_identifier=subject_identifier)
+    return timelines[subject_identifier]
+
+
+def invalidate_appointment_timeline(subject_identifier=None):
+    timelines = _timelines.get()
+    if timelines is not None:
+        timelines.pop(subject_identifier, None)
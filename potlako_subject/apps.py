@@ -3,6 +3,7 @@ from dateutil.tz import gettz
 
 from django.apps import AppConfig as DjangoAppConfig
 from django.conf import settings
+from django.db.models.signals import post_migrate
 
 
 class AppConfig(DjangoAppConfig):
@@ -17,6 +18,9 @@ class AppConfig(DjangoAppConfig):
         from .models import subject_visit_on_post_save
         from .models import home_visit_on_post_save
         from .models import missed_call_on_post_save
+        from .checks import blind_index_key_check
+        from .outbox import create_schedules
+        post_migrate.connect(create_schedules, sender=self)
 
 
 if settings.APP_NAME == 'potlako_subject':
@@ -0,0 +1,261 @@
+import json
+import math
+import os
+import time
+import tracemalloc
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from edc_facility.import_holidays import import_holidays
+
+default_thresholds_path = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'tests',
+    'benchmark_thresholds.json')
+
+
+class Measurement:
+    """Query count, wall time and peak traced memory of a block.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.queries = 0
+        self.seconds = 0.0
+        self.peak_kb = 0
+        self.result = None
+        self.extra = {}
+
+    def to_dict(self):
+        return dict(queries=self.queries, seconds=round(self.seconds, 4),
+                    peak_kb=self.peak_kb, **self.extra)
+
+
+def peak_memory(func):
+    """Calls func and returns the peak memory it allocated in KB, traced
+    with tracemalloc.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, 'reset_peak'):
+        # python 3.9+
+        tracemalloc.reset_peak()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def measure(func, name=None, using='default', memory=True):
+    """Calls func and returns its Measurement, with the return value of
+    func as `result`.
+
+    Queries and wall time are measured on a first call. Peak memory is
+    measured on a second call unless `memory` is False, so tracemalloc
+    does not slow down the timed call; func must be safe to repeat.
+    """
+    measurement = Measurement(name=name)
+    with CaptureQueriesContext(connections[using]) as context:
+        start = time.perf_counter()
+        measurement.result = func()
+        measurement.seconds = time.perf_counter() - start
+    measurement.queries = len(context.captured_queries)
+    if memory:
+        measurement.peak_kb = peak_memory(func)
+    return measurement
+
+
+def percentile(values, pct):
+    """Returns the nearest-rank percentile of values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(int(math.ceil(pct / 100 * len(values))) - 1, 0)]
+
+
+class BenchmarkReport:
+    """Measurements by name, compared against stored thresholds.
+
+    A measurement regresses if it runs more queries than its threshold,
+    or takes more time or memory than its threshold times `tolerance`.
+    Names without a threshold are reported as new; their measurements
+    are stored as the baseline thresholds of the next run.
+    """
+
+    def __init__(self, suite=None, thresholds_path=None, tolerance=None):
+        self.suite = suite
+        self.thresholds_path = thresholds_path or default_thresholds_path
+        self.tolerance = tolerance or 1.5
+        self.measurements = {}
+
+    def add(self, measurement):
+        self.measurements[measurement.name] = measurement
+
+    def read_thresholds(self):
+        if not os.path.exists(self.thresholds_path):
+            return {}
+        with open(self.thresholds_path) as f:
+            return json.load(f).get(self.suite, {})
+
+    def write_thresholds(self, names=None):
+        """Stores the current measurements as the suite's thresholds,
+        or only those of `names`, keeping the other thresholds.
+        """
+        thresholds = {}
+        if os.path.exists(self.thresholds_path):
+            with open(self.thresholds_path) as f:
+                thresholds = json.load(f)
+        suite_thresholds = {} if names is None else thresholds.get(
+            self.suite, {})
+        suite_thresholds.update({
+            name: measurement.to_dict()
+            for name, measurement in self.measurements.items()
+            if names is None or name in names})
+        thresholds[self.suite] = dict(sorted(suite_thresholds.items()))
+        with open(self.thresholds_path, 'w') as f:
+            json.dump(thresholds, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    def compare(self, name, measurement, threshold):
+        """Returns the regressions of a measurement as strings.
+        """
+        regressions = []
+        if measurement.queries > threshold.get('queries', measurement.queries):
+            regressions.append(
+                f'{name}: {measurement.queries} queries, '
+                f'threshold {threshold["queries"]}')
+        for attr in ['seconds', 'peak_kb']:
+            limit = threshold.get(attr)
+            if limit and getattr(measurement, attr) > limit * self.tolerance:
+                regressions.append(
+                    f'{name}: {attr} {getattr(measurement, attr)}, '
+                    f'threshold {limit} x {self.tolerance}')
+        return regressions
+
+    def results(self):
+        thresholds = self.read_thresholds()
+        results = {'suite': self.suite, 'tolerance': self.tolerance,
+                   'measurements': {}, 'regressions': [], 'new': []}
+        for name, measurement in sorted(self.measurements.items()):
+            results['measurements'][name] = measurement.to_dict()
+            if name in thresholds:
+                results['regressions'].extend(
+                    self.compare(name, measurement, thresholds[name]))
+            else:
+                results['new'].append(name)
+        return results
+
+    def write(self, path):
+        """Writes the results as JSON and returns them.
+        """
+        results = self.results()
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        return results
+
+
+class StepStats:
+    """The latencies and query counts of one workflow step.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self.seconds = []
+        self.queries = []
+
+    def add(self, measurement):
+        self.seconds.append(measurement.seconds)
+        self.queries.append(measurement.queries)
+
+    def to_dict(self):
+        return dict(
+            count=len(self.seconds),
+            p50=round(percentile(self.seconds, 50), 4),
+            p90=round(percentile(self.seconds, 90), 4),
+            p99=round(percentile(self.seconds, 99), 4),
+            max=round(max(self.seconds), 4),
+            queries_mean=round(sum(self.queries) / len(self.queries), 1),
+            queries_max=max(self.queries))
+
+
+class WorkflowBenchmark:
+    """Runs the SubjectHelperMixin workflow for a growing number of
+    subjects and summarises each step at every checkpoint in `sizes`.
+
+    Each checkpoint reports the latency percentiles and queries of the
+    steps run since the previous checkpoint and the subjects per second,
+    so steps whose latency or queries grow with the number of subjects
+    already enrolled stand out in `growth`.
+
+    The holidays are imported once before the timed steps.
+    """
+
+    steps = [
+        ('enrollment', 'create_enrollment'),
+        ('visit_1000', 'create_visit_1000'),
+        ('visit_2000', 'create_visit_2000'),
+        ('followup_visit', 'create_followup_visit'),
+        ('followup_missed_visit', 'create_followup_missed_visit'),
+        ('visit_3000', 'create_visit_3000')]
+
+    facilities = ['mmathethe_clinic', 'bokaa_clinic']
+
+    def __init__(self, helper=None, steps=None):
+        self.helper = helper
+        self.steps = steps or self.steps
+        self.enrolled = 0
+
+    def run_subject(self, stats):
+        (name, method), *steps = self.steps
+        facility = self.facilities[self.enrolled % len(self.facilities)]
+        measurement = measure(
+            lambda: getattr(self.helper, method)(facility), name=name,
+            memory=False)
+        subject_identifier = measurement.result
+        stats[name].add(measurement)
+        for name, method in steps:
+            stats[name].add(measure(
+                lambda: getattr(self.helper, method)(subject_identifier),
+                name=name, memory=False))
+        self.enrolled += 1
+
+    def run(self, sizes):
+        """Enrolls subjects up to each size in turn and returns a
+        list of checkpoint summaries.
+        """
+        import_holidays()
+        self.helper.import_holidays_on_enrollment = False
+        checkpoints = []
+        for size in sorted(sizes):
+            stats = {name: StepStats(name) for name, _ in self.steps}
+            subjects = size - self.enrolled
+            start = time.perf_counter()
+            while self.enrolled < size:
+                self.run_subject(stats)
+            seconds = time.perf_counter() - start
+            checkpoints.append(dict(
+                subjects=size,
+                seconds=round(seconds, 3),
+                throughput=round(subjects / seconds, 3) if seconds else None,
+                steps={name: step.to_dict() for name, step in stats.items()
+                       if step.seconds}))
+        return checkpoints
+
+    def growth(self, checkpoints):
+        """Returns the ratio of the last to the first checkpoint of the
+        p50 latency and mean queries of each step.
+        """
+        first, last = checkpoints[0]['steps'], checkpoints[-1]['steps']
+        growth = {}
+        for name in first:
+            if name in last:
+                growth[name] = dict(
+                    p50=round(last[name]['p50'] / first[name]['p50'], 2)
+                    if first[name]['p50'] else None,
+                    queries=round(
+                        last[name]['queries_mean'] / first[name]['queries_mean'], 2)
+                    if first[name]['queries_mean'] else None)
+        return growth
@@ -0,0 +1,193 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from django.db.models.query import ModelIterable
+from django_crypto_fields.fields.base_field import BaseField
+
+logger = logging.getLogger(__name__)
+
+_scope = ContextVar('bulk_decryption_scope', default=None)
+
+
+def encrypted_fields(model_cls, field_names=None):
+    """Returns the encrypted concrete fields of model_cls, optionally
+    limited to field_names.
+    """
+    return [field for field in model_cls._meta.concrete_fields
+            if isinstance(field, BaseField)
+            and (field_names is None or field.name in field_names)]
+
+
+def ciphertext_name(field):
+    return f'{field.attname}_ciphertext'
+
+
+class DecryptionStats:
+    """Counts for one batch: values decrypted, values found in the
+    request cache and seconds spent.
+    """
+
+    def __init__(self):
+        self.decrypted = 0
+        self.cached = 0
+        self.seconds = 0.0
+
+    def add(self, stats):
+        self.decrypted += stats.decrypted
+        self.cached += stats.cached
+        self.seconds += stats.seconds
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(decrypted={self.decrypted}, '
+                f'cached={self.cached}, seconds={self.seconds:.4f})')
+
+
+class DecryptionScope:
+    """Plaintext by field cryptor and ciphertext, and the totals of
+    the batches decrypted within a `bulk_decryption_scope`.
+    """
+
+    def __init__(self):
+        self.plaintexts = {}
+        self.stats = DecryptionStats()
+
+
+class BulkDecryptor:
+    """Decrypts the encrypted columns of a page of model instances in
+    one batch.
+
+    The queryset is fetched with its encrypted fields deferred and their
+    stored values annotated, and each distinct value of the page is
+    decrypted once by its field. Plaintext is kept only within a
+    `bulk_decryption_scope`, e.g. a request, and is otherwise discarded
+    with the batch.
+    """
+
+    def prepare(self, queryset, fields):
+        """Returns queryset with fields deferred and their stored hashes
+        annotated.
+        """
+        return queryset.defer(*[field.name for field in fields]).annotate(
+            **{ciphertext_name(field): Cast(field.name, output_field=CharField())
+               for field in fields})
+
+    def queryset(self, queryset, field_names=None):
+        """Returns a clone of queryset that decrypts the encrypted
+        fields of its instances in one batch when evaluated.
+        """
+        fields = encrypted_fields(queryset.model, field_names=field_names)
+        if not fields:
+            return queryset
+        queryset = self.prepare(queryset, fields)
+        queryset.__class__ = bulk_decryption_queryset_class(
+            queryset.__class__, tuple(field.name for field in fields))
+        return queryset
+
+    def fetch(self, queryset, field_names=None):
+        """Returns a list of the instances in queryset with the encrypted
+        fields decrypted.
+        """
+        return list(self.queryset(queryset, field_names=field_names))
+
+    def decrypt_instances(self, objs, fields):
+        """Sets the plaintext of each field onto objs fetched with
+        `prepare` and returns the DecryptionStats.
+        """
+        started = time.perf_counter()
+        stats = DecryptionStats()
+        connection = connections[objs[0]._state.db] if objs else None
+        for field in fields:
+            ciphertexts = [getattr(obj, ciphertext_name(field)) for obj in objs]
+            plaintexts = self.decrypt_values(
+                field, ciphertexts, stats, connection=connection)
+            for obj, ciphertext in zip(objs, ciphertexts):
+                obj.__dict__[field.attname] = plaintexts.get(
+                    ciphertext, ciphertext)
+                delattr(obj, ciphertext_name(field))
+        stats.seconds = time.perf_counter() - started
+        scope = _scope.get()
+        if scope is not None:
+            scope.stats.add(stats)
+        logger.debug(
+            f'Decrypted {len(fields)} fields of {len(objs)} '
+            f'{fields[0].model._meta.label_lower if fields else ""} '
+            f'instances. Got {stats}.')
+        return stats
+
+    def decrypt_values(self, field, ciphertexts, stats, connection=None):
+        """Returns a dictionary of plaintext by ciphertext for the stored
+        values of an encrypted field.
+        """
+        cache_key = (field.algorithm, field.mode)
+        scope = _scope.get()
+        cached = {} if scope is None else scope.plaintexts.setdefault(
+            cache_key, {})
+        plaintexts = {}
+        pending = set()
+        for ciphertext in ciphertexts:
+            if not ciphertext or ciphertext in plaintexts:
+                continue
+            if ciphertext in cached:
+                plaintexts[ciphertext] = cached[ciphertext]
+                stats.cached += 1
+            else:
+                pending.add(ciphertext)
+        for ciphertext in pending:
+            plaintexts[ciphertext] = field.from_db_value(
+                ciphertext, None, connection)
+            stats.decrypted += 1
+        cached.update({ciphertext: plaintexts[ciphertext]
+                       for ciphertext in pending})
+        return plaintexts
+
+
+class BulkDecryptionQuerySetMixin:
+    """Decrypts the `bulk_decrypt_fields` of the instances in the
+    result cache in one batch when the queryset is evaluated.
+
+    The queryset stays a queryset, e.g. for the changelist formset of
+    `list_editable`. Clones keep the class.
+    """
+
+    bulk_decrypt_fields = ()
+
+    def _fetch_all(self):
+        decrypt = (self._result_cache is None
+                   and issubclass(self._iterable_class, ModelIterable))
+        super()._fetch_all()
+        if decrypt:
+            bulk_decryptor.decrypt_instances(
+                self._result_cache,
+                encrypted_fields(
+                    self.model, field_names=self.bulk_decrypt_fields))
+
+
+@lru_cache(maxsize=None)
+def bulk_decryption_queryset_class(queryset_cls, field_names):
+    if issubclass(queryset_cls, BulkDecryptionQuerySetMixin):
+        queryset_cls = queryset_cls.__bases__[1]
+    return type(queryset_cls.__name__,
+                (BulkDecryptionQuerySetMixin, queryset_cls),
+                {'bulk_decrypt_fields': field_names})
+
+
+bulk_decryptor = BulkDecryptor()
+
+
+@contextmanager
+def bulk_decryption_scope():
+    """Shares decrypted values across the batches of the block, e.g. a
+    request, and yields the DecryptionScope. See BulkDecryptionMiddleware.
+    """
+    scope = DecryptionScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
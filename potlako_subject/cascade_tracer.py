@@ -0,0 +1,279 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save)
+from django.dispatch import Signal
+
+_tracer = ContextVar('cascade_tracer', default=None)
+
+this_file = os.path.abspath(__file__)
+package_path = os.path.dirname(this_file)
+
+
+live_receivers = Signal._live_receivers
+
+
+def origin():
+    """Returns `module.function:lineno` of the innermost potlako_subject
+    frame on the stack outside this module, or None.
+    """
+    frame = sys._getframe(1)
+    while frame:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(package_path) and filename != this_file:
+            module = frame.f_globals.get('__name__')
+            return f'{module}.{frame.f_code.co_name}:{frame.f_lineno}'
+        frame = frame.f_back
+    return None
+
+
+def receiver_name(receiver):
+    """Returns `module.qualname` of a signal receiver.
+    """
+    return '{}.{}'.format(
+        getattr(receiver, '__module__', None),
+        getattr(receiver, '__qualname__', None) or repr(receiver))
+
+
+class TraceNode:
+    """An event of a save cascade with its nested events.
+    """
+
+    def __init__(self, kind=None, name=None, parent=None, instance=None,
+                 **attrs):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.instance = instance
+        self.attrs = attrs
+        self.children = []
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def label(self):
+        return f'{self.kind} {self.name}' if self.name else self.kind
+
+    @property
+    def self_seconds(self):
+        return max(self.seconds - sum(
+            child.seconds for child in self.children), 0.0)
+
+    @property
+    def receiver(self):
+        """Returns the name of the innermost signal receiver this event
+        ran in, or None.
+        """
+        node = self.parent
+        while node and node.kind != 'handler':
+            node = node.parent
+        return node.name if node else None
+
+    @property
+    def queries(self):
+        return (self.kind == 'query') + sum(
+            child.queries for child in self.children)
+
+    def to_dict(self):
+        return dict(
+            kind=self.kind, name=self.name, ms=round(self.seconds * 1000, 3),
+            queries=self.queries,
+            **{key: value for key, value in self.attrs.items() if value},
+            children=[child.to_dict() for child in self.children])
+
+    def folded(self, stack=None):
+        """Yields `frame;frame;frame microseconds` lines of self time,
+        the collapsed stack format of flamegraph.pl and speedscope.
+        """
+        stack = (stack or []) + [self.label.replace(';', ',')]
+        self_us = int(self.self_seconds * 1_000_000)
+        if self_us:
+            yield f'{";".join(stack)} {self_us}'
+        for child in self.children:
+            yield from child.folded(stack)
+
+
+class CascadeTracer:
+    """Records a tree of the saves, deletes, signal receivers and
+    queries run within `trace()`, with timings, the potlako_subject
+    function each was called from and the signal receiver it ran in.
+
+        with cascade_tracer.trace('consent') as root:
+            consent.save()
+        print(json.dumps(root.to_dict(), indent=2))
+
+    Saves are recorded from pre_save to post_save and nest what the
+    post_save receivers do; deletes, including cascaded ones, from
+    pre_delete to post_delete. Each signal receiver is recorded as a
+    `handler` event by wrapping the receivers Signal._live_receivers
+    returns. Queries are recorded with execute_wrapper(). The tracer's
+    receivers are connected, and Signal._live_receivers wrapped, while
+    at least one trace is active, and only record in the traced context.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.signals = (
+            (pre_save, self.on_pre_save),
+            (post_save, self.on_post_save),
+            (pre_delete, self.on_pre_delete),
+            (post_delete, self.on_post_delete))
+        self.receivers = [receiver for _, receiver in self.signals]
+
+    def install(self):
+        with self.lock:
+            self.active += 1
+            if self.active == 1:
+                for signal, receiver in self.signals:
+                    signal.connect(receiver, weak=False,
+                                   dispatch_uid=f'cascade_tracer.{receiver.__name__}')
+                Signal._live_receivers = self.live_receivers
+
+    def uninstall(self):
+        with self.lock:
+            self.active -= 1
+            if not self.active:
+                Signal._live_receivers = live_receivers
+                for signal, receiver in self.signals:
+                    signal.disconnect(
+                        dispatch_uid=f'cascade_tracer.{receiver.__name__}')
+
+    @property
+    def live_receivers(self):
+        """Returns a replacement for Signal._live_receivers that wraps
+        the receivers with `handler` when tracing. The tracer's own
+        receivers run first for pre_ signals and last for post_ signals
+        so that saves and deletes nest their receivers.
+        """
+        tracer = self
+
+        def _live_receivers(signal, sender):
+            receivers = live_receivers(signal, sender)
+            if _tracer.get() is None:
+                return receivers
+            own = [receiver for receiver in receivers
+                   if receiver in tracer.receivers]
+            handlers = [tracer.handler(receiver) for receiver in receivers
+                        if receiver not in tracer.receivers]
+            if signal in (pre_save, pre_delete):
+                return own + handlers
+            return handlers + own
+        return _live_receivers
+
+    def handler(self, receiver):
+        """Returns receiver wrapped to record a `handler` event.
+        """
+        def traced_receiver(**kwargs):
+            node = self.start('handler', receiver_name(receiver))
+            if node is None:
+                return receiver(**kwargs)
+            token = _tracer.set(node)
+            try:
+                return receiver(**kwargs)
+            finally:
+                self.stop(node)
+                _tracer.reset(token)
+        return traced_receiver
+
+    def start(self, kind, name=None, instance=None, **attrs):
+        """Adds an event as a child of the current one and returns it,
+        or None if not tracing.
+        """
+        parent = _tracer.get()
+        if parent is None:
+            return None
+        node = TraceNode(kind=kind, name=name, parent=parent,
+                         instance=instance, origin=origin(), **attrs)
+        node.attrs.update(receiver=node.receiver)
+        parent.children.append(node)
+        return node
+
+    def stop(self, node):
+        node.seconds = time.perf_counter() - node.start
+        node.instance = None
+
+    def on_pre_save(self, sender, instance, raw=None, update_fields=None,
+                    **kwargs):
+        node = self.start('save', sender._meta.label_lower, instance=instance,
+                          created=instance._state.adding or None,
+                          update_fields=update_fields and sorted(update_fields))
+        if node:
+            _tracer.set(node)
+
+    def on_post_save(self, sender, instance, **kwargs):
+        """Closes the save of instance and any save left open below it
+        by an exception.
+        """
+        node = _tracer.get()
+        while node and node.kind == 'save' and node.instance is not instance:
+            node = node.parent
+        if node and node.kind == 'save':
+            while _tracer.get() is not node:
+                self.stop(_tracer.get())
+                _tracer.set(_tracer.get().parent)
+            self.stop(node)
+            _tracer.set(node.parent)
+
+    def on_pre_delete(self, sender, instance, **kwargs):
+        # a collector sends every pre_delete before deleting, so
+        # deletes do not nest
+        self.start('delete', sender._meta.label_lower, instance=instance)
+
+    def on_post_delete(self, sender, instance, **kwargs):
+        parent = _tracer.get()
+        for node in reversed(parent.children if parent else []):
+            if node.kind == 'delete' and node.instance is instance:
+                self.stop(node)
+                break
+
+    def query(self, execute, sql, params, many, context):
+        node = self.start('query', sql.split(None, 1)[0].upper(), sql=sql,
+                          alias=context['connection'].alias)
+        if node is None:
+            return execute(sql, params, many, context)
+        token = _tracer.set(node)
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stop(node)
+            _tracer.reset(token)
+
+    @contextmanager
+    def trace(self, name=None):
+        """Traces the block and yields the root TraceNode.
+        """
+        root = TraceNode(kind='trace', name=name)
+        token = _tracer.set(root)
+        self.install()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.query))
+                yield root
+        finally:
+            self.uninstall()
+            root.seconds = time.perf_counter() - root.start
+            _tracer.reset(token)
+
+    def write(self, root, path=None, filename=None):
+        """Writes the tree as JSON and as collapsed stacks. Returns the
+        JSON path.
+        """
+        os.makedirs(path, exist_ok=True)
+        filename = os.path.join(path, filename)
+        with open(f'{filename}.json', 'w') as f:
+            json.dump(root.to_dict(), f, indent=2, default=str)
+        with open(f'{filename}.folded', 'w') as f:
+            f.write('\n'.join(root.folded()) + '\n')
+        return f'{filename}.json'
+
+
+cascade_tracer = CascadeTracer()
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def blind_index_key_check(app_configs, **kwargs):
+    """Checks that POTLAKO_BLIND_INDEX_KEY is set, see
+    blind_index_key().
+    """
+    errors = []
+    if not getattr(settings, 'POTLAKO_BLIND_INDEX_KEY', None):
+        errors.append(
+            Error('Missing settings attribute POTLAKO_BLIND_INDEX_KEY.',
+                  hint='Set the key used for the blind indexes of '
+                       'encrypted identity fields.',
+                  id='potlako_subject.E001'))
+    return errors
@@ -1,6 +1,8 @@
 from edc_constants.constants import ALIVE, DEAD, OTHER, OFF_STUDY, UNKNOWN
 from edc_constants.constants import DONE, NOT_DONE, NOT_APPLICABLE, YES, NO
 
+from .constants import APPOINTMENT, AVAILABILITY, REPEAT_CALL
+from .constants import FAILED, PENDING, PROCESSED, QUEUED, SENDING, SENT
 from .constants import UNSURE
 
 ALIVE_DEAD_LTFU = (
@@ -461,6 +463,25 @@ SEVERITY_LEVEL = (
     ('high', 'High, cancer is the leading suspected cause of the symptoms/signs')
 )
 
+DUE_CALL_SOURCE = (
+    (REPEAT_CALL, 'Repeat call'),
+    (AVAILABILITY, 'Call back'),
+    (APPOINTMENT, 'Upcoming appointment'),
+)
+
+OUTBOX_STATUS = (
+    (PENDING, 'Pending'),
+    (PROCESSED, 'Processed'),
+    (FAILED, 'Failed'),
+)
+
+SMS_DELIVERY_STATUS = (
+    (QUEUED, 'Queued'),
+    (SENDING, 'Sending'),
+    (SENT, 'Sent'),
+    (FAILED, 'Failed'),
+)
+
 SMS_STATUS = (
     ('sms_sent', 'SMS sent'),
     ('sms_not_sent', 'SMS not sent'),
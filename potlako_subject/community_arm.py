@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from threading import RLock
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+INTERVENTION = 'Intervention'
+STANDARD_OF_CARE = 'Standard of Care'
+
+
+def community_arm_for_facility(facility=None):
+    """Returns the community arm name for an enrollment facility.
+    """
+    enhanced_care_communities = settings.COMMUNITIES.get('enhanced_care')
+    intervention_communities = settings.COMMUNITIES.get('intervention')
+
+    if facility in enhanced_care_communities:
+        return STANDARD_OF_CARE
+    elif facility in intervention_communities:
+        return INTERVENTION
+    return None
+
+
+def community_arm_subjects(community_arm=None):
+    """Returns a values queryset of the subject identifiers on schedule
+    in `community_arm`, for use as an indexed `__in` subquery.
+    """
+    onschedule_cls = django_apps.get_model('potlako_subject.onschedule')
+    return onschedule_cls.objects.filter(
+        community_arm=community_arm).values('subject_identifier')
+
+
+class CommunityArmResolver:
+    """A process-local LRU cache of community arms keyed by screening
+    identifier and by subject identifier.
+
+    Entries are cleared by the ClinicianCallEnrollment and OnSchedule
+    post_save signals, see `models.signals`.
+    """
+
+    enrollment_model = 'potlako_subject.cliniciancallenrollment'
+    consent_model = 'potlako_subject.subjectconsent'
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or getattr(
+            settings, 'COMMUNITY_ARM_CACHE_SIZE', 2048)
+        self._cache = OrderedDict()
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(size={len(self._cache)}, '
+                f'hits={self.hits}, misses={self.misses})')
+
+    @property
+    def enrollment_model_cls(self):
+        return django_apps.get_model(self.enrollment_model)
+
+    @property
+    def consent_model_cls(self):
+        return django_apps.get_model(self.consent_model)
+
+    def get(self, screening_identifier=None, subject_identifier=None):
+        """Returns the community arm for a screening or subject identifier.
+
+        Raises a ValidationError if the enrollment does not exist.
+        """
+        if screening_identifier:
+            key = ('screening_identifier', screening_identifier)
+        elif subject_identifier:
+            key = ('subject_identifier', subject_identifier)
+        else:
+            return None
+        with self._lock:
+            try:
+                community_arm = self._cache[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return community_arm
+        if screening_identifier:
+            community_arm = self.lookup(
+                screening_identifier=screening_identifier)
+        else:
+            community_arm = self.lookup(
+                screening_identifier=self.get_screening_identifier(
+                    subject_identifier))
+        with self._lock:
+            self._cache[key] = community_arm
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return community_arm
+
+    def lookup(self, screening_identifier=None):
+        try:
+            facility = self.enrollment_model_cls.objects.values_list(
+                'facility', flat=True).get(
+                    screening_identifier=screening_identifier)
+        except self.enrollment_model_cls.DoesNotExist:
+            raise ValidationError('Clinician Call Enrollment object '
+                                  'does not exist.')
+        return community_arm_for_facility(facility)
+
+    def get_screening_identifier(self, subject_identifier=None):
+        screening_identifier = self.consent_model_cls.objects.filter(
+            subject_identifier=subject_identifier).values_list(
+                'screening_identifier', flat=True).first()
+        if not screening_identifier:
+            raise ValidationError('Subject consent object does not exist!')
+        return screening_identifier
+
+    def invalidate(self, screening_identifier=None, subject_identifier=None):
+        with self._lock:
+            if screening_identifier:
+                self._cache.pop(
+                    ('screening_identifier', screening_identifier), None)
+            if subject_identifier:
+                self._cache.pop(
+                    ('subject_identifier', subject_identifier), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses,
+                    size=len(self._cache), maxsize=self.maxsize)
+
+
+community_arm_resolver = CommunityArmResolver()
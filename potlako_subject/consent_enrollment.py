@@ -0,0 +1,141 @@
+import hashlib
+from contextvars import ContextVar
+
+from django.apps import apps as django_apps
+from django.core.exceptions import ValidationError
+from edc_base.utils import age, get_utcnow
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+from .community_arm import community_arm_resolver
+from .outbox import enqueue
+
+_current = ContextVar('consent_enrollment', default=None)
+
+
+def current_consent_enrollment(subject_identifier=None):
+    """Returns the ConsentEnrollment putting subject_identifier on
+    schedule, or None.
+    """
+    enrollment = _current.get()
+    if enrollment and enrollment.consent.subject_identifier == subject_identifier:
+        return enrollment
+    return None
+
+
+class ConsentEnrollment:
+    """The work done when a subject consent is saved: updating the
+    screening, propagating the subject identifier to the enrollment and
+    verbal consent and putting the subject on schedule.
+
+    The screening, enrollment and verbal consent are read once and the
+    screening saved once. The subject identifier is written with
+    update_fields so history and outgoing transactions are kept. The
+    OnSchedule is created with its community arm, and the appointment
+    SMS reminders are queued as one outbox message once the schedule
+    is created. SubjectConsent.save() runs it in one transaction.
+    """
+
+    screening_model = 'potlako_subject.subjectscreening'
+    enrollment_model = 'potlako_subject.cliniciancallenrollment'
+    verbal_consent_model = 'potlako_subject.verbalconsent'
+    onschedule_model = 'potlako_subject.onschedule'
+
+    def __init__(self, consent=None):
+        self.consent = consent
+        self.screening_saved = False
+        self.reminders = []
+        self._objects = {}
+
+    @classmethod
+    def for_consent(cls, consent):
+        """Returns the enrollment started by SubjectConsent.save(), or
+        a new one.
+        """
+        enrollment = getattr(consent, '_consent_enrollment', None)
+        return enrollment or cls(consent)
+
+    def get(self, model, required=True):
+        """Returns the instance of model for the consent's screening
+        identifier, read once.
+        """
+        if model not in self._objects:
+            model_cls = django_apps.get_model(model)
+            try:
+                self._objects[model] = model_cls.objects.get(
+                    screening_identifier=self.consent.screening_identifier)
+            except model_cls.DoesNotExist:
+                self._objects[model] = None
+        if required and not self._objects[model]:
+            model_cls = django_apps.get_model(model)
+            raise ValidationError(f'{model_cls} object does not exist!')
+        return self._objects[model]
+
+    @property
+    def screening(self):
+        return self.get(self.screening_model, required=False)
+
+    @property
+    def community_arm(self):
+        return (self.consent.community_arm
+                or community_arm_resolver.get(
+                    screening_identifier=self.consent.screening_identifier))
+
+    def save_screening(self):
+        """Saves the screening with the subject's age, reusing the
+        enrollment read for SubjectScreening.get_age().
+        """
+        screening = self.screening
+        screening.age_in_years = age(self.consent.dob, get_utcnow())
+        screening._clinician_call_enrollment = self.get(
+            self.enrollment_model, required=False)
+        screening.save()
+        self.screening_saved = True
+
+    def update_consented(self):
+        """Sets the subject identifier on the screening, enrollment and
+        verbal consent of a new consent.
+        """
+        subject_identifier = self.consent.subject_identifier
+        screening = self.get(self.screening_model)
+        enrollment = self.get(self.enrollment_model)
+        verbal_consent = self.get(self.verbal_consent_model)
+        screening.subject_identifier = subject_identifier
+        screening.is_consented = True
+        self.save_screening()
+        for obj in [enrollment, verbal_consent]:
+            obj.subject_identifier = subject_identifier
+            obj.save_base(update_fields=['subject_identifier'])
+
+    def defer_reminder(self, appointment):
+        self.reminders.append(str(appointment.pk))
+
+    def put_on_schedule(self):
+        _, schedule = site_visit_schedules.get_by_onschedule_model(
+            self.onschedule_model)
+        token = _current.set(self)
+        try:
+            schedule.put_on_schedule(
+                subject_identifier=self.consent.subject_identifier,
+                onschedule_datetime=self.consent.consent_datetime)
+        finally:
+            _current.reset(token)
+
+        onschedule_cls = django_apps.get_model(self.onschedule_model)
+        try:
+            onschedule_obj = onschedule_cls.objects.get(
+                subject_identifier=self.consent.subject_identifier,
+                community_arm__isnull=True)
+        except onschedule_cls.DoesNotExist:
+            pass
+        else:
+            onschedule_obj.community_arm = self.community_arm
+            onschedule_obj.save(update_fields=['community_arm'])
+        self.queue_reminders()
+
+    def queue_reminders(self):
+        if self.reminders:
+            digest = hashlib.md5(','.join(self.reminders).encode()).hexdigest()
+            enqueue('schedule_appointment_sms_batch',
+                    idempotency_key=f'schedule_appointment_sms_batch:{digest}',
+                    appointments=self.reminders)
+            self.reminders = []
@@ -1,2 +1,11 @@
 MISSING = 'missing'
 UNSURE = 'unsure'
+PENDING = 'pending'
+PROCESSED = 'processed'
+FAILED = 'failed'
+QUEUED = 'queued'
+SENDING = 'sending'
+SENT = 'sent'
+REPEAT_CALL = 'repeat_call'
+AVAILABILITY = 'availability'
+APPOINTMENT = 'appointment'
@@ -0,0 +1,173 @@
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from edc_appointment.constants import NEW_APPT
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NO
+
+from .constants import APPOINTMENT, AVAILABILITY, REPEAT_CALL
+
+due_call_model = 'potlako_subject.duecall'
+
+priorities = {REPEAT_CALL: 1, AVAILABILITY: 2, APPOINTMENT: 3}
+
+_deleting = ContextVar('due_call_sources_deleting', default=frozenset())
+
+
+def due_call_cls():
+    return django_apps.get_model(due_call_model)
+
+
+def set_due_call(source=None, source_id=None, due_date=None, **identifiers):
+    """Creates or updates the due call for a source instance, or
+    deletes it if due_date is None.
+    """
+    if due_date is None:
+        due_call_cls().objects.filter(
+            source=source, source_id=source_id).delete()
+        return None
+    due_call, _ = due_call_cls().objects.update_or_create(
+        source=source, source_id=str(source_id),
+        defaults=dict(due_date=due_date, priority=priorities.get(source),
+                      **identifiers))
+    return due_call
+
+
+def source_deleting(source=None, source_id=None):
+    """Marks a source instance as being deleted, from its pre_delete
+    receiver, so that the receivers of its child records leave the
+    due call alone.
+
+    Returns the token to pass to source_deleted().
+    """
+    return _deleting.set(_deleting.get() | {(source, str(source_id))})
+
+
+def is_source_deleting(source=None, source_id=None):
+    return (source, str(source_id)) in _deleting.get()
+
+
+def source_deleted(source=None, source_id=None, token=None):
+    """Deletes the due call of a deleted source instance, from its
+    post_delete receiver, and resets the mark set by source_deleting().
+    """
+    try:
+        return set_due_call(source=source, source_id=source_id)
+    finally:
+        if token is not None:
+            _deleting.reset(token)
+
+
+def update_repeat_call(missed_call):
+    """A repeat call is due on the latest scheduled repeat call date
+    of a missed call that is not complete.
+    """
+    record_cls = django_apps.get_model('potlako_subject.missedcallrecord')
+    due_date = None
+    if not missed_call.is_complete:
+        due_date = record_cls.objects.filter(
+            missed_call=missed_call).aggregate(
+                repeat_call=Max('repeat_call')).get('repeat_call')
+    return set_due_call(
+        source=REPEAT_CALL, source_id=missed_call.pk, due_date=due_date,
+        subject_identifier=missed_call.subject_visit.subject_identifier)
+
+
+def update_availability(patient_availability_log):
+    """A call back is due the day after the latest log entry if the
+    participant could not take the call.
+    """
+    entry_cls = django_apps.get_model(
+        'potlako_subject.patientavailabilitylogentry')
+    latest = entry_cls.objects.filter(
+        patient_availability_log=patient_availability_log).order_by(
+            '-report_datetime').values_list(
+                'can_take_call', 'report_datetime').first()
+    due_date = None
+    if latest and latest[0] == NO:
+        due_date = latest[1].date() + timedelta(days=1)
+    clinician_call = patient_availability_log.clinician_call
+    return set_due_call(
+        source=AVAILABILITY, source_id=patient_availability_log.pk,
+        due_date=due_date,
+        subject_identifier=clinician_call.subject_identifier,
+        screening_identifier=clinician_call.screening_identifier)
+
+
+def update_appointment(appointment):
+    """A contact is due on the date of a new appointment.
+    """
+    due_date = None
+    if appointment.appt_status == NEW_APPT and appointment.appt_datetime:
+        due_date = appointment.appt_datetime.date()
+    return set_due_call(
+        source=APPOINTMENT, source_id=appointment.pk, due_date=due_date,
+        subject_identifier=appointment.subject_identifier)
+
+
+def rebuild_due_calls():
+    """Replaces all due calls, reading each source in one query.
+
+    Returns the number of due calls.
+    """
+    due_call_model_cls = due_call_cls()
+    missed_call_cls = django_apps.get_model('potlako_subject.missedcall')
+    log_cls = django_apps.get_model('potlako_subject.patientavailabilitylog')
+    entry_cls = django_apps.get_model(
+        'potlako_subject.patientavailabilitylogentry')
+    appointment_cls = django_apps.get_model('edc_appointment.appointment')
+
+    due_calls = []
+
+    for pk, subject_identifier, due_date in missed_call_cls.objects.exclude(
+            is_complete=True).annotate(
+                due_date=Max('missedcallrecord__repeat_call')).filter(
+                    due_date__isnull=False).values_list(
+                        'pk', 'subject_visit__subject_identifier', 'due_date'):
+        due_calls.append(due_call_model_cls(
+            source=REPEAT_CALL, source_id=str(pk), due_date=due_date,
+            priority=priorities.get(REPEAT_CALL),
+            subject_identifier=subject_identifier))
+
+    latest = entry_cls.objects.filter(
+        patient_availability_log=OuterRef('pk')).order_by('-report_datetime')
+    for pk, subject_identifier, screening_identifier, can_take_call, report_datetime in (
+            log_cls.objects.annotate(
+                can_take_call=Subquery(latest.values('can_take_call')[:1]),
+                report_datetime=Subquery(latest.values('report_datetime')[:1])).filter(
+                    can_take_call=NO).values_list(
+                        'pk', 'clinician_call__subject_identifier',
+                        'clinician_call__screening_identifier',
+                        'can_take_call', 'report_datetime')):
+        due_calls.append(due_call_model_cls(
+            source=AVAILABILITY, source_id=str(pk),
+            due_date=report_datetime.date() + timedelta(days=1),
+            priority=priorities.get(AVAILABILITY),
+            subject_identifier=subject_identifier,
+            screening_identifier=screening_identifier))
+
+    for pk, subject_identifier, appt_datetime in appointment_cls.objects.filter(
+            appt_status=NEW_APPT, appt_datetime__isnull=False).values_list(
+                'pk', 'subject_identifier', 'appt_datetime'):
+        due_calls.append(due_call_model_cls(
+            source=APPOINTMENT, source_id=str(pk),
+            due_date=appt_datetime.date(),
+            priority=priorities.get(APPOINTMENT),
+            subject_identifier=subject_identifier))
+
+    with transaction.atomic():
+        due_call_model_cls.objects.all().delete()
+        due_call_model_cls.objects.bulk_create(due_calls, batch_size=500)
+    return len(due_calls)
+
+
+def worklist(due_date=None):
+    """Returns the due calls up to due_date (default today), highest
+    priority and earliest due first.
+    """
+    due_date = due_date or get_utcnow().date()
+    return due_call_cls().objects.filter(
+        due_date__lte=due_date).order_by('priority', 'due_date')
@@ -0,0 +1,76 @@
+from django.conf import settings
+
+from .bulk_decryption import bulk_decryptor
+
+
+def export_chunk_size():
+    return getattr(settings, 'POTLAKO_EXPORT_CHUNK_SIZE', 500)
+
+
+class ModelExporter:
+    """Iterates a queryset as flat rows, one chunk at a time.
+
+    Chunks are read in primary key order with a keyset filter and
+    decrypted in bulk. Many to many list model values are read in one
+    query per field per chunk and joined into a single column.
+    """
+
+    separator = ';'
+
+    def __init__(self, model_cls=None, chunk_size=None):
+        self.model_cls = model_cls
+        self.chunk_size = chunk_size or export_chunk_size()
+        opts = model_cls._meta
+        self.fields = opts.concrete_fields
+        self.m2m_fields = opts.many_to_many
+
+    @property
+    def header(self):
+        return ([field.attname for field in self.fields]
+                + [field.name for field in self.m2m_fields])
+
+    def chunks(self, queryset):
+        """Yields lists of instances in primary key order.
+        """
+        queryset = queryset.order_by('pk')
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(
+                pk__gt=last_pk)
+            objs = bulk_decryptor.fetch(chunk[:self.chunk_size])
+            if not objs:
+                break
+            yield objs
+            if len(objs) < self.chunk_size:
+                break
+            last_pk = objs[-1].pk
+
+    def m2m_values(self, field, pks):
+        """Returns a dictionary of joined values by source pk.
+        """
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        source_attname = through._meta.get_field(source).attname
+        target_field = 'pk'
+        if 'short_name' in [f.name for f in field.related_model._meta.fields]:
+            target_field = 'short_name'
+        values = {}
+        for pk, value in through.objects.filter(
+                **{f'{source}__in': pks}).order_by(
+                    f'{target}__{target_field}').values_list(
+                        source_attname, f'{target}__{target_field}'):
+            values.setdefault(pk, []).append(str(value))
+        return {pk: self.separator.join(value) for pk, value in values.items()}
+
+    def rows(self, queryset):
+        """Yields the values of each instance in queryset, in the order
+        of `header`.
+        """
+        for objs in self.chunks(queryset):
+            pks = [obj.pk for obj in objs]
+            m2m_values = [self.m2m_values(field, pks)
+                          for field in self.m2m_fields]
+            for obj in objs:
+                yield ([getattr(obj, field.attname) for field in self.fields]
+                       + [values.get(obj.pk, '') for values in m2m_values])
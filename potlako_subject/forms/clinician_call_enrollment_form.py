@@ -19,6 +19,15 @@ class ClinicianCallEnrollmentForm(
         label='Screening Identifier',
         widget=forms.TextInput(attrs={'readonly': 'readonly'}))
 
+    def clean_national_identity(self):
+        national_identity = self.cleaned_data.get('national_identity')
+        if (national_identity
+                and ClinicianCallEnrollment.objects.identity_exists(
+                    national_identity, exclude_pk=self.instance.pk)):
+            raise forms.ValidationError(
+                'A patient with this identity number is already enrolled.')
+        return national_identity
+
     def clean(self):
         cleaned_data = super().clean()
 
@@ -8,6 +8,7 @@ from edc_visit_tracking.form_validators import (
     VisitFormValidator as BaseVisitFormValidator)
 from edc_appointment.constants import IN_PROGRESS_APPT
 
+from ..appointment_timeline import appointment_timeline
 from ..models import SubjectVisit
 
 
@@ -37,9 +38,8 @@ class VisitFormValidator(BaseVisitFormValidator):
                     raise forms.ValidationError({
                         'reason': 'This can not be an initial visit/contact.'})
 
-        in_progress_count = self.appointment_cls.objects.filter(
-            subject_identifier=appointment.subject_identifier,
-            appt_status=IN_PROGRESS_APPT).count()
+        in_progress_count = appointment_timeline(
+            appointment.subject_identifier).status_count(IN_PROGRESS_APPT)
 
         if in_progress_count > 1:
             raise forms.ValidationError(
@@ -0,0 +1,240 @@
+import gzip
+import hashlib
+import json
+import os
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import CharField, Q
+from django.db.models.functions import Cast
+
+from .bulk_decryption import ciphertext_name, encrypted_fields
+from .export import export_chunk_size
+
+
+class HistoryArchiveError(Exception):
+    pass
+
+
+def history_archive_path():
+    return getattr(settings, 'POTLAKO_HISTORY_ARCHIVE_PATH', None)
+
+
+def history_models(app_label=None):
+    """Returns the history models of the models of app_label.
+    """
+    app_config = django_apps.get_app_config(app_label or 'potlako_subject')
+    models = []
+    for model_cls in app_config.get_models():
+        manager_name = getattr(
+            model_cls._meta, 'simple_history_manager_attribute', None)
+        if manager_name:
+            models.append(getattr(model_cls, manager_name).model)
+    return models
+
+
+def subject_identifier_lookup(history_cls):
+    """Returns the lookup of the subject identifier of a history
+    model's rows, or None.
+    """
+    names = [field.name for field in history_cls._meta.fields]
+    if 'subject_identifier' in names:
+        return 'subject_identifier'
+    if 'subject_visit' in names:
+        return 'subject_visit__subject_identifier'
+    return None
+
+
+class HistoryArchiver:
+    """Moves history rows older than `before`, or of subjects taken
+    off study, out of the history tables into gzipped JSON lines files.
+
+    Rows are read in chunks in history date order. Each chunk is
+    written to one file per month and removed from the history table
+    in the same DB transaction that records the files in HistoryArchive
+    and the objects they hold in HistoryArchiveObject. File names are
+    derived from the rows, so an interrupted run is resumed by running
+    it again.
+
+    Encrypted fields are archived as ciphertext.
+    """
+
+    offstudy_model = 'potlako_prn.subjectoffstudy'
+
+    def __init__(self, path=None, before=None, closed=None, chunk_size=None):
+        self.path = path or history_archive_path()
+        if not self.path:
+            raise HistoryArchiveError(
+                'Specify a path or set POTLAKO_HISTORY_ARCHIVE_PATH.')
+        if not before and not closed:
+            raise HistoryArchiveError(
+                'Specify a cutoff date, closed subjects or both.')
+        self.before = before
+        self.closed = closed
+        self.chunk_size = chunk_size or export_chunk_size()
+
+    @property
+    def archive_cls(self):
+        return django_apps.get_model('potlako_subject.historyarchive')
+
+    @property
+    def archive_object_cls(self):
+        return django_apps.get_model('potlako_subject.historyarchiveobject')
+
+    def closed_subject_identifiers(self):
+        offstudy_cls = django_apps.get_model(self.offstudy_model)
+        return offstudy_cls.objects.values('subject_identifier')
+
+    def get_queryset(self, history_cls):
+        """Returns the rows to archive, or None if no rows of
+        history_cls qualify.
+        """
+        query = Q()
+        if self.before:
+            query |= Q(history_date__lt=self.before)
+        lookup = subject_identifier_lookup(history_cls)
+        if self.closed and lookup:
+            query |= Q(**{f'{lookup}__in': self.closed_subject_identifiers()})
+        if not query:
+            return None
+        return history_cls.objects.filter(query).order_by(
+            'history_date', history_cls._meta.pk.name)
+
+    def values(self, queryset):
+        """Returns the rows of queryset as dictionaries by attname,
+        with encrypted fields as stored.
+        """
+        opts = queryset.model._meta
+        encrypted = encrypted_fields(queryset.model)
+        names = [field.attname for field in opts.concrete_fields
+                 if field not in encrypted]
+        rows = []
+        for row in queryset.values(*names, **{
+                ciphertext_name(field): Cast(field.attname, CharField())
+                for field in encrypted}):
+            for field in encrypted:
+                row[field.attname] = row.pop(ciphertext_name(field))
+            rows.append(row)
+        return rows
+
+    def archive(self, models=None):
+        """Archives the rows of each history model, by default those
+        of this app. Returns a dictionary of rows archived by history
+        model label.
+        """
+        counts = {}
+        for history_cls in models or history_models():
+            counts[history_cls._meta.label_lower] = self.archive_model(
+                history_cls)
+        return counts
+
+    def archive_model(self, history_cls):
+        queryset = self.get_queryset(history_cls)
+        if queryset is None:
+            return 0
+        archived = 0
+        while True:
+            rows = self.values(queryset[:self.chunk_size])
+            if not rows:
+                break
+            partitions = {}
+            for row in rows:
+                partition = row['history_date'].strftime('%Y-%m')
+                partitions.setdefault(partition, []).append(row)
+            files = [self.write(history_cls, partition, partition_rows)
+                     for partition, partition_rows in partitions.items()]
+            with transaction.atomic():
+                for partition, path, sha256 in files:
+                    self.index(history_cls, partition, path, sha256,
+                               partitions[partition])
+                history_cls.objects.filter(
+                    pk__in=[row[history_cls._meta.pk.attname]
+                            for row in rows]).delete()
+            archived += len(rows)
+            if len(rows) < self.chunk_size:
+                break
+        return archived
+
+    def write(self, history_cls, partition, rows):
+        """Writes rows to a gzipped JSON lines file and returns the
+        partition, the path relative to the archive root and its sha256.
+        """
+        pk_name = history_cls._meta.pk.attname
+        path = os.path.join(
+            history_cls._meta.model_name, partition,
+            f'{rows[0][pk_name]}.jsonl.gz')
+        filename = os.path.join(self.path, path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with gzip.open(f'{filename}.tmp', 'wt') as f:
+            for row in rows:
+                f.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+        os.replace(f'{filename}.tmp', filename)
+        with open(filename, 'rb') as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        return partition, path, sha256
+
+    def index(self, history_cls, partition, path, sha256, rows):
+        archive, _ = self.archive_cls.objects.update_or_create(
+            path=path,
+            defaults=dict(
+                history_model=history_cls._meta.label_lower,
+                partition=partition,
+                first_history_date=rows[0]['history_date'],
+                last_history_date=rows[-1]['history_date'],
+                rows=len(rows),
+                sha256=sha256))
+        object_ids = {str(row['id']) for row in rows}
+        self.archive_object_cls.objects.filter(archive=archive).delete()
+        self.archive_object_cls.objects.bulk_create(
+            [self.archive_object_cls(archive=archive, object_id=object_id)
+             for object_id in sorted(object_ids)])
+
+
+def read_archive(archive, path=None):
+    """Yields the rows of a HistoryArchive as dictionaries, raising
+    HistoryArchiveError if the file does not match its checksum.
+    """
+    filename = os.path.join(path or history_archive_path(), archive.path)
+    with open(filename, 'rb') as f:
+        content = f.read()
+    if hashlib.sha256(content).hexdigest() != archive.sha256:
+        raise HistoryArchiveError(f'{archive.path} does not match its checksum.')
+    for line in gzip.decompress(content).decode().splitlines():
+        yield json.loads(line)
+
+
+def archived_history(model_cls, object_id, path=None):
+    """Returns the archived history rows of an object, oldest first.
+    """
+    history_cls = getattr(
+        model_cls, model_cls._meta.simple_history_manager_attribute).model
+    archive_cls = django_apps.get_model('potlako_subject.historyarchive')
+    rows = []
+    for archive in archive_cls.objects.filter(
+            history_model=history_cls._meta.label_lower,
+            historyarchiveobject__object_id=str(object_id)).order_by(
+                'first_history_date'):
+        rows.extend(row for row in read_archive(archive, path=path)
+                    if row['id'] == str(object_id))
+    return rows
+
+
+def restore_archive(archive, path=None):
+    """Moves the rows of a HistoryArchive back into its history table
+    and removes the archive.
+    """
+    history_cls = django_apps.get_model(archive.history_model)
+    fields = {field.attname: field
+              for field in history_cls._meta.concrete_fields}
+    encrypted = [field.attname for field in encrypted_fields(history_cls)]
+    objs = [history_cls(**{
+        name: value if name in encrypted else fields[name].to_python(value)
+        for name, value in row.items()})
+        for row in read_archive(archive, path=path)]
+    with transaction.atomic():
+        history_cls.objects.bulk_create(objs)
+        archive.delete()
+    os.remove(os.path.join(path or history_archive_path(), archive.path))
+    return len(objs)
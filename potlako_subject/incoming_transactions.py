@@ -0,0 +1,267 @@
+import json
+import socket
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as django_apps
+from django.core.serializers import sort_dependencies
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_save
+from edc_base.model_mixins import ListModelMixin
+from edc_base.utils import get_utcnow
+from edc_sync.constants import DELETE
+
+from .export import export_chunk_size
+from .models.model_mixins import CrfModelMixin
+from .sync_model import decrypt_payload
+
+visit_lookups = ('subject_identifier', 'visit_schedule_name', 'schedule_name',
+                 'visit_code', 'visit_code_sequence')
+
+natural_key_lookups = {
+    'edc_appointment.appointment': visit_lookups,
+    'potlako_subject.cliniciancallenrollment': ('screening_identifier',),
+    'potlako_subject.navigationsummaryandplan': ('subject_identifier',),
+    'potlako_subject.patientavailabilitylog': (
+        'clinician_call__screening_identifier',),
+    'potlako_subject.subjectconsent': ('subject_identifier', 'version'),
+    'potlako_subject.subjectscreening': ('screening_identifier',),
+    'potlako_subject.subjectvisit': visit_lookups,
+}
+
+
+def get_natural_key_lookups(model_cls):
+    """Returns the field lookups matching the natural key of model_cls,
+    in order, or None if unknown.
+    """
+    if issubclass(model_cls, CrfModelMixin):
+        return tuple(f'subject_visit__{lookup}' for lookup in visit_lookups)
+    if issubclass(model_cls, ListModelMixin):
+        return ('short_name',)
+    return natural_key_lookups.get(model_cls._meta.label_lower)
+
+
+def normalize(natural_key):
+    return tuple(str(value) for value in natural_key)
+
+
+class NaturalKeyResolver:
+    """Resolves natural keys to primary keys, reading all the keys of
+    a model needed by a batch in one query where the key's lookups are
+    known, and caching the result.
+
+    Other natural keys are resolved with get_by_natural_key() once
+    each.
+    """
+
+    def __init__(self, using=None):
+        self.using = using
+        self.cache = {}
+
+    def prefetch(self, model_cls, natural_keys):
+        label = model_cls._meta.label_lower
+        lookups = get_natural_key_lookups(model_cls)
+        natural_keys = {normalize(key): key for key in natural_keys
+                        if (label, normalize(key)) not in self.cache}
+        if not lookups or not natural_keys:
+            return
+        query = reduce(or_, [Q(**dict(zip(lookups, key)))
+                             for key in natural_keys.values()])
+        for pk, *values in model_cls._default_manager.using(
+                self.using).filter(query).values_list('pk', *lookups):
+            self.cache[(label, normalize(values))] = pk
+
+    def resolve(self, model_cls, natural_key):
+        key = (model_cls._meta.label_lower, normalize(natural_key))
+        if key not in self.cache:
+            self.cache[key] = model_cls._default_manager.db_manager(
+                self.using).get_by_natural_key(*natural_key).pk
+        return self.cache[key]
+
+
+class IncomingTransactionApplier:
+    """Applies unconsumed incoming transactions in chunks, each chunk in
+    one database transaction.
+
+    Within a chunk only the latest transaction of each object is
+    applied. Objects are written model by model in dependency order
+    with bulk_create() and bulk_update(), natural foreign keys are
+    resolved by a NaturalKeyResolver. pre_save and post_save are sent
+    with raw=True, as the edc_sync deserializer does, so history and
+    outgoing transactions are not created. Deletes are applied last,
+    in reverse dependency order.
+    """
+
+    incoming_transaction_model = 'edc_sync.incomingtransaction'
+
+    def __init__(self, chunk_size=None, using=None):
+        self.chunk_size = chunk_size or export_chunk_size()
+        self.using = using or 'default'
+        self.consumer = f'{socket.gethostname()}-{self.using}'
+        self.errors = 0
+
+    @property
+    def incoming_transaction_cls(self):
+        return django_apps.get_model(self.incoming_transaction_model)
+
+    def apply(self):
+        """Applies all unconsumed transactions and returns the number
+        of transactions consumed.
+
+        If a chunk fails, its transactions are applied one at a time;
+        those that fail are marked `is_error` with the error, as
+        edc_sync does, and are not applied again.
+        """
+        consumed = 0
+        while True:
+            chunk = list(self.incoming_transaction_cls.objects.using(
+                self.using).filter(
+                    is_consumed=False, is_self=False, is_error=False).order_by(
+                        'timestamp', 'pk')[:self.chunk_size])
+            if not chunk:
+                break
+            try:
+                self.consume(chunk)
+            except Exception:
+                consumed += self.consume_each(chunk)
+            else:
+                consumed += len(chunk)
+        return consumed
+
+    def consume(self, chunk):
+        """Applies the chunk and marks it consumed in one database
+        transaction.
+        """
+        with transaction.atomic(using=self.using):
+            self.apply_chunk(chunk)
+            self.incoming_transaction_cls.objects.using(self.using).filter(
+                pk__in=[tx.pk for tx in chunk]).update(
+                    is_consumed=True, consumed_datetime=get_utcnow(),
+                    consumer=self.consumer)
+
+    def consume_each(self, chunk):
+        """Applies the transactions of a failed chunk one at a time and
+        returns the number consumed.
+        """
+        consumed = 0
+        for tx in chunk:
+            try:
+                self.consume([tx])
+            except Exception as e:
+                self.errors += 1
+                self.incoming_transaction_cls.objects.using(self.using).filter(
+                    pk=tx.pk).update(is_error=True, error=str(e))
+            else:
+                consumed += 1
+        return consumed
+
+    def latest(self, chunk):
+        """Returns an ordered dictionary of (action, record) by
+        (model label, pk), keeping the latest transaction of each object.
+        """
+        latest = OrderedDict()
+        for tx in chunk:
+            for record in json.loads(decrypt_payload(tx.tx)):
+                key = (record['model'].lower(), str(record['pk']))
+                latest.pop(key, None)
+                latest[key] = (tx.action, record)
+        return latest
+
+    def apply_chunk(self, chunk):
+        resolver = NaturalKeyResolver(using=self.using)
+        saves = OrderedDict()
+        deletes = OrderedDict()
+        for (label, _), (action, record) in self.latest(chunk).items():
+            target = deletes if action == DELETE else saves
+            target.setdefault(django_apps.get_model(label), []).append(record)
+        models = sort_dependencies(
+            [(None, list(saves) + list(deletes))])
+        for model_cls in models:
+            if model_cls in saves:
+                self.save(model_cls, saves[model_cls], resolver)
+        for model_cls in reversed(models):
+            if model_cls in deletes:
+                pks = [record['pk'] for record in deletes[model_cls]]
+                model_cls._default_manager.using(self.using).filter(
+                    pk__in=pks).delete()
+
+    def prefetch(self, model_cls, records, resolver):
+        natural_keys = {}
+        for record in records:
+            for name, value in record['fields'].items():
+                field = model_cls._meta.get_field(name)
+                if not field.is_relation or not value:
+                    continue
+                items = value if field.many_to_many else [value]
+                natural_keys.setdefault(field.related_model, []).extend(
+                    item for item in items if isinstance(item, list))
+        for related_model, keys in natural_keys.items():
+            resolver.prefetch(related_model, keys)
+
+    def build(self, model_cls, record, resolver):
+        """Returns an unsaved instance and its many to many pks.
+        """
+        opts = model_cls._meta
+        data = {opts.pk.attname: opts.pk.to_python(record['pk'])}
+        m2m_data = {}
+        for name, value in record['fields'].items():
+            field = opts.get_field(name)
+            if field.many_to_many:
+                m2m_data[field] = [
+                    resolver.resolve(field.related_model, item)
+                    if isinstance(item, list) else item for item in value]
+            elif field.is_relation:
+                if isinstance(value, list):
+                    value = resolver.resolve(field.related_model, value)
+                data[field.attname] = field.target_field.to_python(value)
+            else:
+                data[field.attname] = field.to_python(value)
+        return model_cls(**data), m2m_data
+
+    def save(self, model_cls, records, resolver):
+        self.prefetch(model_cls, records, resolver)
+        objs, m2m_data = [], {}
+        for record in records:
+            obj, obj_m2m_data = self.build(model_cls, record, resolver)
+            objs.append(obj)
+            m2m_data[obj.pk] = obj_m2m_data
+        manager = model_cls._default_manager.using(self.using)
+        existing = set(manager.filter(
+            pk__in=[obj.pk for obj in objs]).values_list('pk', flat=True))
+        for obj in objs:
+            pre_save.send(sender=model_cls, instance=obj, raw=True,
+                          using=self.using, update_fields=None)
+        manager.bulk_create(
+            [obj for obj in objs if obj.pk not in existing],
+            batch_size=self.chunk_size)
+        manager.bulk_update(
+            [obj for obj in objs if obj.pk in existing],
+            [field.name for field in model_cls._meta.concrete_fields
+             if not field.primary_key], batch_size=self.chunk_size)
+        for field in model_cls._meta.many_to_many:
+            self.set_m2m(field, {pk: values[field]
+                                 for pk, values in m2m_data.items()
+                                 if field in values})
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.using
+            post_save.send(sender=model_cls, instance=obj,
+                           created=obj.pk not in existing, update_fields=None,
+                           raw=True, using=self.using)
+
+    def set_m2m(self, field, values_by_pk):
+        """Replaces the many to many rows of the given objects.
+        """
+        if not values_by_pk:
+            return
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        manager = through._default_manager.using(self.using)
+        manager.filter(**{f'{source}__in': list(values_by_pk)}).delete()
+        manager.bulk_create([
+            through(**{source: pk, target: value})
+            for pk, values in values_by_pk.items() for value in values],
+            batch_size=self.chunk_size)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from ...incoming_transactions import IncomingTransactionApplier
+
+
+class Command(BaseCommand):
+
+    help = ('Apply unconsumed incoming sync transactions in bulk, chunk by '
+            'chunk in dependency order. Signals are sent in raw mode.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=None,
+            help='Number of incoming transactions applied per DB transaction')
+
+        parser.add_argument(
+            '--database',
+            dest='using',
+            default='default',
+            help='Database to apply the transactions to')
+
+    def handle(self, *args, **options):
+        applier = IncomingTransactionApplier(
+            chunk_size=options.get('chunk_size'),
+            using=options.get('using'))
+        consumed = applier.apply()
+        self.stdout.write(self.style.SUCCESS(
+            f'Applied {consumed} incoming transactions.'))
+        if applier.errors:
+            self.stdout.write(self.style.WARNING(
+                f'{applier.errors} incoming transactions failed and were '
+                'marked is_error.'))
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from edc_base.utils import get_utcnow
+
+from ...history_archive import HistoryArchiver, HistoryArchiveError
+
+
+class Command(BaseCommand):
+
+    help = ('Move history rows older than a cutoff, or of subjects taken '
+            'off study, into gzipped files indexed by HistoryArchive. '
+            'Interrupted runs are resumed by running the command again.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            dest='path',
+            default=None,
+            help='Archive directory (default POTLAKO_HISTORY_ARCHIVE_PATH)')
+
+        parser.add_argument(
+            '--before',
+            dest='before',
+            default=None,
+            help='Archive rows with a history date before YYYY-MM-DD')
+
+        parser.add_argument(
+            '--days',
+            dest='days',
+            type=int,
+            default=None,
+            help='Archive rows with a history date older than this many days')
+
+        parser.add_argument(
+            '--closed',
+            dest='closed',
+            action='store_true',
+            default=False,
+            help='Archive the rows of subjects taken off study')
+
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=None,
+            help='Number of rows archived per DB transaction')
+
+    def get_before(self, options):
+        if options.get('before'):
+            before = parse_date(options.get('before'))
+            if not before:
+                raise CommandError(
+                    f'Invalid date {options.get("before")}. Use YYYY-MM-DD.')
+            return before
+        if options.get('days') is not None:
+            return get_utcnow() - timedelta(days=options.get('days'))
+        return None
+
+    def handle(self, *args, **options):
+        try:
+            archiver = HistoryArchiver(
+                path=options.get('path'),
+                before=self.get_before(options),
+                closed=options.get('closed'),
+                chunk_size=options.get('chunk_size'))
+        except HistoryArchiveError as e:
+            raise CommandError(e)
+        counts = archiver.archive()
+        for label, count in counts.items():
+            if count:
+                self.stdout.write(f'{label}: {count} rows.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {sum(counts.values())} history rows to {archiver.path}.'))
@@ -0,0 +1,44 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand
+
+from ...models.model_mixins import blind_index
+from ...utils import chunked
+
+
+class Command(BaseCommand):
+
+    help = ('Backfill the blind index columns of encrypted identity fields, '
+            'e.g. after adding the columns or changing '
+            'POTLAKO_BLIND_INDEX_KEY. Rows are updated with bulk_update(), '
+            'no save signals, history or outgoing transactions are created.')
+
+    models = ['potlako_subject.cliniciancallenrollment',
+              'potlako_subject.subjectconsent']
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=500,
+            help='Number of rows read and updated per chunk')
+
+    def handle(self, *args, **options):
+        for model in self.models:
+            model_cls = django_apps.get_model(model)
+            fields = list(model_cls.blind_index_fields.items())
+            queryset = model_cls.objects.order_by('pk').values_list(
+                'pk', *[field for field, _ in fields])
+            updated = 0
+            for chunk in chunked(queryset, options.get('chunk_size')):
+                objs = []
+                for row in chunk:
+                    obj = model_cls(pk=row[0])
+                    for (_, bidx_field), value in zip(fields, row[1:]):
+                        setattr(obj, bidx_field, blind_index(value))
+                    objs.append(obj)
+                model_cls.objects.bulk_update(
+                    objs, [bidx_field for _, bidx_field in fields])
+                updated += len(objs)
+            self.stdout.write(self.style.SUCCESS(
+                f'{model}: {updated} rows updated.'))
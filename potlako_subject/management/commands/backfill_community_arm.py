@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand
+
+from ...community_arm import community_arm_for_facility
+from ...utils import chunked
+
+
+class Command(BaseCommand):
+
+    help = ('Backfill and check the denormalized community_arm column on '
+            'clinician call enrollment, subject consent and onschedule. '
+            'Rows are updated with queryset.update(), no save signals, '
+            'history or outgoing transactions are created.')
+
+    enrollment_model = 'potlako_subject.cliniciancallenrollment'
+    consent_model = 'potlako_subject.subjectconsent'
+    onschedule_model = 'potlako_subject.onschedule'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=500,
+            help='Number of rows read and updated per chunk')
+
+        parser.add_argument(
+            '--check',
+            dest='check',
+            action='store_true',
+            default=False,
+            help='Report mismatches only, do not update')
+
+    def handle(self, *args, **options):
+        self.chunk_size = options.get('chunk_size')
+        self.check = options.get('check')
+
+        self.backfill(
+            self.enrollment_model, 'facility',
+            lambda facilities: {
+                facility: community_arm_for_facility(facility)
+                for facility in facilities})
+        self.backfill(
+            self.consent_model, 'screening_identifier',
+            self.enrollment_community_arms)
+        self.backfill(
+            self.onschedule_model, 'subject_identifier',
+            self.consent_community_arms)
+
+    def backfill(self, model, key_field, get_community_arms):
+        """Compares the stored community arm of each row to the expected
+        value for its key and updates mismatched rows by arm.
+        """
+        model_cls = django_apps.get_model(model)
+        queryset = model_cls.objects.order_by('pk').values_list(
+            'pk', key_field, 'community_arm')
+        total = mismatched = 0
+        for chunk in chunked(queryset, self.chunk_size):
+            community_arms = get_community_arms(
+                {key for _, key, _ in chunk})
+            updates = defaultdict(list)
+            for pk, key, community_arm in chunk:
+                expected = community_arms.get(key)
+                if community_arm != expected:
+                    updates[expected].append(pk)
+            for community_arm, pks in updates.items():
+                mismatched += len(pks)
+                if not self.check:
+                    model_cls.objects.filter(pk__in=pks).update(
+                        community_arm=community_arm)
+            total += len(chunk)
+        action = 'mismatched' if self.check else 'updated'
+        style = self.style.WARNING if (self.check and mismatched) else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{model}: {mismatched} of {total} rows {action}.'))
+
+    def enrollment_community_arms(self, screening_identifiers):
+        enrollment_cls = django_apps.get_model(self.enrollment_model)
+        return {
+            screening_identifier: community_arm_for_facility(facility)
+            for screening_identifier, facility in enrollment_cls.objects.filter(
+                screening_identifier__in=screening_identifiers).values_list(
+                    'screening_identifier', 'facility')}
+
+    def consent_community_arms(self, subject_identifiers):
+        consent_cls = django_apps.get_model(self.consent_model)
+        consents = consent_cls.objects.filter(
+            subject_identifier__in=subject_identifiers).values_list(
+                'subject_identifier', 'screening_identifier')
+        screening_identifiers = dict(consents)
+        community_arms = self.enrollment_community_arms(
+            set(screening_identifiers.values()))
+        return {
+            subject_identifier: community_arms.get(screening_identifier)
+            for subject_identifier, screening_identifier in screening_identifiers.items()}
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from ...sms_dispatcher import SmsDispatcher, dispatch_due_sms
+
+
+class Command(BaseCommand):
+
+    help = ('Send queued SMS reminders that are due, in batches, at the '
+            'configured rate.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rate',
+            dest='rate',
+            type=float,
+            default=None,
+            help='Maximum sends per second (POTLAKO_SMS_RATE)')
+
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=None,
+            help='Number of reminders per batch (POTLAKO_SMS_BATCH_SIZE)')
+
+        parser.add_argument(
+            '--workers',
+            dest='workers',
+            type=int,
+            default=None,
+            help='Number of concurrent sends (POTLAKO_SMS_WORKERS)')
+
+    def handle(self, *args, **options):
+        dispatcher = SmsDispatcher(
+            rate=options.get('rate'),
+            batch_size=options.get('batch_size'),
+            workers=options.get('workers'))
+        totals = dispatch_due_sms(dispatcher=dispatcher)
+        summary = ', '.join(
+            f'{count} {status}' for status, count in sorted(totals.items()))
+        self.stdout.write(self.style.SUCCESS(
+            f'SMS reminders: {summary or "none due"}.'))
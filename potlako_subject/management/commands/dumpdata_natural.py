@@ -0,0 +1,75 @@
+import sys
+
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers import sort_dependencies
+
+from ...natural_key_serializer import NaturalKeySerializer
+
+
+class Command(BaseCommand):
+
+    help = ('Output the contents of the given apps or models with natural '
+            'foreign keys, like dumpdata, reading the rows in chunks with '
+            'the related objects their natural keys need.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'labels',
+            nargs='+',
+            metavar='app_label[.ModelName]',
+            help='Apps or models to dump')
+
+        parser.add_argument(
+            '--format',
+            dest='format',
+            default='json',
+            help='Serialization format')
+
+        parser.add_argument(
+            '--output',
+            dest='output',
+            default=None,
+            help='Output file (default stdout)')
+
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=None,
+            help='Number of rows read per query')
+
+        parser.add_argument(
+            '--natural-primary',
+            dest='use_natural_primary_keys',
+            action='store_true',
+            default=False,
+            help='Use natural primary keys if available')
+
+    def get_models(self, labels):
+        models = []
+        for label in labels:
+            try:
+                if '.' in label:
+                    models.append(django_apps.get_model(label))
+                else:
+                    models.extend(
+                        django_apps.get_app_config(label).get_models())
+            except LookupError as e:
+                raise CommandError(e)
+        return sort_dependencies([(None, models)])
+
+    def handle(self, *args, **options):
+        serializer = NaturalKeySerializer(
+            format=options.get('format'),
+            chunk_size=options.get('chunk_size'),
+            use_natural_primary_keys=options.get('use_natural_primary_keys'))
+        querysets = [model_cls._default_manager.all()
+                     for model_cls in self.get_models(options.get('labels'))]
+        output = options.get('output')
+        stream = open(output, 'w') if output else sys.stdout
+        try:
+            serializer.serialize(querysets, stream=stream)
+        finally:
+            if output:
+                stream.close()
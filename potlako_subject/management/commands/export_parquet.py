@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...parquet_export import ParquetExporter, ParquetExportError
+
+
+class Command(BaseCommand):
+
+    help = ('Export the CRFs to Parquet: one file per CRF and per CRF many '
+            'to many field, the visits with their appointments and a wide '
+            'visit-level table. Only rows modified since the last export '
+            'are read unless --full is given. Requires pyarrow.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            dest='path',
+            default=getattr(settings, 'POTLAKO_PARQUET_EXPORT_PATH', None),
+            help='Output directory (default POTLAKO_PARQUET_EXPORT_PATH)')
+
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=None,
+            help='Number of rows read per query')
+
+        parser.add_argument(
+            '--full',
+            dest='full',
+            action='store_true',
+            default=False,
+            help='Export all rows, ignoring the previous export')
+
+    def handle(self, *args, **options):
+        if not options.get('path'):
+            raise CommandError(
+                'Specify --path or set POTLAKO_PARQUET_EXPORT_PATH.')
+        try:
+            exporter = ParquetExporter(
+                path=options.get('path'),
+                chunk_size=options.get('chunk_size'),
+                full=options.get('full'))
+        except ParquetExportError as e:
+            raise CommandError(e)
+        counts = exporter.export()
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count} rows.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {sum(counts.values())} rows to {exporter.path}.'))
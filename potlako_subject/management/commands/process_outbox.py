@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from ...outbox import process_pending, purge_processed
+
+
+class Command(BaseCommand):
+
+    help = ('Process pending outbox messages that are due, e.g. messages '
+            'that could not be dispatched to django_q or are waiting for '
+            'a retry.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            dest='limit',
+            type=int,
+            default=None,
+            help='Maximum number of messages to process')
+
+        parser.add_argument(
+            '--purge',
+            dest='purge',
+            action='store_true',
+            default=False,
+            help='Also delete messages processed more than '
+                 'POTLAKO_OUTBOX_RETENTION_DAYS ago')
+
+    def handle(self, *args, **options):
+        count = process_pending(limit=options.get('limit'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {count} outbox messages.'))
+        if options.get('purge'):
+            deleted = purge_processed()
+            self.stdout.write(self.style.SUCCESS(
+                f'Deleted {deleted} processed outbox messages.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...due_calls import rebuild_due_calls
+
+
+class Command(BaseCommand):
+
+    help = ('Rebuild the due calls table from missed call records, patient '
+            'availability log entries and new appointments.')
+
+    def handle(self, *args, **options):
+        count = rebuild_due_calls()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} due calls.'))
@@ -0,0 +1,63 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand
+
+from ...action_item_reconciler import ActionItemReconciler
+from ...utils import chunked
+
+
+class Command(BaseCommand):
+
+    help = ('Create, reopen or delete action items for all subjects from '
+            'the action item rules in potlako_subject.action_item_reconciler.')
+
+    consent_model = 'potlako_subject.subjectconsent'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=500,
+            help='Number of subjects reconciled per chunk')
+
+        parser.add_argument(
+            '--dry-run',
+            dest='dry_run',
+            action='store_true',
+            default=False,
+            help='Report the changes only, do not update')
+
+        parser.add_argument(
+            '--subject-identifier',
+            dest='subject_identifiers',
+            action='append',
+            help='Reconcile the given subject only, may be repeated')
+
+    def handle(self, *args, **options):
+        dry_run = options.get('dry_run')
+        reconciler = ActionItemReconciler(dry_run=dry_run)
+
+        subject_identifiers = options.get('subject_identifiers')
+        if not subject_identifiers:
+            consent_cls = django_apps.get_model(self.consent_model)
+            subject_identifiers = consent_cls.objects.order_by(
+                'subject_identifier').values_list(
+                    'subject_identifier', flat=True).distinct()
+            chunks = chunked(subject_identifiers, options.get('chunk_size'))
+        else:
+            chunks = [subject_identifiers]
+
+        totals = dict(created=0, reopened=0, deleted=0)
+        for chunk in chunks:
+            report = reconciler.reconcile(subject_identifiers=chunk)
+            for action, keys in report.items():
+                totals[action] += len(keys)
+                if options.get('verbosity') > 1:
+                    for subject_identifier, action_name in keys:
+                        self.stdout.write(
+                            f'{subject_identifier}: {action_name} {action}.')
+
+        prefix = 'Would have created' if dry_run else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {totals["created"]}, reopened '
+            f'{totals["reopened"]} and deleted {totals["deleted"]} action items.'))
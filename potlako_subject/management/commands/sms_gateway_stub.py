@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+
+    help = ('Run a local stand-in for the SMS gateway at BASE_API_URL, '
+            'e.g. to test dispatcher throughput offline. Set BASE_API_URL '
+            'to http://<host>:<port>/ to use it.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--host',
+            dest='host',
+            default='127.0.0.1')
+
+        parser.add_argument(
+            '--port',
+            dest='port',
+            type=int,
+            default=8099)
+
+        parser.add_argument(
+            '--latency',
+            dest='latency',
+            type=float,
+            default=0.2,
+            help='Seconds to wait before responding')
+
+        parser.add_argument(
+            '--failure-rate',
+            dest='failure_rate',
+            type=float,
+            default=0.0,
+            help='Fraction of requests answered with a 503')
+
+    def handle(self, *args, **options):
+        latency = options.get('latency')
+        failure_rate = options.get('failure_rate')
+        stats = {'received': 0, 'failed': 0, 'started': time.monotonic()}
+        lock = threading.Lock()
+        stdout = self.stdout
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                data = parse_qs(self.rfile.read(length).decode())
+                time.sleep(latency)
+                failed = random.random() < failure_rate
+                with lock:
+                    stats['received'] += 1
+                    stats['failed'] += int(failed)
+                self.send_response(503 if failed else 200)
+                self.end_headers()
+                self.wfile.write(b'failed' if failed else b'sent')
+                if options.get('verbosity') > 1:
+                    stdout.write(f'{data.get("to")}: {data.get("message")}')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(
+            (options.get('host'), options.get('port')), Handler)
+        self.stdout.write(
+            f'SMS gateway stand-in listening on '
+            f'http://{options.get("host")}:{options.get("port")}/')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            elapsed = time.monotonic() - stats['started']
+            self.stdout.write(
+                f'Received {stats["received"]} messages, {stats["failed"]} '
+                f'failed, {stats["received"] / elapsed:.1f} per second.')
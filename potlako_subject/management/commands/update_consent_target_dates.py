@@ -0,0 +1,14 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+
+    help = ('Update the subject consent target date of the latest '
+            'outstanding evaluation timeline key step for all subjects.')
+
+    def handle(self, *args, **options):
+        consent_cls = django_apps.get_model('potlako_subject.subjectconsent')
+        updated = consent_cls.objects.update_target_date()
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated the target date of {updated} consents.'))
@@ -0,0 +1,28 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+class Command(BaseCommand):
+
+    help = ('Recount the missed call records of each missed call into '
+            'MissedCall.record_count. Metadata rules are not run.')
+
+    def handle(self, *args, **options):
+        missed_call_cls = django_apps.get_model('potlako_subject.missedcall')
+        record_cls = django_apps.get_model('potlako_subject.missedcallrecord')
+        record_count = record_cls.objects.filter(
+            missed_call=OuterRef('pk')).order_by().values(
+                'missed_call').annotate(count=Count('pk')).values('count')
+        missed_calls = missed_call_cls.objects.annotate(
+            current_record_count=Coalesce(
+                Subquery(record_count, output_field=IntegerField()), Value(0)))
+        updated = 0
+        for missed_call in missed_calls.iterator():
+            if missed_call.record_count != missed_call.current_record_count:
+                missed_call.record_count = missed_call.current_record_count
+                missed_call.save(update_fields=['record_count', 'modified'])
+                updated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated the record count of {updated} missed calls.'))
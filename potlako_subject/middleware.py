@@ -0,0 +1,67 @@
+import logging
+
+from django.conf import settings
+from edc_base.utils import get_utcnow
+
+from .appointment_timeline import appointment_timeline_scope
+from .bulk_decryption import bulk_decryption_scope
+from .cascade_tracer import cascade_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class AppointmentTimelineMiddleware:
+    """Shares one appointment timeline per subject across the signals
+    and form validators of a request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with appointment_timeline_scope():
+            return self.get_response(request)
+
+
+class BulkDecryptionMiddleware:
+    """Keeps bulk decrypted values for the life of a request and logs
+    the decrypt counts and time of the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with bulk_decryption_scope() as scope:
+            response = self.get_response(request)
+            if scope.stats.decrypted or scope.stats.cached:
+                logger.info(f'{request.path}: {scope.stats}')
+        return response
+
+
+class CascadeTraceMiddleware:
+    """Traces the saves, deletes and queries of POST requests
+    if POTLAKO_CASCADE_TRACE is set, writing each trace to
+    POTLAKO_CASCADE_TRACE_PATH as JSON and collapsed stacks.
+
+    See potlako_subject.cascade_tracer.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (request.method != 'POST'
+                or not getattr(settings, 'POTLAKO_CASCADE_TRACE', False)):
+            return self.get_response(request)
+        with cascade_tracer.trace(request.path) as root:
+            response = self.get_response(request)
+        logger.info(f'{request.path}: {root.seconds * 1000:.1f}ms, '
+                    f'{root.queries} queries')
+        path = getattr(settings, 'POTLAKO_CASCADE_TRACE_PATH', None)
+        if path:
+            filename = '{}_{}'.format(
+                get_utcnow().strftime('%Y%m%d%H%M%S%f'),
+                request.path.strip('/').replace('/', '_') or 'root')
+            cascade_tracer.write(root, path=path, filename=filename)
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliniciancallenrollment',
+            name='community_arm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='subjectconsent',
+            name='community_arm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=25, null=True),
+        ),
+        migrations.AlterField(
+            model_name='onschedule',
+            name='community_arm',
+            field=models.CharField(blank=True, db_index=True, max_length=25, null=True),
+        ),
+        migrations.AlterField(
+            model_name='historicalonschedule',
+            name='community_arm',
+            field=models.CharField(blank=True, db_index=True, max_length=25, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0002_community_arm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subjectconsent',
+            name='target_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0005_smsreminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='missedcall',
+            name='record_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of missed call records, maintained on save and delete'),
+        ),
+    ]
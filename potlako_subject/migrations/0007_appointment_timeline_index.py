@@ -0,0 +1,32 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:51
+
+from django.db import migrations, models
+
+appointment_timeline_index = models.Index(
+    fields=['subject_identifier', 'timepoint', 'visit_code_sequence'],
+    name='potlako_appt_timeline_idx')
+
+
+def add_index(apps, schema_editor):
+    appointment_cls = apps.get_model('edc_appointment', 'Appointment')
+    schema_editor.add_index(appointment_cls, appointment_timeline_index)
+
+
+def remove_index(apps, schema_editor):
+    appointment_cls = apps.get_model('edc_appointment', 'Appointment')
+    schema_editor.remove_index(appointment_cls, appointment_timeline_index)
+
+
+class Migration(migrations.Migration):
+    """Adds the composite index read by AppointmentTimeline to the
+    edc_appointment table, which this app does not own.
+    """
+
+    dependencies = [
+        ('edc_appointment', '0015_auto_20200516_1820'),
+        ('potlako_subject', '0006_missedcall_record_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:53
+
+import _socket
+from django.db import migrations, models
+import django_revision.revision_field
+import edc_base.model_fields.hostname_modification_field
+import edc_base.model_fields.userfield
+import edc_base.model_fields.uuid_auto_field
+import edc_base.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0007_appointment_timeline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DueCall',
+            fields=[
+                ('created', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('modified', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('user_created', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user created')),
+                ('user_modified', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user modified')),
+                ('hostname_created', models.CharField(blank=True, default=_socket.gethostname, help_text='System field. (modified on create only)', max_length=60)),
+                ('hostname_modified', edc_base.model_fields.hostname_modification_field.HostnameModificationField(blank=True, help_text='System field. (modified on every save)', max_length=50)),
+                ('revision', django_revision.revision_field.RevisionField(blank=True, editable=False, help_text='System field. Git repository tag:branch:commit.', max_length=75, null=True, verbose_name='Revision')),
+                ('device_created', models.CharField(blank=True, max_length=10)),
+                ('device_modified', models.CharField(blank=True, max_length=10)),
+                ('id', edc_base.model_fields.uuid_auto_field.UUIDAutoField(blank=True, editable=False, help_text='System auto field. UUID primary key.', primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('repeat_call', 'Repeat call'), ('availability', 'Call back'), ('appointment', 'Upcoming appointment')], max_length=15)),
+                ('source_id', models.CharField(max_length=36)),
+                ('subject_identifier', models.CharField(max_length=50, null=True)),
+                ('screening_identifier', models.CharField(max_length=36, null=True)),
+                ('due_date', models.DateField()),
+                ('priority', models.PositiveSmallIntegerField(help_text='1 is the highest priority')),
+            ],
+            options={
+                'verbose_name': 'Due Call',
+                'ordering': ('priority', 'due_date'),
+                'unique_together': {('source', 'source_id')},
+                'index_together': {('priority', 'due_date')},
+            },
+        ),
+    ]
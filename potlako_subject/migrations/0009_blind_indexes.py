@@ -0,0 +1,28 @@
+# Generated by Django 3.1.3 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0008_duecall'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliniciancallenrollment',
+            name='hospital_identity_bidx',
+            field=models.CharField(db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='cliniciancallenrollment',
+            name='national_identity_bidx',
+            field=models.CharField(db_index=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='subjectconsent',
+            name='identity_bidx',
+            field=models.CharField(db_index=True, editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.1.3 on 2026-10-18 11:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0009_blind_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='cancerdxandtx',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Cancer Diagnosis And Treatment Assessment'},
+        ),
+        migrations.AlterModelOptions(
+            name='cancerdxandtxendpoint',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Cancer Diagnosis And Treatment Assessment - Endpoint Recording', 'verbose_name_plural': 'Cancer Diagnosis And Treatment Assessments - Endpoint Recordings'},
+        ),
+        migrations.AlterModelOptions(
+            name='cliniciancallenrollment',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Clinician call - Enrollment', 'verbose_name_plural': 'Clinician call - Enrollment'},
+        ),
+        migrations.AlterModelOptions(
+            name='homevisit',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Home Visit'},
+        ),
+        migrations.AlterModelOptions(
+            name='investigationsordered',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Investigations - Ordered', 'verbose_name_plural': 'Investigations - Ordered'},
+        ),
+        migrations.AlterModelOptions(
+            name='investigationsresulted',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Investigations - Resulted', 'verbose_name_plural': 'Investigations - Resulted'},
+        ),
+        migrations.AlterModelOptions(
+            name='medicaldiagnosis',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Medical Diagnosis', 'verbose_name_plural': 'Medical Diagnoses'},
+        ),
+        migrations.AlterModelOptions(
+            name='missedcall',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Missed Call'},
+        ),
+        migrations.AlterModelOptions(
+            name='missedcallrecord',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Missed Call Record'},
+        ),
+        migrations.AlterModelOptions(
+            name='missedvisit',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Missed Visit'},
+        ),
+        migrations.AlterModelOptions(
+            name='patientcallfollowup',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Patient call - FollowUp'},
+        ),
+        migrations.AlterModelOptions(
+            name='patientcallinitial',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Patient call - Initial', 'verbose_name_plural': 'Patient call - Initial'},
+        ),
+        migrations.AlterModelOptions(
+            name='sms',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'SMS', 'verbose_name_plural': 'SMSes'},
+        ),
+        migrations.AlterModelOptions(
+            name='symptomandcareseekingassessment',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Symptom And Care Seeking Assessment'},
+        ),
+        migrations.AlterModelOptions(
+            name='symptomassessment',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Symptom Assessment'},
+        ),
+        migrations.AlterModelOptions(
+            name='symptomsandcareseekingendpoint',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Care Seeking Endpoint', 'verbose_name_plural': 'Symptom And Care Seeking - Endpoint Recording'},
+        ),
+        migrations.AlterModelOptions(
+            name='transport',
+            options={'default_permissions': ('add', 'change', 'delete', 'view', 'export'), 'verbose_name': 'Transport', 'verbose_name_plural': 'Transport'},
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.1.3 on 2026-10-18 11:50
+
+import _socket
+from django.db import migrations, models
+import django.db.models.deletion
+import django_revision.revision_field
+import edc_base.model_fields.hostname_modification_field
+import edc_base.model_fields.userfield
+import edc_base.model_fields.uuid_auto_field
+import edc_base.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0010_export_permissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryArchive',
+            fields=[
+                ('created', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('modified', models.DateTimeField(blank=True, default=edc_base.utils.get_utcnow)),
+                ('user_created', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user created')),
+                ('user_modified', edc_base.model_fields.userfield.UserField(blank=True, help_text='Updated by admin.save_model', max_length=50, verbose_name='user modified')),
+                ('hostname_created', models.CharField(blank=True, default=_socket.gethostname, help_text='System field. (modified on create only)', max_length=60)),
+                ('hostname_modified', edc_base.model_fields.hostname_modification_field.HostnameModificationField(blank=True, help_text='System field. (modified on every save)', max_length=50)),
+                ('revision', django_revision.revision_field.RevisionField(blank=True, editable=False, help_text='System field. Git repository tag:branch:commit.', max_length=75, null=True, verbose_name='Revision')),
+                ('device_created', models.CharField(blank=True, max_length=10)),
+                ('device_modified', models.CharField(blank=True, max_length=10)),
+                ('id', edc_base.model_fields.uuid_auto_field.UUIDAutoField(blank=True, editable=False, help_text='System auto field. UUID primary key.', primary_key=True, serialize=False)),
+                ('history_model', models.CharField(max_length=100)),
+                ('partition', models.CharField(help_text='YYYY-MM of the history dates in the file', max_length=7)),
+                ('path', models.CharField(help_text='Relative to POTLAKO_HISTORY_ARCHIVE_PATH', max_length=255, unique=True)),
+                ('first_history_date', models.DateTimeField()),
+                ('last_history_date', models.DateTimeField()),
+                ('rows', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'History Archive',
+                'index_together': {('history_model', 'partition')},
+            },
+        ),
+        migrations.CreateModel(
+            name='HistoryArchiveObject',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(db_index=True, max_length=36)),
+                ('archive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='potlako_subject.historyarchive')),
+            ],
+            options={
+                'unique_together': {('archive', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.1.3 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+def delivered_to_sent(apps, schema_editor):
+    for model_name in ['smsreminder', 'historicalsmsreminder']:
+        model_cls = apps.get_model('potlako_subject', model_name)
+        model_cls.objects.filter(
+            delivery_status='delivered').update(delivery_status='sent')
+
+
+def sent_to_delivered(apps, schema_editor):
+    for model_name in ['smsreminder', 'historicalsmsreminder']:
+        model_cls = apps.get_model('potlako_subject', model_name)
+        model_cls.objects.filter(
+            delivery_status='sent').update(delivery_status='delivered')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('potlako_subject', '0011_historyarchive'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='historicalsmsreminder',
+            old_name='delivery_datetime',
+            new_name='sent_datetime',
+        ),
+        migrations.RenameField(
+            model_name='smsreminder',
+            old_name='delivery_datetime',
+            new_name='sent_datetime',
+        ),
+        migrations.AlterField(
+            model_name='historicalsmsreminder',
+            name='delivery_status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=15),
+        ),
+        migrations.AlterField(
+            model_name='smsreminder',
+            name='delivery_status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=15),
+        ),
+        migrations.RunPython(delivered_to_sent, sent_to_delivered),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.1.3 on 2026-10-18 14:45
+
+from django.conf import settings
+from django.contrib.auth.management import create_permissions
+from django.db import migrations
+
+
+def grant_export_permissions(apps, schema_editor):
+    """Grants the export permission of each model to the groups and
+    users that could view or change it, as the CSV export action was
+    offered to them before it required the export permission.
+    """
+    app_config = apps.get_app_config('potlako_subject')
+    app_config.models_module = True
+    create_permissions(app_config, apps=apps, verbosity=0)
+    app_config.models_module = None
+
+    group_cls = apps.get_model('auth', 'group')
+    permission_cls = apps.get_model('auth', 'permission')
+    user_cls = apps.get_model(settings.AUTH_USER_MODEL)
+    for permission in permission_cls.objects.filter(
+            content_type__app_label='potlako_subject',
+            codename__startswith='export_'):
+        model_name = permission.codename[len('export_'):]
+        opts = dict(
+            content_type=permission.content_type,
+            codename__in=[f'view_{model_name}', f'change_{model_name}'])
+        permission.group_set.add(*group_cls.objects.filter(
+            permissions__in=permission_cls.objects.filter(**opts)).distinct())
+        permission.user_set.add(*user_cls.objects.filter(
+            user_permissions__in=permission_cls.objects.filter(
+                **opts)).distinct())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('potlako_subject', '0012_smsreminder_sent'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            grant_export_permissions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import transaction
+
+from .outbox import enqueue
+
+missed_call_model = 'potlako_subject.missedcall'
+
+_pending = ContextVar('missed_call_records_pending', default=None)
+
+
+def missed_call_threshold():
+    """Returns the number of missed call records after which the
+    metadata rules are run.
+    """
+    return getattr(settings, 'POTLAKO_MISSED_CALL_THRESHOLD', 3)
+
+
+def update_record_count(missed_call_pk=None, by=None):
+    """Updates MissedCall.record_count by `by` and runs the metadata
+    rules when the count crosses the threshold.
+
+    The count is saved with update_fields so history and outgoing
+    transactions are kept. Returns the new count.
+    """
+    missed_call_cls = django_apps.get_model(missed_call_model)
+    with transaction.atomic():
+        missed_call = missed_call_cls.objects.select_for_update().get(
+            pk=missed_call_pk)
+        previous = missed_call.record_count
+        missed_call.record_count = max(previous + by, 0)
+        missed_call.save(update_fields=['record_count', 'modified'])
+    if previous < missed_call_threshold() <= missed_call.record_count:
+        enqueue('run_missed_call_metadata_rules',
+                idempotency_key=(f'run_missed_call_metadata_rules:{missed_call_pk}:'
+                                 f'{missed_call.modified.isoformat()}'),
+                missed_call=str(missed_call_pk))
+    return missed_call.record_count
+
+
+def missed_call_record_added(missed_call_pk=None):
+    pending = _pending.get()
+    if pending is not None:
+        pending[missed_call_pk] += 1
+    else:
+        update_record_count(missed_call_pk=missed_call_pk, by=1)
+
+
+def missed_call_record_removed(missed_call_pk=None):
+    pending = _pending.get()
+    if pending is not None:
+        pending[missed_call_pk] -= 1
+    else:
+        update_record_count(missed_call_pk=missed_call_pk, by=-1)
+
+
+@contextmanager
+def missed_call_records_bulk():
+    """Defers record count updates until the block exits, then updates
+    each missed call once, e.g. for an inline formset saving several
+    records in one request.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    token = _pending.set(Counter())
+    try:
+        yield
+        pending = _pending.get()
+    finally:
+        _pending.reset(token)
+    for missed_call_pk, by in pending.items():
+        if by:
+            update_record_count(missed_call_pk=missed_call_pk, by=by)
@@ -4,6 +4,8 @@ from .cancer_dx_and_tx import CancerDxAndTx
 from .cancer_dx_and_tx_endpoint import CancerDxAndTxEndpoint
 from .clinician_call_enrollment import ClinicianCallEnrollment
 from .clinician_call_enrollment import NextOfKin
+from .due_call import DueCall
+from .history_archive import HistoryArchive, HistoryArchiveObject
 from .home_visit import HomeVisit
 from .investigations_ordered import InvestigationsOrdered
 from .investigations_ordered import LabTest
@@ -16,19 +18,34 @@ from .missed_visit import MissedVisit
 from .navigation_summary_and_plan import EvaluationTimeline
 from .navigation_summary_and_plan import NavigationSummaryAndPlan
 from .onschedule import OnSchedule
+from .outbox_message import OutboxMessage
 from .patient_availability_log import PatientAvailabilityLog, PatientAvailabilityLogEntry
 from .patient_call_followup import FacilityVisit
 from .patient_call_followup import PatientCallFollowUp
 from .patient_call_initial import PatientCallInitial
 from .patient_call_initial import PreviousFacilityVisit
+from .signals import appointment_due_call_on_post_delete, appointment_due_call_on_post_save
+from .signals import appointment_timeline_on_post_save
+from .signals import clinician_call_enrollment_community_arm_on_post_save
 from .signals import clinician_call_enrollment_on_post_save
+from .signals import evaluation_timeline_on_post_delete
+from .signals import evaluation_timeline_on_post_save
 from .signals import home_visit_on_post_save
-from .signals import missed_call_on_post_save
+from .signals import missed_call_due_call_on_post_delete
+from .signals import missed_call_due_call_on_post_save
+from .signals import missed_call_due_call_on_pre_delete
+from .signals import missed_call_on_post_delete, missed_call_on_post_save
+from .signals import missed_call_record_due_call_on_post_save
+from .signals import patient_availability_due_call_on_post_save
+from .signals import patient_availability_log_due_call_on_post_delete
+from .signals import patient_availability_log_due_call_on_pre_delete
+from .signals import onschedule_community_arm_on_post_save
 from .signals import patient_call_followup_on_post_save
 from .signals import patient_call_initial_on_post_save
 from .signals import subject_consent_on_post_save
 from .signals import subject_visit_on_post_save
 from .sms import SMS
+from .sms_reminder import SmsReminder
 from .subject_consent import SubjectConsent
 from .subject_locator import SubjectLocator
 from .subject_screening import SubjectScreening
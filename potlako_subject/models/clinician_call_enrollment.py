@@ -23,9 +23,11 @@ from ..choices import CANCER_SUSPECT, ENROLLMENT_SITES
 from ..choices import CLINICIAN_TYPE, FACILITY, FACILITY_UNIT, DISPOSITION
 from ..choices import KIN_RELATIONSHIP, SCALE, SEVERITY_LEVEL, PAIN_SCORE
 from ..choices import SUSPECTED_CANCER, TRIAGE_STATUS, DATE_ESTIMATION
+from ..community_arm import community_arm_for_facility
 from ..eligibility import Eligibility
 from ..screening_identifier import ScreeningIdentifier
 from .list_models import Symptoms
+from .model_mixins import BlindIndexManagerMixin, BlindIndexModelMixin
 from .validators import datetime_not_now, identity_check, age_check
 
 
@@ -42,18 +44,24 @@ class SearchSlugModelMixin(Base):
         abstract = True
 
 
-class ClinicianCallEnrollmentManager(SearchSlugManager, models.Manager):
+class ClinicianCallEnrollmentManager(BlindIndexManagerMixin, SearchSlugManager,
+                                     models.Manager):
 
     def get_by_natural_key(self, screening_identifier):
         return self.get(screening_identifier=screening_identifier)
 
 
 class ClinicianCallEnrollment(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin,
-                              SearchSlugModelMixin, BaseUuidModel):
+                              SearchSlugModelMixin, BlindIndexModelMixin,
+                              BaseUuidModel):
 
     identifier_cls = ScreeningIdentifier
     eligibility_cls = Eligibility
 
+    blind_index_fields = {'national_identity': 'national_identity_bidx',
+                          'hospital_identity': 'hospital_identity_bidx'}
+    blind_index_default_field = 'national_identity'
+
     report_datetime = models.DateTimeField(
         verbose_name='Report Time and Date',
         default=get_utcnow,
@@ -118,6 +126,13 @@ class ClinicianCallEnrollment(NonUniqueSubjectIdentifierFieldMixin, SiteModelMix
 
     facility_other = OtherCharField()
 
+    community_arm = models.CharField(
+        max_length=25,
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True)
+
     facility_unit = models.CharField(
         verbose_name='Unit at facility where patient was seen at '
                      'enrollment',
@@ -142,6 +157,18 @@ class ClinicianCallEnrollment(NonUniqueSubjectIdentifierFieldMixin, SiteModelMix
         blank=True,
         null=True)
 
+    national_identity_bidx = models.CharField(
+        max_length=64,
+        null=True,
+        editable=False,
+        db_index=True)
+
+    hospital_identity_bidx = models.CharField(
+        max_length=64,
+        null=True,
+        editable=False,
+        db_index=True)
+
     last_name = LastnameField(
         verbose_name='Patient last name',
         blank=False,)
@@ -363,12 +390,14 @@ class ClinicianCallEnrollment(NonUniqueSubjectIdentifierFieldMixin, SiteModelMix
         if eligibility_obj.reasons_ineligible:
             self.ineligibility = eligibility_obj.reasons_ineligible
         self.contact_date = self.report_datetime.date()
+        self.community_arm = community_arm_for_facility(self.facility)
         super().save(*args, **kwargs)
 
     class Meta:
         app_label = 'potlako_subject'
         verbose_name = 'Clinician call - Enrollment'
         verbose_name_plural = 'Clinician call - Enrollment'
+        default_permissions = ('add', 'change', 'delete', 'view', 'export')
 
 
 class NextOfKinManager(models.Manager):
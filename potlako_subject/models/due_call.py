@@ -0,0 +1,43 @@
+from django.db import models
+from edc_base.model_mixins import BaseUuidModel
+
+from ..choices import DUE_CALL_SOURCE
+
+
+class DueCall(BaseUuidModel):
+    """A call due to a participant, maintained on save of the missed
+    call records, patient availability log entries and appointments it
+    is derived from.
+
+    See potlako_subject.due_calls.
+    """
+
+    source = models.CharField(
+        max_length=15,
+        choices=DUE_CALL_SOURCE)
+
+    source_id = models.CharField(
+        max_length=36)
+
+    subject_identifier = models.CharField(
+        max_length=50,
+        null=True)
+
+    screening_identifier = models.CharField(
+        max_length=36,
+        null=True)
+
+    due_date = models.DateField()
+
+    priority = models.PositiveSmallIntegerField(
+        help_text='1 is the highest priority')
+
+    def __str__(self):
+        return f'{self.subject_identifier or self.screening_identifier} ({self.due_date})'
+
+    class Meta:
+        app_label = 'potlako_subject'
+        verbose_name = 'Due Call'
+        unique_together = ('source', 'source_id')
+        index_together = ('priority', 'due_date')
+        ordering = ('priority', 'due_date')
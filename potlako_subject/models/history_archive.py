@@ -0,0 +1,56 @@
+from django.db import models
+from edc_base.model_mixins import BaseUuidModel
+
+
+class HistoryArchive(BaseUuidModel):
+    """A gzipped file of history rows moved out of a history table,
+    one month of one history model per file.
+
+    See potlako_subject.history_archive.
+    """
+
+    history_model = models.CharField(
+        max_length=100)
+
+    partition = models.CharField(
+        max_length=7,
+        help_text='YYYY-MM of the history dates in the file')
+
+    path = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text='Relative to POTLAKO_HISTORY_ARCHIVE_PATH')
+
+    first_history_date = models.DateTimeField()
+
+    last_history_date = models.DateTimeField()
+
+    rows = models.PositiveIntegerField()
+
+    sha256 = models.CharField(
+        max_length=64)
+
+    def __str__(self):
+        return f'{self.history_model} {self.partition} ({self.rows})'
+
+    class Meta:
+        app_label = 'potlako_subject'
+        verbose_name = 'History Archive'
+        index_together = ('history_model', 'partition')
+
+
+class HistoryArchiveObject(models.Model):
+    """An object with history rows in an archive.
+    """
+
+    archive = models.ForeignKey(
+        HistoryArchive,
+        on_delete=models.CASCADE)
+
+    object_id = models.CharField(
+        max_length=36,
+        db_index=True)
+
+    class Meta:
+        app_label = 'potlako_subject'
+        unique_together = ('archive', 'object_id')
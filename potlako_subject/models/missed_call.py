@@ -21,6 +21,11 @@ class MissedCall(CrfModelMixin):
         null=True,
         blank=True)
 
+    record_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of missed call records, maintained on save and delete')
+
     class Meta(CrfModelMixin.Meta):
         app_label = 'potlako_subject'
         verbose_name = 'Missed Call'
@@ -1,3 +1,6 @@
 from .crf_model_mixin import CrfModelMixin
 from .search_slug_model_mixin import SearchSlugModelMixin
-from .baseline_road_map_mixin import BaselineRoadMapMixin
+from .baseline_road_map_mixin import BaselineRoadMapLoader, BaselineRoadMapMixin
+from .baseline_road_map_mixin import LazyBaselineRoadMap
+from .blind_index_model_mixin import BlindIndexManagerMixin, BlindIndexModelMixin
+from .blind_index_model_mixin import blind_index
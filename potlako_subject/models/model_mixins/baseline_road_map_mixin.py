@@ -1,8 +1,215 @@
+from collections.abc import Mapping
+from functools import partial
+
 from django.apps import apps as django_apps
-from django.db.models import Q
+from django.db.models import OuterRef, Q, Subquery
+from django.utils.functional import SimpleLazyObject
+
+
+class BaselineRoadMapLoader:
+    """A class to load the Baseline Roadmap models for one or more
+    subjects in a fixed number of queries.
+
+    A call to `load` runs one query for screening identifiers (plus one
+    for subjects with more than one screening), one for clinician call
+    enrollments, one per CRF and non-CRF model and one for the latest
+    Patient Call Followup complaints, regardless of the number of
+    subjects.
+    """
+
+    screening_model = 'potlako_subject.subjectscreening'
+    consent_model = 'potlako_subject.subjectconsent'
+    clinician_call_model = 'potlako_subject.cliniciancallenrollment'
+    followup_model = 'potlako_subject.patientcallfollowup'
+
+    crfs_list = ['potlako_subject.cancerdxandtx',
+                 'potlako_subject.symptomandcareseekingassessment',
+                 'potlako_subject.patientcallinitial',
+                 'potlako_subject.investigationsordered',
+                 'potlako_subject.investigationsresulted',
+                 'potlako_subject.medicaldiagnosis']
+
+    non_crfs_list = ['potlako_subject.baselineclinicalsummary',
+                     'potlako_subject.navigationsummaryandplan']
+
+    def __init__(self, subject_identifiers=None):
+        self.subject_identifiers = list(dict.fromkeys(
+            subject_identifiers or []))
+        self._screening_identifiers = None
+
+    def load(self):
+        """Returns a dictionary of baseline_dict by subject identifier.
+        """
+        baseline_dicts = {subject_identifier: {}
+                          for subject_identifier in self.subject_identifiers}
+        for subject_identifier, obj in self.clinician_calls().items():
+            baseline_dicts[subject_identifier].update(
+                {'cliniciancallenrollment': obj})
+        for crf_model in self.crfs_list:
+            for subject_identifier, obj in self.crfs(crf_model).items():
+                baseline_dicts[subject_identifier].update(
+                    {crf_model.split('.')[1]: obj})
+        for crf_model in self.non_crfs_list:
+            for subject_identifier, obj in self.non_crfs(crf_model).items():
+                baseline_dicts[subject_identifier].update(
+                    {crf_model.split('.')[1]: obj})
+        for subject_identifier, description in (
+                self.extra_symptoms_descriptions().items()):
+            baseline_dicts[subject_identifier].update(
+                {'extra_symptoms_description': description})
+        return baseline_dicts
+
+    @property
+    def keys(self):
+        return (['cliniciancallenrollment'] +
+                [crf_model.split('.')[1] for crf_model in self.crfs_list] +
+                [crf_model.split('.')[1] for crf_model in self.non_crfs_list] +
+                ['extra_symptoms_description'])
+
+    def get(self, subject_identifier, key):
+        """Returns the value of a single baseline_dict key for a subject,
+        querying only the model the key refers to.
+        """
+        if key == 'cliniciancallenrollment':
+            return self.clinician_calls().get(subject_identifier)
+        elif key == 'extra_symptoms_description':
+            return self.extra_symptoms_descriptions().get(subject_identifier)
+        for crf_model in self.crfs_list:
+            if crf_model.split('.')[1] == key:
+                return self.crfs(crf_model).get(subject_identifier)
+        for crf_model in self.non_crfs_list:
+            if crf_model.split('.')[1] == key:
+                return self.non_crfs(crf_model).get(subject_identifier)
+        return None
+
+    @property
+    def screening_identifiers(self):
+        """Returns a dictionary of screening identifier by subject
+        identifier.
+
+        If a subject has more than one screening, the screening
+        identifier is taken from the consent.
+        """
+        if self._screening_identifiers is None:
+            screening_cls = django_apps.get_model(self.screening_model)
+            consent_cls = django_apps.get_model(self.consent_model)
+
+            screenings = {}
+            for subject_identifier, screening_identifier in (
+                    screening_cls.objects.filter(
+                        subject_identifier__in=self.subject_identifiers).values_list(
+                            'subject_identifier', 'screening_identifier')):
+                screenings.setdefault(subject_identifier, []).append(
+                    screening_identifier)
+
+            screening_identifiers = {
+                subject_identifier: identifiers[0]
+                for subject_identifier, identifiers in screenings.items()
+                if len(identifiers) == 1}
+
+            multiple = [subject_identifier
+                        for subject_identifier, identifiers in screenings.items()
+                        if len(identifiers) > 1]
+            if multiple:
+                consents = {}
+                for subject_identifier, screening_identifier in (
+                        consent_cls.objects.filter(
+                            subject_identifier__in=multiple).values_list(
+                                'subject_identifier', 'screening_identifier')):
+                    consents.setdefault(subject_identifier, []).append(
+                        screening_identifier)
+                screening_identifiers.update({
+                    subject_identifier: identifiers[0]
+                    for subject_identifier, identifiers in consents.items()
+                    if len(identifiers) == 1})
+            self._screening_identifiers = screening_identifiers
+        return self._screening_identifiers
+
+    def clinician_calls(self):
+        clinician_call_cls = django_apps.get_model(self.clinician_call_model)
+        subject_identifiers = {
+            screening_identifier: subject_identifier
+            for subject_identifier, screening_identifier in (
+                self.screening_identifiers.items())}
+        if not subject_identifiers:
+            return {}
+        return {
+            subject_identifiers.get(obj.screening_identifier): obj
+            for obj in clinician_call_cls.objects.filter(
+                screening_identifier__in=subject_identifiers.keys())}
+
+    def crfs(self, crf_model):
+        """Returns the first created CRF by subject identifier.
+        """
+        crf_cls = django_apps.get_model(crf_model)
+        first_created = crf_cls.objects.filter(
+            subject_visit__subject_identifier=OuterRef(
+                'subject_visit__subject_identifier')).order_by(
+                    'created').values('pk')[:1]
+        crf_objs = crf_cls.objects.filter(
+            subject_visit__subject_identifier__in=self.subject_identifiers,
+            pk=Subquery(first_created)).select_related('subject_visit')
+        return {crf_obj.subject_visit.subject_identifier: crf_obj
+                for crf_obj in crf_objs}
 
-from ..clinician_call_enrollment import ClinicianCallEnrollment
-from ..patient_call_followup import PatientCallFollowUp
+    def non_crfs(self, crf_model):
+        crf_cls = django_apps.get_model(crf_model)
+        return {crf_obj.subject_identifier: crf_obj
+                for crf_obj in crf_cls.objects.filter(
+                    subject_identifier__in=self.subject_identifiers)}
+
+    def extra_symptoms_descriptions(self):
+        """Returns the latest new_complaints_description by subject
+        identifier.
+        """
+        followup_cls = django_apps.get_model(self.followup_model)
+        complaints = followup_cls.objects.filter(
+            ~Q(new_complaints_description=''))
+        latest = complaints.filter(
+            subject_visit__subject_identifier=OuterRef(
+                'subject_visit__subject_identifier')).order_by(
+                    '-report_datetime').values('pk')[:1]
+        return dict(complaints.filter(
+            subject_visit__subject_identifier__in=self.subject_identifiers,
+            pk=Subquery(latest)).values_list(
+                'subject_visit__subject_identifier',
+                'new_complaints_description'))
+
+
+class LazyBaselineRoadMap(Mapping):
+    """A read-only mapping of the Baseline Roadmap values for one
+    subject that only loads a model the first time its key is read.
+
+    `keys` limits the mapping to the given baseline_dict keys.
+    """
+
+    loader_cls = BaselineRoadMapLoader
+
+    def __init__(self, subject_identifier=None, keys=None):
+        self.subject_identifier = subject_identifier
+        self.loader = self.loader_cls(subject_identifiers=[subject_identifier])
+        self._keys = list(keys or self.loader.keys)
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key not in self._loaded:
+            self._loaded[key] = self.loader.get(self.subject_identifier, key)
+        return self._loaded[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lazy_items(self):
+        """Returns a dictionary of lazy objects, for use as template
+        context, that are loaded when the template first uses them.
+        """
+        return {key: SimpleLazyObject(partial(self.__getitem__, key))
+                for key in self._keys}
 
 
 class BaselineRoadMapMixin:
@@ -11,111 +218,59 @@ class BaselineRoadMapMixin:
     to build the Baseline Roadmap.
     """
 
+    loader_cls = BaselineRoadMapLoader
+
     def __init__(self, subject_identifier=None):
         self.subject_identifier = subject_identifier
-        self.baseline_dict = {}
-        self.baseline_dict.update(self.clinician_call)
-        self.baseline_dict.update(self.crfs_dict)
-        self.baseline_dict.update(self.non_crfs_dict)
-        if self.extra_symptoms_description:
-            self.baseline_dict.update(self.extra_symptoms_description)
+        self.loader = self.loader_cls(subject_identifiers=[subject_identifier])
+        self.baseline_dict = self.loader.load().get(subject_identifier, {})
+
+    @classmethod
+    def bulk(cls, subject_identifiers=None):
+        """Returns a dictionary of baseline_dict by subject identifier
+        for many subjects at once.
+        """
+        return cls.loader_cls(subject_identifiers=subject_identifiers).load()
 
     @property
     def screening_identifier(self):
-        
-        screening_identifier = None
-        
-        subject_consent_cls = django_apps.get_model('potlako_subject.subjectconsent')
-        screening_cls = django_apps.get_model('potlako_subject.subjectscreening')
-
-        try:
-            screening_obj = screening_cls.objects.get(
-                subject_identifier=self.subject_identifier)
-            
-        except screening_cls.DoesNotExist:
-            pass
-        
-        except screening_cls.MultipleObjectsReturned:
-            """
-            If two screenings are returned get the screening identifier from
-            the consent
-            """
-            try:
-                subject_consent_obj = subject_consent_cls.objects.get(
-                    subject_identifier=self.subject_identifier)
-                
-            except subject_consent_cls.MultipleObjectsReturned:
-                pass
-            
-            else:
-                screening_identifier = subject_consent_obj.screening_identifier
-        else:
-            screening_identifier = screening_obj.screening_identifier
-        
-        return screening_identifier
+        return self.loader.screening_identifiers.get(self.subject_identifier)
 
     @property
     def clinician_call(self):
         """Extract values required for Baseline Map from Clinician Call
         Enrollment model.
         """
-
-        try:
-            clinician_call_obj = ClinicianCallEnrollment.objects.get(
-                screening_identifier=self.screening_identifier)
-        except ClinicianCallEnrollment.DoesNotExist:
+        clinician_call_obj = self.loader.clinician_calls().get(
+            self.subject_identifier)
+        if not clinician_call_obj:
             return {}
-        else:
-            return {'cliniciancallenrollment': clinician_call_obj}
+        return {'cliniciancallenrollment': clinician_call_obj}
 
     @property
     def extra_symptoms_description(self):
         """Extract all  new_symptoms_description required for Baseline Map from all Patient Call
            Followup models.
         """
-
-        patient_call_fu_objs = PatientCallFollowUp.objects.filter(
-            ~Q(new_complaints_description=''),
-            subject_visit__subject_identifier=self.subject_identifier)
-        if patient_call_fu_objs:
-            complaints = patient_call_fu_objs.latest('report_datetime')
-
-            return {'extra_symptoms_description': complaints.new_complaints_description}
+        description = self.loader.extra_symptoms_descriptions().get(
+            self.subject_identifier)
+        if description is not None:
+            return {'extra_symptoms_description': description}
 
     @property
     def crfs_dict(self):
-        crfs_list = ['potlako_subject.cancerdxandtx',
-                     'potlako_subject.symptomandcareseekingassessment',
-                     'potlako_subject.patientcallinitial',
-                     'potlako_subject.investigationsordered',
-                     'potlako_subject.investigationsresulted',
-                     'potlako_subject.medicaldiagnosis']
-
         crf_dict = {}
-        for crf_model in crfs_list:
-            crf_objs = django_apps.get_model(crf_model).objects.filter(
-                subject_visit__subject_identifier=self.subject_identifier)
-
-            if crf_objs:
-                crf_obj = crf_objs.order_by('created')[0]
+        for crf_model in self.loader.crfs_list:
+            crf_obj = self.loader.crfs(crf_model).get(self.subject_identifier)
+            if crf_obj:
                 crf_dict.update({crf_model.split('.')[1]: crf_obj})
         return crf_dict
 
     @property
     def non_crfs_dict(self):
-
-        non_crfs = ['potlako_subject.baselineclinicalsummary',
-                    'potlako_subject.navigationsummaryandplan']
-
         crf_dict = {}
-
-        for crf_model in non_crfs:
-            crf_cls = django_apps.get_model(crf_model)
-            try:
-                crf_obj = crf_cls.objects.get(subject_identifier=self.subject_identifier)
-            except crf_cls.DoesNotExist:
-                pass
-            else:
-                crf_dict.update({crf_model.split('.')[1]:
-                                crf_obj})
+        for crf_model in self.loader.non_crfs_list:
+            crf_obj = self.loader.non_crfs(crf_model).get(self.subject_identifier)
+            if crf_obj:
+                crf_dict.update({crf_model.split('.')[1]: crf_obj})
         return crf_dict
@@ -0,0 +1,75 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.db import models
+
+
+def blind_index_key():
+    """Returns the key for blind index hashes, POTLAKO_BLIND_INDEX_KEY.
+
+    The key is checked at startup, see checks.blind_index_key_check.
+    Changing the key requires running the backfill_blind_indexes
+    management command.
+    """
+    return settings.POTLAKO_BLIND_INDEX_KEY.encode()
+
+
+def blind_index(value=None):
+    """Returns the keyed hash (HMAC-SHA256) of a normalized identity
+    value, or None for an empty value.
+    """
+    if value is None:
+        return None
+    value = ''.join(str(value).split()).upper()
+    if not value:
+        return None
+    return hmac.new(blind_index_key(), value.encode(), hashlib.sha256).hexdigest()
+
+
+class BlindIndexManagerMixin:
+    """Adds indexed equality lookups on the blind index of an encrypted
+    field.
+    """
+
+    def filter_by_blind_index(self, field=None, value=None):
+        field = field or self.model.blind_index_default_field
+        bidx_field = self.model.blind_index_fields[field]
+        return self.filter(**{bidx_field: blind_index(value)})
+
+    def get_by_identity(self, identity, field=None):
+        """Returns the instance for an identity number, e.g. an Omang,
+        or raises DoesNotExist.
+        """
+        return self.filter_by_blind_index(field=field, value=identity).get()
+
+    def identity_exists(self, identity, field=None, exclude_pk=None):
+        """Returns True if an identity number, e.g. an Omang, is already
+        used, ignoring the instance with `exclude_pk`.
+        """
+        return self.filter_by_blind_index(
+            field=field, value=identity).exclude(pk=exclude_pk).exists()
+
+
+class BlindIndexModelMixin(models.Model):
+    """Maintains a blind index column for each encrypted field listed
+    in `blind_index_fields` as {encrypted field: blind index field}.
+    """
+
+    blind_index_fields = {}
+    blind_index_default_field = None
+
+    def save(self, *args, **kwargs):
+        self.update_blind_indexes()
+        if kwargs.get('update_fields'):
+            kwargs['update_fields'] = list(kwargs['update_fields']) + [
+                bidx_field for field, bidx_field in self.blind_index_fields.items()
+                if field in kwargs['update_fields']]
+        super().save(*args, **kwargs)
+
+    def update_blind_indexes(self):
+        for field, bidx_field in self.blind_index_fields.items():
+            setattr(self, bidx_field, blind_index(getattr(self, field)))
+
+    class Meta:
+        abstract = True
@@ -53,3 +53,4 @@ class CrfModelMixin(BaseCrfModelMixin, SubjectScheduleCrfModelMixin,
 
     class Meta(BaseCrfModelMixin.Meta):
         abstract = True
+        default_permissions = ('add', 'change', 'delete', 'view', 'export')
@@ -6,6 +6,8 @@ from edc_consent.model_mixins import RequiresConsentFieldsModelMixin
 from edc_identifier.managers import SubjectIdentifierManager
 from edc_visit_schedule.model_mixins import OnScheduleModelMixin
 
+from ..consent_enrollment import current_consent_enrollment
+
 
 class OnSchedule(
         RequiresConsentFieldsModelMixin, OnScheduleModelMixin, BaseUuidModel):
@@ -20,7 +22,8 @@ class OnSchedule(
 
     community_arm = models.CharField(max_length=25,
                                      blank=True,
-                                     null=True)
+                                     null=True,
+                                     db_index=True)
 
     onsite = CurrentSiteManager()
 
@@ -33,6 +36,9 @@ class OnSchedule(
 
     def save(self, *args, **kwargs):
         self.consent_version = None
+        enrollment = current_consent_enrollment(self.subject_identifier)
+        if enrollment and not self.community_arm:
+            self.community_arm = enrollment.community_arm
         super().save(*args, **kwargs)
 
     class Meta:
@@ -0,0 +1,51 @@
+from django.db import models
+from edc_base.model_mixins import BaseUuidModel
+from edc_base.utils import get_utcnow
+
+from ..choices import OUTBOX_STATUS
+from ..constants import PENDING
+
+
+class OutboxMessage(BaseUuidModel):
+    """A side effect of a model save, written in the same transaction
+    and processed after commit by a django_q worker.
+
+    See potlako_subject.outbox.
+    """
+
+    task = models.CharField(
+        max_length=50)
+
+    kwargs = models.TextField(
+        default='{}')
+
+    idempotency_key = models.CharField(
+        max_length=150,
+        unique=True)
+
+    status = models.CharField(
+        max_length=15,
+        choices=OUTBOX_STATUS,
+        default=PENDING)
+
+    attempts = models.PositiveIntegerField(
+        default=0)
+
+    next_attempt_datetime = models.DateTimeField(
+        default=get_utcnow)
+
+    processed_datetime = models.DateTimeField(
+        null=True,
+        blank=True)
+
+    last_error = models.TextField(
+        null=True,
+        blank=True)
+
+    def __str__(self):
+        return f'{self.task} ({self.status})'
+
+    class Meta:
+        app_label = 'potlako_subject'
+        verbose_name = 'Outbox Message'
+        index_together = ('status', 'next_attempt_datetime')
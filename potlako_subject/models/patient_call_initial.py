@@ -359,14 +359,9 @@ class PatientCallInitial(CrfModelMixin):
     @property
     def community_arm(self):
         onschedule_cls = django_apps.get_model('potlako_subject.onschedule')
-
-        try:
-            onschedule_obj = onschedule_cls.objects.get(
-                subject_identifier=self.subject_visit.appointment.subject_identifier)
-        except onschedule_cls.DoesNotExist:
-            return None
-        else:
-            return onschedule_obj.community_arm
+        return onschedule_cls.objects.filter(
+            subject_identifier=self.subject_visit.appointment.subject_identifier
+        ).values_list('community_arm', flat=True).first()
 
     def update_age(self):
         subject_identifier = self.subject_visit.appointment.subject_identifier
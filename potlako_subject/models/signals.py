@@ -1,17 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db.models import Q
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from edc_base.utils import get_utcnow
-from edc_constants.constants import DEAD, NEW, YES, OPEN
 import pytz
 
-from edc_action_item.site_action_items import site_action_items
-from edc_appointment.appointment_sms_reminder import AppointmentSmsReminder
 from edc_appointment.constants import NEW_APPT
 from edc_appointment.creators import AppointmentInProgressError
 from edc_appointment.creators import InvalidParentAppointmentMissingVisitError
@@ -19,25 +15,31 @@ from edc_appointment.creators import InvalidParentAppointmentStatusError
 from edc_appointment.creators import UnscheduledAppointmentCreator
 from edc_appointment.creators import UnscheduledAppointmentError
 from edc_appointment.models import Appointment
-from edc_visit_schedule.site_visit_schedules import site_visit_schedules
-from potlako_prn.action_items import DEATH_REPORT_ACTION
-from potlako_prn.action_items import SUBJECT_OFFSTUDY_ACTION
 
-from ..action_items import SUBJECT_LOCATOR_ACTION
+from ..action_item_reconciler import action_item_reconciler
+from ..appointment_timeline import appointment_timeline, invalidate_appointment_timeline
+from ..community_arm import community_arm_resolver
+from ..consent_enrollment import ConsentEnrollment, current_consent_enrollment
+from ..constants import APPOINTMENT, AVAILABILITY, REPEAT_CALL
+from ..due_calls import is_source_deleting, source_deleted, source_deleting
+from ..due_calls import set_due_call, update_appointment
+from ..due_calls import update_availability, update_repeat_call
+from ..missed_call_counter import missed_call_record_added, missed_call_record_removed
+from ..outbox import enqueue, outbox_handler
+from ..sms_dispatcher import sms_dispatcher
 from .cancer_dx_and_tx import CancerDxAndTx
 from .clinician_call_enrollment import ClinicianCallEnrollment
 from .home_visit import HomeVisit
-from .missed_call import MissedCallRecord
+from .missed_call import MissedCall, MissedCallRecord
 from .missed_visit import MissedVisit
+from .navigation_summary_and_plan import EvaluationTimeline
+from .navigation_summary_and_plan import NavigationSummaryAndPlan
 from .onschedule import OnSchedule
-from .patient_availability_log import PatientAvailabilityLog
+from .patient_availability_log import PatientAvailabilityLog, PatientAvailabilityLogEntry
 from .patient_call_followup import PatientCallFollowUp
 from .patient_call_initial import PatientCallInitial
 from .subject_consent import SubjectConsent
-from .subject_locator import SubjectLocator
-from .subject_screening import SubjectScreening
 from .subject_visit import SubjectVisit
-from .verbal_consent import VerbalConsent
 
 
 @receiver(post_save, weak=False, sender=ClinicianCallEnrollment,
@@ -55,6 +57,38 @@ def clinician_call_enrollment_on_post_save(sender, instance, raw, created, **kwa
                 PatientAvailabilityLog.objects.create(clinician_call=instance)
 
 
+@receiver(post_save, weak=False, sender=ClinicianCallEnrollment,
+          dispatch_uid='clinician_call_enrollment_community_arm_on_post_save')
+def clinician_call_enrollment_community_arm_on_post_save(
+        sender, instance, raw, created, **kwargs):
+    """Clear the cached community arm and refresh the copies on the
+    consent and onschedule, the facility may have changed.
+
+    Runs for raw saves too, so synced enrollments update the copies
+    on the receiving machine.
+    """
+    community_arm_resolver.invalidate(
+        screening_identifier=instance.screening_identifier,
+        subject_identifier=instance.subject_identifier)
+    consents = SubjectConsent.objects.filter(
+        screening_identifier=instance.screening_identifier)
+    OnSchedule.objects.filter(
+        subject_identifier__in=consents.values('subject_identifier')).exclude(
+            community_arm=instance.community_arm).update(
+                community_arm=instance.community_arm)
+    consents.exclude(community_arm=instance.community_arm).update(
+        community_arm=instance.community_arm)
+
+
+@receiver(post_save, weak=False, sender=OnSchedule,
+          dispatch_uid='onschedule_community_arm_on_post_save')
+def onschedule_community_arm_on_post_save(sender, instance, raw, created, **kwargs):
+    """Clear the cached community arm for the subject.
+    """
+    community_arm_resolver.invalidate(
+        subject_identifier=instance.subject_identifier)
+
+
 @receiver(post_save, weak=False, sender=SubjectConsent,
           dispatch_uid='subject_consent_on_post_save')
 def subject_consent_on_post_save(sender, instance, raw, created, **kwargs):
@@ -62,25 +96,38 @@ def subject_consent_on_post_save(sender, instance, raw, created, **kwargs):
     -Update subject screening consented flag.
     -Put participant on schedule and define community arm
     """
-    if not raw:
+    update_fields = kwargs.get('update_fields')
+    if not raw and not (update_fields and set(update_fields) <= {'target_date'}):
+        enrollment = ConsentEnrollment.for_consent(instance)
         if created:
-            update_model_fields(instance=instance,
-                                model_cls=SubjectScreening,
-                                fields=[
-                                    ['subject_identifier', instance.subject_identifier],
-                                    ['is_consented', True]])
+            enrollment.update_consented()
+        enrollment.put_on_schedule()
 
-            update_model_fields(instance=instance,
-                                model_cls=ClinicianCallEnrollment,
-                                fields=[['subject_identifier',
-                                         instance.subject_identifier], ])
 
-            update_model_fields(instance=instance,
-                                model_cls=VerbalConsent,
-                                fields=[['subject_identifier',
-                                         instance.subject_identifier], ])
+@receiver(post_save, weak=False, sender=EvaluationTimeline,
+          dispatch_uid='evaluation_timeline_on_post_save')
+def evaluation_timeline_on_post_save(sender, instance, raw, **kwargs):
+    """Update the subject consent target date of the latest outstanding
+    key step.
+    """
+    if not raw:
+        SubjectConsent.objects.update_target_date(
+            subject_identifier=instance.navigation_plan.subject_identifier)
 
-        put_on_schedule(instance=instance)
+
+@receiver(post_delete, weak=False, sender=EvaluationTimeline,
+          dispatch_uid='evaluation_timeline_on_post_delete')
+def evaluation_timeline_on_post_delete(sender, instance, **kwargs):
+    """Update the subject consent target date unless the key step is
+    deleted with its navigation plan.
+    """
+    try:
+        navigation_plan = instance.navigation_plan
+    except NavigationSummaryAndPlan.DoesNotExist:
+        pass
+    else:
+        SubjectConsent.objects.update_target_date(
+            subject_identifier=navigation_plan.subject_identifier)
 
 
 @receiver(post_save, weak=False, sender=PatientCallInitial,
@@ -91,12 +138,9 @@ def patient_call_initial_on_post_save(sender, instance, raw, created, **kwargs):
 
     if not raw:
 
-        try:
-            Appointment.objects.get(
-                subject_identifier=instance.subject_visit.subject_identifier,
-                visit_code=instance.subject_visit.visit_code,
-                visit_code_sequence='1')
-        except ObjectDoesNotExist:
+        timeline = appointment_timeline(instance.subject_visit.subject_identifier)
+        if not timeline.exists(visit_code=instance.subject_visit.visit_code,
+                               visit_code_sequence=1):
             try:
                 subject_consent = SubjectConsent.objects.get(
                     subject_identifier=instance.subject_visit.subject_identifier)
@@ -117,12 +161,9 @@ def patient_call_followup_on_post_save(sender, instance, raw, created, **kwargs)
     if not raw:
         if instance.next_appointment_date and instance.subject_visit.visit_code != '3000':
             next_visit_code = int(instance.subject_visit.visit_code_sequence) + 1
-            try:
-                Appointment.objects.get(
-                    subject_identifier=instance.subject_visit.subject_identifier,
-                    visit_code=instance.subject_visit.visit_code,
-                    visit_code_sequence=next_visit_code)
-            except ObjectDoesNotExist:
+            timeline = appointment_timeline(instance.subject_visit.subject_identifier)
+            if not timeline.exists(visit_code=instance.subject_visit.visit_code,
+                                   visit_code_sequence=next_visit_code):
                 try:
                     subject_consent = SubjectConsent.objects.get(
                         subject_identifier=instance.subject_visit.subject_identifier)
@@ -133,10 +174,7 @@ def patient_call_followup_on_post_save(sender, instance, raw, created, **kwargs)
                             screening_identifier=subject_consent.screening_identifier) == 'Intervention'):
                         create_unscheduled_appointment(instance=instance)
 
-        trigger_action_item(instance, 'patient_info_change', YES,
-                            SubjectLocator, SUBJECT_LOCATOR_ACTION,
-                            instance.subject_visit.appointment.subject_identifier,
-                            repeat=True)
+        enqueue_reconcile_action_items(instance)
 
 
 @receiver(post_save, weak=False, sender=MissedVisit,
@@ -148,12 +186,9 @@ def missed_visit_on_post_save(sender, instance, raw, created, **kwargs):
 
         if instance.next_appointment_date and instance.subject_visit.visit_code != '3000':
             next_visit_code = int(instance.subject_visit.visit_code_sequence) + 1
-            try:
-                Appointment.objects.get(
-                    subject_identifier=instance.subject_visit.subject_identifier,
-                    visit_code=instance.subject_visit.visit_code,
-                    visit_code_sequence=next_visit_code)
-            except ObjectDoesNotExist:
+            timeline = appointment_timeline(instance.subject_visit.subject_identifier)
+            if not timeline.exists(visit_code=instance.subject_visit.visit_code,
+                                   visit_code_sequence=next_visit_code):
                 try:
                     subject_consent = SubjectConsent.objects.get(
                         subject_identifier=instance.subject_visit.subject_identifier)
@@ -171,23 +206,97 @@ def subject_visit_on_post_save(sender, instance, raw, created, **kwargs):
     """Trigger death report action item if visit survival status is DEAD.
     """
     if not raw:
-        death_report_cls = django_apps.get_model('potlako_prn.deathreport')
-        trigger_action_item(instance, 'survival_status', DEAD,
-                            death_report_cls, DEATH_REPORT_ACTION,
-                            instance.appointment.subject_identifier)
+        enqueue_reconcile_action_items(instance)
 
 
 @receiver(post_save, weak=False, sender=MissedCallRecord,
           dispatch_uid='missed_call_on_post_save')
 def missed_call_on_post_save(sender, instance, raw, created, **kwargs):
-    """Run rule groups if the third record for missed call is saved.
+    """Update the missed call record count, rule groups run once the
+    third record for missed call is saved.
+    """
+    if not raw and created:
+        missed_call_record_added(missed_call_pk=instance.missed_call_id)
+
+
+@receiver(post_delete, weak=False, sender=MissedCallRecord,
+          dispatch_uid='missed_call_on_post_delete')
+def missed_call_on_post_delete(sender, instance, **kwargs):
+    missed_call_record_removed(missed_call_pk=instance.missed_call_id)
+
+
+@receiver(post_save, weak=False, sender=MissedCallRecord,
+          dispatch_uid='missed_call_record_due_call_on_post_save')
+@receiver(post_delete, weak=False, sender=MissedCallRecord,
+          dispatch_uid='missed_call_record_due_call_on_post_delete')
+def missed_call_record_due_call_on_post_save(sender, instance, raw=False, **kwargs):
+    """Update the repeat call due for the missed call, unless the
+    missed call is being deleted.
+    """
+    if not raw and not is_source_deleting(
+            source=REPEAT_CALL, source_id=instance.missed_call_id):
+        update_repeat_call(instance.missed_call)
+
+
+@receiver(post_save, weak=False, sender=MissedCall,
+          dispatch_uid='missed_call_due_call_on_post_save')
+def missed_call_due_call_on_post_save(sender, instance, raw, created, **kwargs):
+    if not raw:
+        update_repeat_call(instance)
+
+
+@receiver(pre_delete, weak=False, sender=MissedCall,
+          dispatch_uid='missed_call_due_call_on_pre_delete')
+def missed_call_due_call_on_pre_delete(sender, instance, **kwargs):
+    instance._due_call_token = source_deleting(
+        source=REPEAT_CALL, source_id=instance.pk)
+
+
+@receiver(post_delete, weak=False, sender=MissedCall,
+          dispatch_uid='missed_call_due_call_on_post_delete')
+def missed_call_due_call_on_post_delete(sender, instance, **kwargs):
+    source_deleted(source=REPEAT_CALL, source_id=instance.pk,
+                   token=getattr(instance, '_due_call_token', None))
+
+
+@receiver(post_save, weak=False, sender=PatientAvailabilityLogEntry,
+          dispatch_uid='patient_availability_due_call_on_post_save')
+@receiver(post_delete, weak=False, sender=PatientAvailabilityLogEntry,
+          dispatch_uid='patient_availability_due_call_on_post_delete')
+def patient_availability_due_call_on_post_save(sender, instance, raw=False, **kwargs):
+    """Update the call back due for the patient availability log,
+    unless the log is being deleted.
     """
+    if not raw and not is_source_deleting(
+            source=AVAILABILITY, source_id=instance.patient_availability_log_id):
+        update_availability(instance.patient_availability_log)
+
+
+@receiver(pre_delete, weak=False, sender=PatientAvailabilityLog,
+          dispatch_uid='patient_availability_log_due_call_on_pre_delete')
+def patient_availability_log_due_call_on_pre_delete(sender, instance, **kwargs):
+    instance._due_call_token = source_deleting(
+        source=AVAILABILITY, source_id=instance.pk)
+
+
+@receiver(post_delete, weak=False, sender=PatientAvailabilityLog,
+          dispatch_uid='patient_availability_log_due_call_on_post_delete')
+def patient_availability_log_due_call_on_post_delete(sender, instance, **kwargs):
+    source_deleted(source=AVAILABILITY, source_id=instance.pk,
+                   token=getattr(instance, '_due_call_token', None))
+
+
+@receiver(post_save, weak=False, sender=Appointment,
+          dispatch_uid='appointment_due_call_on_post_save')
+def appointment_due_call_on_post_save(sender, instance, raw, created, **kwargs):
     if not raw:
-        missed_call_count = MissedCallRecord.objects.filter(
-            missed_call=instance.missed_call).count()
-        if missed_call_count >= 3:
-            instance.missed_call.subject_visit.run_metadata_rules(
-                visit=instance.missed_call.visit)
+        update_appointment(instance)
+
+
+@receiver(post_delete, weak=False, sender=Appointment,
+          dispatch_uid='appointment_due_call_on_post_delete')
+def appointment_due_call_on_post_delete(sender, instance, **kwargs):
+    set_due_call(source=APPOINTMENT, source_id=instance.pk)
 
 
 @receiver(post_save, weak=False, sender=HomeVisit,
@@ -197,15 +306,7 @@ def home_visit_on_post_save(sender, instance, raw, created, **kwargs):
     of the home visit outcome response.
     """
     if not raw:
-        death_report_cls = django_apps.get_model('potlako_prn.deathreport')
-        exit_cls = django_apps.get_model('potlako_prn.coordinatorexit')
-        trigger_action_item(instance, 'visit_outcome', DEAD,
-                            death_report_cls, DEATH_REPORT_ACTION,
-                            instance.subject_visit.appointment.subject_identifier)
-
-        trigger_action_item(instance, 'visit_outcome', 'ltfu',
-                            exit_cls, SUBJECT_OFFSTUDY_ACTION,
-                            instance.subject_visit.appointment.subject_identifier)
+        enqueue_reconcile_action_items(instance)
 
 
 @receiver(post_save, weak=False, sender=CancerDxAndTx,
@@ -215,15 +316,17 @@ def cancer_dx_and_tx_on_post_save(sender, instance, raw, created, **kwargs):
         outcome response.
     """
     if not raw:
-        subject_offstudy_cls = django_apps.get_model(
-            'potlako_prn.subjectoffstudy')
+        enqueue_reconcile_action_items(instance)
 
-        field_responses = {'cancer_evaluation': 'unable_to_complete',
-                           'cancer_treatment': YES}
-        for field, response in field_responses.items():
-            trigger_action_item(instance, field, response, subject_offstudy_cls,
-                                SUBJECT_OFFSTUDY_ACTION,
-                                instance.subject_visit.appointment.subject_identifier)
+
+@receiver(post_save, weak=False, sender=Appointment,
+          dispatch_uid='appointment_timeline_on_post_save')
+@receiver(post_delete, weak=False, sender=Appointment,
+          dispatch_uid='appointment_timeline_on_post_delete')
+def appointment_timeline_on_post_save(sender, instance, **kwargs):
+    """Drop the subject's cached appointment timeline.
+    """
+    invalidate_appointment_timeline(instance.subject_identifier)
 
 
 @receiver(post_save, weak=True, sender=Appointment,
@@ -234,46 +337,75 @@ def appointment_reminder_on_post_save(sender, instance, raw, created, using, **k
     """
     if not raw:
         if created:
-            # Appointment sms reminder
             app_config = django_apps.get_app_config('edc_appointment')
-            send_sms_reminders = app_config.send_sms_reminders
-            edc_sms_app_config = django_apps.get_app_config('edc_sms')
-            if send_sms_reminders:
-                try:
-                    appt_datetime = instance.appt_datetime.strftime(
-                        "%B+%d,+%Y,+%H:%M:%S")
-                except AttributeError:
-                    pass
+            if app_config.send_sms_reminders:
+                enrollment = current_consent_enrollment(instance.subject_identifier)
+                if enrollment:
+                    # queued together once the subject is on schedule
+                    enrollment.defer_reminder(instance)
                 else:
-                    consent_mdl_cls = django_apps.get_model(
-                        edc_sms_app_config.consent_model)
-                    consent = consent_mdl_cls.objects.filter(
-                        subject_identifier=instance.subject_identifier)
-                    if consent:
-                        consent = consent[0]
-                    if not is_soc_community_arm(consent):
-                        schedule_sms(appt_datetime, instance, consent)
+                    enqueue('schedule_appointment_sms',
+                            idempotency_key=f'schedule_appointment_sms:{instance.pk}',
+                            appointment=str(instance.pk))
+
+
+@outbox_handler('reconcile_action_items')
+def reconcile_action_items(model=None, pk=None):
+    instance = django_apps.get_model(model).objects.get(pk=pk)
+    action_item_reconciler.reconcile_instance(instance)
+
+
+@outbox_handler('run_missed_call_metadata_rules')
+def run_missed_call_metadata_rules(missed_call=None):
+    missed_call = MissedCall.objects.get(pk=missed_call)
+    missed_call.subject_visit.run_metadata_rules(visit=missed_call.visit)
+
+
+@outbox_handler('schedule_appointment_sms')
+def schedule_appointment_sms(appointment=None):
+    """Queue a sms reminder for an appointment.
+    """
+    instance = Appointment.objects.get(pk=appointment)
+    edc_sms_app_config = django_apps.get_app_config('edc_sms')
+    if instance.appt_datetime:
+        consent_mdl_cls = django_apps.get_model(
+            edc_sms_app_config.consent_model)
+        consent = consent_mdl_cls.objects.filter(
+            subject_identifier=instance.subject_identifier).first()
+        if consent and not is_soc_community_arm(consent):
+            schedule_sms(instance)
+
+
+@outbox_handler('schedule_appointment_sms_batch')
+def schedule_appointment_sms_batch(appointments=None):
+    """Queue the sms reminders of the appointments created when a
+    subject is put on schedule.
+    """
+    for appointment in appointments:
+        schedule_appointment_sms(appointment=appointment)
+
+
+def enqueue_reconcile_action_items(instance):
+    enqueue('reconcile_action_items',
+            idempotency_key=(f'reconcile_action_items:{instance._meta.label_lower}:'
+                             f'{instance.pk}:{instance.modified.isoformat()}'),
+            model=instance._meta.label_lower,
+            pk=str(instance.pk))
 
 
-def schedule_sms(appt_datetime, instance, consent):
+def schedule_sms(instance):
     """
-    Schedule or send SMS when called
-    :param appt_datetime: date of the appointment from the appointment report date time
-    in string format
+    Queue an SMS reminder with the SMS dispatcher.
     :param instance: Instance of the appointment created on post save
-    :param consent: Participant's consent object
-    :return: None
+    :return: SmsReminder instance
     """
-    sms_message_data = (
-        f'Dear+participant+Reminder+for+an+appointment+on+{appt_datetime}')
-    appt_sms_reminder = AppointmentSmsReminder(
+    appt_datetime = instance.appt_datetime.strftime("%B+%d,+%Y,+%H:%M:%S")
+    reminder_days = getattr(settings, 'POTLAKO_SMS_REMINDER_DAYS', 1)
+    return sms_dispatcher.queue(
         subject_identifier=instance.subject_identifier,
         appt_datetime=instance.appt_datetime,
-        sms_message_data=sms_message_data,
-        recipient_number=consent.recipient_number)
-    appt_reminder_date = instance.appt_datetime
-    appt_sms_reminder.schedule_or_send_sms_reminder(
-        appt_reminder_date=appt_reminder_date)
+        message=f'Dear+participant+Reminder+for+an+appointment+on+{appt_datetime}',
+        send_datetime=instance.appt_datetime - timedelta(days=reminder_days))
 
 
 def is_soc_community_arm(consent):
@@ -286,57 +418,17 @@ def is_soc_community_arm(consent):
     return False if (community_arm == 'Intervention') else True
 
 
-def trigger_action_item(obj, field, response, model_cls,
-        action_name, subject_identifier,
-        repeat=False):
-    action_cls = site_action_items.get(
-        model_cls.action_name)
-    action_item_model_cls = action_cls.action_item_model_cls()
-
-    if getattr(obj, field) == response:
-        try:
-            model_cls.objects.get(subject_identifier=subject_identifier)
-        except model_cls.DoesNotExist:
-            trigger = True
-        else:
-            trigger = repeat
-        if trigger:
-            try:
-                action_item_obj = action_item_model_cls.objects.get(
-                    subject_identifier=subject_identifier,
-                    action_type__name=action_name)
-            except action_item_model_cls.DoesNotExist:
-                action_cls = site_action_items.get(action_name)
-                action_cls(subject_identifier=subject_identifier)
-            else:
-                action_item_obj.status = OPEN
-                action_item_obj.save()
-    else:
-        try:
-            action_item = action_item_model_cls.objects.get(
-                Q(status=NEW) | Q(status=OPEN),
-                subject_identifier=subject_identifier,
-                action_type__name=action_name)
-        except action_item_model_cls.DoesNotExist:
-            pass
-        else:
-            action_item.delete()
-
-
 def create_unscheduled_appointment(instance=None):
     next_app = instance.next_appointment_date
-    appt_cls = django_apps.get_model('edc_appointment.appointment')
     subject_visit = instance.subject_visit
 
-    try:
-        next_visit_code = str(int(subject_visit.visit_code) + 1000)
-        next_appt_obj = appt_cls.objects.filter(
-            subject_identifier=instance.subject_visit.subject_identifier,
-            visit_code=next_visit_code).latest('appt_datetime')
-    except appt_cls.DoesNotExist:
+    next_appt_datetime = appointment_timeline(
+        subject_visit.subject_identifier).next_parent_appt_datetime(
+            visit_code=subject_visit.visit_code)
+    if not next_appt_datetime:
         create_unscheduled = True
     else:
-        create_unscheduled = next_appt_obj.appt_datetime.date() > next_app
+        create_unscheduled = next_appt_datetime.date() > next_app
 
     if create_unscheduled:
 
@@ -366,58 +458,5 @@ def create_unscheduled_appointment(instance=None):
             raise ValidationError(str(e))
 
 
-def put_on_schedule(instance=None):
-    if instance:
-
-        _, schedule = site_visit_schedules.get_by_onschedule_model(
-            'potlako_subject.onschedule')
-
-        community_arm = get_community_arm(instance.screening_identifier)
-
-        schedule.put_on_schedule(
-            subject_identifier=instance.subject_identifier,
-            onschedule_datetime=instance.consent_datetime)
-
-        try:
-            onschedule_obj = OnSchedule.objects.get(
-                subject_identifier=instance.subject_identifier,
-                community_arm__isnull=True)
-        except OnSchedule.DoesNotExist:
-            pass
-        else:
-            onschedule_obj.community_arm = community_arm
-            onschedule_obj.save()
-
-
 def get_community_arm(screening_identifier=None):
-    if screening_identifier:
-
-        try:
-            clinician_enrollment_obj = ClinicianCallEnrollment.objects.get(
-                screening_identifier=screening_identifier)
-        except ClinicianCallEnrollment.DoesNotExist:
-            raise ValidationError('Clinician Call Enrollment object '
-                                  'does not exist.')
-        else:
-
-            enhanced_care_communities = settings.COMMUNITIES.get('enhanced_care')
-
-            intervention_communities = settings.COMMUNITIES.get('intervention')
-
-            if clinician_enrollment_obj.facility in enhanced_care_communities:
-                return 'Standard of Care'
-            elif clinician_enrollment_obj.facility in intervention_communities:
-                return 'Intervention'
-    return None
-
-
-def update_model_fields(instance=None, model_cls=None, fields=None):
-    try:
-        model_obj = model_cls.objects.get(
-            screening_identifier=instance.screening_identifier)
-    except model_cls.DoesNotExist:
-        raise ValidationError(f'{model_cls} object does not exist!')
-    else:
-        for field, value in fields:
-            setattr(model_obj, field, value)
-        model_obj.save_base(update_fields=[field[0] for field in fields])
+    return community_arm_resolver.get(screening_identifier=screening_identifier)
@@ -0,0 +1,67 @@
+from django.db import models
+from edc_base.model_managers import HistoricalRecords
+from edc_base.model_mixins import BaseUuidModel
+from edc_base.sites import CurrentSiteManager, SiteModelMixin
+from edc_base.utils import get_utcnow
+from edc_identifier.model_mixins import NonUniqueSubjectIdentifierFieldMixin
+
+from ..choices import SMS_DELIVERY_STATUS
+from ..constants import QUEUED
+
+
+class SmsReminderManager(models.Manager):
+
+    def get_by_natural_key(self, subject_identifier, appt_datetime):
+        return self.get(subject_identifier=subject_identifier,
+                        appt_datetime=appt_datetime)
+
+
+class SmsReminder(NonUniqueSubjectIdentifierFieldMixin, SiteModelMixin,
+                  BaseUuidModel):
+    """An appointment SMS reminder queued for the SMS dispatcher.
+
+    Kept apart from the staff-entered SMS CRF. See
+    potlako_subject.sms_dispatcher.
+    """
+
+    appt_datetime = models.DateTimeField()
+
+    message = models.TextField()
+
+    delivery_status = models.CharField(
+        max_length=15,
+        choices=SMS_DELIVERY_STATUS,
+        default=QUEUED)
+
+    delivery_attempts = models.PositiveIntegerField(
+        default=0)
+
+    next_attempt_datetime = models.DateTimeField(
+        default=get_utcnow)
+
+    sent_datetime = models.DateTimeField(
+        null=True,
+        blank=True)
+
+    delivery_error = models.TextField(
+        null=True,
+        blank=True)
+
+    on_site = CurrentSiteManager()
+
+    objects = SmsReminderManager()
+
+    history = HistoricalRecords()
+
+    def __str__(self):
+        return f'{self.subject_identifier} {self.appt_datetime} ({self.delivery_status})'
+
+    def natural_key(self):
+        return (self.subject_identifier, self.appt_datetime)
+    natural_key.dependencies = ['sites.Site']
+
+    class Meta:
+        app_label = 'potlako_subject'
+        verbose_name = 'SMS Reminder'
+        unique_together = ('subject_identifier', 'appt_datetime')
+        index_together = ('delivery_status', 'next_attempt_datetime')
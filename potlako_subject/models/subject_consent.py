@@ -1,13 +1,13 @@
 from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from edc_base.model_managers import HistoricalRecords
 from edc_base.model_mixins import BaseUuidModel
 from edc_base.model_validators.date import datetime_not_future
 from edc_base.sites import CurrentSiteManager
 from edc_base.sites.site_model_mixin import SiteModelMixin
-from edc_base.utils import age, get_utcnow
+from edc_base.utils import get_utcnow
 from edc_consent.field_mixins import CitizenFieldsMixin
 from edc_consent.field_mixins import IdentityFieldsMixin
 from edc_consent.field_mixins import ReviewFieldsMixin, PersonalFieldsMixin
@@ -24,36 +24,51 @@ from edc_search.model_mixins import SearchSlugManager
 from edc_sms.models import SubjectRecipientModelMixin
 
 from ..choices import IDENTITY_TYPE
+from ..community_arm import community_arm_resolver
+from ..consent_enrollment import ConsentEnrollment
 from .clinician_call_enrollment import ClinicianCallEnrollment
+from .model_mixins import BlindIndexManagerMixin, BlindIndexModelMixin
 from .model_mixins import SearchSlugModelMixin
 from edc_constants.constants import NOT_DONE
 from django.db.models import OuterRef, Subquery
 
+
 class SubjectScreeningError(Exception):
     pass
 
 
-class ConsentManager(SubjectConsentManager, SearchSlugManager):
+class ConsentManager(BlindIndexManagerMixin, SubjectConsentManager, SearchSlugManager):
 
     def get_by_natural_key(self, subject_identifier, version):
         return self.get(
             subject_identifier=subject_identifier, version=version)
-        
-    def get_queryset(self):
-        
-        evaluationtimeline_model_cls = django_apps.get_model('potlako_subject.evaluationtimeline')
 
-        
+    def update_target_date(self, subject_identifier=None):
+        """Updates the target date of the latest outstanding evaluation
+        timeline key step for one subject, or all subjects if
+        subject_identifier is None.
+
+        Changed consents are saved with update_fields so history and
+        outgoing transactions are kept. Returns the number updated.
+        """
+        evaluationtimeline_model_cls = django_apps.get_model(
+            'potlako_subject.evaluationtimeline')
+
         key_steps = evaluationtimeline_model_cls.objects.filter(
             navigation_plan__subject_identifier=OuterRef('subject_identifier'),
             key_step_status=NOT_DONE).order_by('-created', '-modified')
-        
-        # attach target_date to consent
-        queryset = super().get_queryset().annotate(
-            target_date = Subquery(key_steps.values('target_date')[:1])
-        )
-        
-        return queryset
+        consents = self.annotate(
+            current_target_date=Subquery(key_steps.values('target_date')[:1]))
+        if subject_identifier:
+            consents = consents.filter(subject_identifier=subject_identifier)
+
+        updated = 0
+        for consent in consents.iterator():
+            if consent.target_date != consent.current_target_date:
+                consent.target_date = consent.current_target_date
+                consent.save_base(update_fields=['target_date'])
+                updated += 1
+        return updated
 
     class Meta:
         abstract = True
@@ -64,10 +79,14 @@ class SubjectConsent(
         UpdatesOrCreatesRegistrationModelMixin,
         NonUniqueSubjectIdentifierModelMixin,
         IdentityFieldsMixin, ReviewFieldsMixin, PersonalFieldsMixin,
-        CitizenFieldsMixin, SearchSlugModelMixin, BaseUuidModel):
+        CitizenFieldsMixin, SearchSlugModelMixin, BlindIndexModelMixin,
+        BaseUuidModel):
 
     subject_screening_model = 'potlako_subject.subjectscreening'
 
+    blind_index_fields = {'identity': 'identity_bidx'}
+    blind_index_default_field = 'identity'
+
     report_datetime = models.DateTimeField(
         verbose_name="Report Date",
         validators=[
@@ -136,6 +155,25 @@ class SubjectConsent(
         blank=False,
         help_text='If no, participant is not eligible.')
 
+    community_arm = models.CharField(
+        max_length=25,
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True)
+
+    identity_bidx = models.CharField(
+        max_length=64,
+        null=True,
+        editable=False,
+        db_index=True)
+
+    # is updated via signal when evaluation timeline key steps change
+    target_date = models.DateField(
+        null=True,
+        blank=True,
+        editable=False)
+
     consent = SubjectConsentManager()
 
     objects = ConsentManager()
@@ -148,18 +186,24 @@ class SubjectConsent(
         return f'{self.subject_identifier} V{self.version}'
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-
-        screening_cls = django_apps.get_model('potlako_subject.subjectscreening')
         try:
-            screening_obj = screening_cls.objects.get(
+            self.community_arm = community_arm_resolver.get(
                 screening_identifier=self.screening_identifier)
-        except screening_cls.DoesNotExist:
-            raise SubjectScreeningError('Missing subject screening object for participant'
-                                        f'{self.subject_identifier}')
-        else:
-            screening_obj.age_in_years = age(self.dob, get_utcnow())
-            screening_obj.save()
+        except ValidationError:
+            self.community_arm = None
+        enrollment = ConsentEnrollment(self)
+        self._consent_enrollment = enrollment
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                if not enrollment.screening_saved:
+                    if not enrollment.screening:
+                        raise SubjectScreeningError(
+                            'Missing subject screening object for participant'
+                            f'{self.subject_identifier}')
+                    enrollment.save_screening()
+        finally:
+            del self._consent_enrollment
         self.subject_type = 'subject'
         self.version = '1'
 
@@ -116,6 +116,10 @@ class SubjectScreening(
         return (self.screening_identifier,)
 
     def get_age(self):
+        if hasattr(self, '_clinician_call_enrollment'):
+            # already read, see ConsentEnrollment
+            enrollment_obj = self._clinician_call_enrollment
+            return enrollment_obj.age_in_years if enrollment_obj else self.age_in_years
         enrollment_cls = django_apps.get_model(self.clinician_enrollment_model)
         try:
             enrollment_obj = enrollment_cls.objects.get(
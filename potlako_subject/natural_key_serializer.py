@@ -0,0 +1,128 @@
+from django.core import serializers
+from django.core.exceptions import FieldDoesNotExist
+
+from .export import export_chunk_size
+
+# select_related() paths learned per model label
+learned_paths = {}
+
+
+def is_select_related(model_cls, name):
+    """Returns the related model if `name` is a forward or reverse one
+    to one relation of model_cls that select_related() can follow.
+    """
+    try:
+        field = model_cls._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not (field.many_to_one or field.one_to_one):
+        return None
+    if not (field.concrete or field.auto_created):
+        # generic foreign key
+        return None
+    return field.related_model
+
+
+def cached_paths(obj, prefix='', seen=None):
+    """Returns the `__` separated paths of the related objects loaded
+    on obj, following the related objects' own caches.
+    """
+    seen = (seen or set()) | {id(obj)}
+    paths = set()
+    for name, related in obj._state.fields_cache.items():
+        if related is None or id(related) in seen:
+            continue
+        if not is_select_related(obj.__class__, name):
+            continue
+        path = f'{prefix}{name}'
+        paths.add(path)
+        paths.update(cached_paths(related, prefix=f'{path}__', seen=seen))
+    return paths
+
+
+def learn_paths(model_cls, objs):
+    """Adds the related objects loaded on objs to the learned paths of
+    model_cls and returns True if any path is new.
+    """
+    paths = learned_paths.setdefault(model_cls._meta.label_lower, set())
+    learned = set()
+    for obj in objs:
+        learned.update(cached_paths(obj))
+    new_paths = learned - paths
+    paths.update(new_paths)
+    return bool(new_paths)
+
+
+def select_related_paths(model_cls):
+    return sorted(learned_paths.get(model_cls._meta.label_lower, []))
+
+
+class NaturalKeySerializer:
+    """Serializes querysets with natural keys in chunks, streaming the
+    output.
+
+    natural_key() of the CRFs and inlines walks foreign keys lazily.
+    The related objects each model's natural keys need are learned by
+    serializing a first object and reading what was loaded on it; every
+    chunk is then read with select_related() on those paths and its
+    many to many values prefetched, so the queries do not grow with the
+    number of rows. Paths loaded by a chunk that were not selected, for
+    example through a foreign key that was null on the first object,
+    are added for the next chunk.
+    """
+
+    def __init__(self, format=None, chunk_size=None,
+                 use_natural_foreign_keys=True, use_natural_primary_keys=False):
+        self.format = format or 'json'
+        self.chunk_size = chunk_size or export_chunk_size()
+        self.options = dict(
+            use_natural_foreign_keys=use_natural_foreign_keys,
+            use_natural_primary_keys=use_natural_primary_keys)
+
+    def prepare(self, queryset):
+        model_cls = queryset.model
+        return queryset.select_related(
+            *select_related_paths(model_cls)).prefetch_related(
+                *[field.name for field in model_cls._meta.many_to_many])
+
+    def probe(self, queryset):
+        """Serializes the first object of queryset to learn the
+        related objects its natural keys need.
+        """
+        model_cls = queryset.model
+        if model_cls._meta.label_lower in learned_paths:
+            return
+        obj = self.prepare(queryset).first()
+        learned_paths.setdefault(model_cls._meta.label_lower, set())
+        if obj:
+            serializers.serialize(self.format, [obj], **self.options)
+            learn_paths(model_cls, [obj])
+
+    def objects(self, queryset):
+        """Yields the objects of queryset in primary key order, one
+        chunk per query.
+        """
+        queryset = queryset.order_by('pk')
+        self.probe(queryset)
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(
+                pk__gt=last_pk)
+            objs = list(self.prepare(chunk)[:self.chunk_size])
+            if not objs:
+                break
+            yield from objs
+            learn_paths(queryset.model, objs)
+            if len(objs) < self.chunk_size:
+                break
+            last_pk = objs[-1].pk
+
+    def serialize(self, querysets, stream=None):
+        """Serializes the querysets, in order, to stream. Returns the
+        output if no stream is given.
+        """
+        def objects():
+            for queryset in querysets:
+                yield from self.objects(queryset)
+        return serializers.serialize(
+            self.format, objects(), stream=stream, **self.options)
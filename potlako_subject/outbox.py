@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from edc_base.utils import get_utcnow
+
+from .constants import FAILED, PENDING, PROCESSED
+
+logger = logging.getLogger(__name__)
+
+outbox_model = 'potlako_subject.outboxmessage'
+
+handlers = {}
+
+
+class OutboxHandlerError(Exception):
+    pass
+
+
+def outbox_handler(task):
+    """Registers a function to process outbox messages for `task`.
+
+    Handlers are called with the message kwargs and must be safe to
+    call more than once.
+    """
+    def wrapper(func):
+        if task in handlers:
+            raise OutboxHandlerError(
+                f'Outbox handler already registered. Got {task}.')
+        handlers.update({task: func})
+        return func
+    return wrapper
+
+
+def outbox_async():
+    """Returns True if messages are dispatched to django_q after commit,
+    otherwise messages are processed immediately, e.g. in tests.
+    """
+    return getattr(settings, 'POTLAKO_OUTBOX_ASYNC', False)
+
+
+def enqueue(task, idempotency_key=None, **kwargs):
+    """Writes an outbox message in the current transaction and
+    dispatches it once the transaction commits.
+
+    A message with an existing idempotency_key is not added again.
+    """
+    if task not in handlers:
+        raise OutboxHandlerError(f'Unknown outbox task. Got {task}.')
+    outbox_cls = django_apps.get_model(outbox_model)
+    message, created = outbox_cls.objects.get_or_create(
+        idempotency_key=idempotency_key or default_idempotency_key(task, kwargs),
+        defaults={'task': task,
+                  'kwargs': json.dumps(kwargs, cls=DjangoJSONEncoder)})
+    if created:
+        if outbox_async():
+            transaction.on_commit(lambda: dispatch(message.pk))
+        else:
+            process_message(message.pk, raise_exception=True)
+    return message
+
+
+def default_idempotency_key(task, kwargs):
+    """Returns a key for the task and kwargs, encoded the same way as
+    the message kwargs.
+    """
+    digest = hashlib.md5(json.dumps(
+        kwargs, sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest()
+    return f'{task}:{digest}'
+
+
+def dispatch(pk):
+    """Hands a message over to a django_q worker.
+
+    If the cluster cannot be reached the message stays pending and is
+    picked up by `process_pending`.
+    """
+    from django_q.tasks import async_task
+    try:
+        async_task('potlako_subject.outbox.process_message', pk)
+    except Exception as e:
+        logger.warning(f'Unable to dispatch outbox message {pk}. Got {e}.')
+
+
+def retry_delay(attempts):
+    """Returns the delay before the next attempt, doubling from
+    POTLAKO_OUTBOX_RETRY_DELAY seconds.
+    """
+    delay = getattr(settings, 'POTLAKO_OUTBOX_RETRY_DELAY', 60)
+    return timedelta(seconds=delay * 2 ** (attempts - 1))
+
+
+def process_message(pk, raise_exception=None):
+    """Runs the handler of a pending message once and records the
+    outcome.
+
+    Failed messages are retried with backoff up to
+    POTLAKO_OUTBOX_MAX_ATTEMPTS times.
+    """
+    outbox_cls = django_apps.get_model(outbox_model)
+    max_attempts = getattr(settings, 'POTLAKO_OUTBOX_MAX_ATTEMPTS', 5)
+    with transaction.atomic():
+        try:
+            message = outbox_cls.objects.select_for_update().get(
+                pk=pk, status=PENDING)
+        except outbox_cls.DoesNotExist:
+            return None
+        message.attempts += 1
+        try:
+            with transaction.atomic():
+                handlers[message.task](**json.loads(message.kwargs))
+        except Exception as e:
+            if raise_exception:
+                raise
+            message.last_error = f'{e.__class__.__name__}: {e}'
+            if message.attempts >= max_attempts:
+                message.status = FAILED
+            else:
+                message.next_attempt_datetime = (
+                    get_utcnow() + retry_delay(message.attempts))
+        else:
+            message.status = PROCESSED
+            message.processed_datetime = get_utcnow()
+            message.last_error = None
+        message.save(update_fields=[
+            'attempts', 'status', 'next_attempt_datetime',
+            'processed_datetime', 'last_error', 'modified'])
+    return message
+
+
+def process_pending(limit=None):
+    """Processes pending messages that are due, oldest first.
+
+    Returns the number of messages processed successfully. Messages
+    that fail are left for a retry or marked failed.
+    """
+    outbox_cls = django_apps.get_model(outbox_model)
+    pks = outbox_cls.objects.filter(
+        status=PENDING,
+        next_attempt_datetime__lte=get_utcnow()).order_by(
+            'next_attempt_datetime').values_list('pk', flat=True)
+    if limit:
+        pks = pks[:limit]
+    count = 0
+    for pk in list(pks):
+        message = process_message(pk)
+        if message and message.status == PROCESSED:
+            count += 1
+    return count
+
+
+def purge_processed(days=None):
+    """Deletes messages processed more than `days` ago, default
+    POTLAKO_OUTBOX_RETENTION_DAYS.
+
+    Returns the number of messages deleted.
+    """
+    if days is None:
+        days = getattr(settings, 'POTLAKO_OUTBOX_RETENTION_DAYS', 14)
+    outbox_cls = django_apps.get_model(outbox_model)
+    deleted, _ = outbox_cls.objects.filter(
+        status=PROCESSED,
+        processed_datetime__lt=get_utcnow() - timedelta(days=days)).delete()
+    return deleted
+
+
+def create_schedules(sender=None, **kwargs):
+    """Creates or updates the django_q schedules that process pending
+    outbox messages, purge processed ones and send due SMS reminders.
+
+    Connected to post_migrate in AppConfig.ready().
+    """
+    from django_q.models import Schedule
+    Schedule.objects.update_or_create(
+        name='potlako_subject.outbox.process_pending',
+        defaults={'func': 'potlako_subject.outbox.process_pending',
+                  'args': '()',
+                  'schedule_type': Schedule.MINUTES,
+                  'minutes': getattr(
+                      settings, 'POTLAKO_OUTBOX_SCHEDULE_MINUTES', 5),
+                  'repeats': -1})
+    Schedule.objects.update_or_create(
+        name='potlako_subject.outbox.purge_processed',
+        defaults={'func': 'potlako_subject.outbox.purge_processed',
+                  'args': '()',
+                  'schedule_type': Schedule.DAILY,
+                  'repeats': -1})
+    Schedule.objects.update_or_create(
+        name='potlako_subject.sms_dispatcher.dispatch_due_sms',
+        defaults={'func': 'potlako_subject.sms_dispatcher.dispatch_due_sms',
+                  'args': '()',
+                  'schedule_type': Schedule.MINUTES,
+                  'minutes': getattr(
+                      settings, 'POTLAKO_SMS_SCHEDULE_MINUTES', 1),
+                  'repeats': -1})
@@ -0,0 +1,302 @@
+import json
+import os
+
+from django.apps import apps as django_apps
+from django.utils.dateparse import parse_datetime
+
+from .export import export_chunk_size
+from .models.model_mixins import CrfModelMixin
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = pq = None
+
+
+class ParquetExportError(Exception):
+    pass
+
+
+audit_columns = [
+    'created', 'modified', 'user_created', 'user_modified',
+    'hostname_created', 'hostname_modified', 'revision',
+    'device_created', 'device_modified']
+
+integer_types = [
+    'AutoField', 'BigAutoField', 'BigIntegerField', 'IntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'SmallIntegerField']
+
+
+def arrow_type(field):
+    """Returns the Arrow type of a model field's column. Choice fields
+    are dictionary encoded.
+    """
+    internal_type = field.get_internal_type()
+    if field.choices:
+        return pa.dictionary(pa.int32(), pa.string())
+    if internal_type in integer_types:
+        return pa.int64()
+    if internal_type == 'FloatField':
+        return pa.float64()
+    if internal_type == 'DecimalField' and field.max_digits:
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal_type in ['BooleanField', 'NullBooleanField']:
+        return pa.bool_()
+    if internal_type == 'DateField':
+        return pa.date32()
+    if internal_type == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    if internal_type == 'TimeField':
+        return pa.time64('us')
+    if internal_type == 'DurationField':
+        return pa.duration('us')
+    return pa.string()
+
+
+def arrow_array(values, arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        return pa.array(
+            [None if value is None else str(value) for value in values],
+            type=pa.string()).dictionary_encode()
+    if pa.types.is_string(arrow_type):
+        values = [None if value is None else str(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+def lookup_field(model_cls, lookup):
+    """Returns the field at the end of a `__` separated lookup.
+    """
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model_cls = model_cls._meta.get_field(relation).related_model
+    field = model_cls._meta.get_field(name)
+    return field.target_field if field.is_relation else field
+
+
+def crf_models():
+    app_config = django_apps.get_app_config('potlako_subject')
+    return [model_cls for model_cls in app_config.get_models()
+            if issubclass(model_cls, CrfModelMixin)]
+
+
+class ParquetExporter:
+    """Writes one Parquet file per CRF model, one per CRF many to many
+    field and a wide visit-level table joining the CRFs to their visit
+    and appointment.
+
+    CRF rows modified since the last export are merged into the
+    existing files, replacing rows by id. Deleted rows are dropped.
+    A model is exported in full the first time, with `full=True` or if
+    its columns changed. Encrypted fields are not exported.
+    """
+
+    visit_model = 'potlako_subject.subjectvisit'
+    state_filename = 'export_state.json'
+
+    visit_columns = [
+        ('subject_visit_id', 'id'),
+        ('subject_identifier', 'subject_identifier'),
+        ('visit_code', 'visit_code'),
+        ('visit_code_sequence', 'visit_code_sequence'),
+        ('visit_report_datetime', 'report_datetime'),
+        ('visit_reason', 'reason'),
+        ('appt_datetime', 'appointment__appt_datetime'),
+        ('appt_status', 'appointment__appt_status'),
+        ('timepoint', 'appointment__timepoint')]
+
+    def __init__(self, path=None, chunk_size=None, full=None):
+        if pa is None:
+            raise ParquetExportError(
+                'pyarrow is required for the Parquet export. '
+                'Install it with `pip install potlako-subject[parquet]`.')
+        self.path = path
+        self.chunk_size = chunk_size or export_chunk_size()
+        self.full = full
+        os.makedirs(self.path, exist_ok=True)
+
+    @property
+    def state_path(self):
+        return os.path.join(self.path, self.state_filename)
+
+    def read_state(self):
+        if self.full or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def write_state(self, state):
+        with open(self.state_path, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+
+    def table_path(self, name):
+        return os.path.join(self.path, f'{name}.parquet')
+
+    def write_table(self, table, name):
+        path = self.table_path(name)
+        pq.write_table(table, f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+
+    def fields(self, model_cls):
+        return [field for field in model_cls._meta.concrete_fields
+                if not hasattr(field, 'field_cryptor')]
+
+    def export(self):
+        """Exports all CRFs, the visits and the wide table. Returns a
+        dictionary of rows written by model label.
+        """
+        state = self.read_state()
+        counts = {}
+        for model_cls in crf_models():
+            label = model_cls._meta.label_lower
+            since = state.get(label)
+            counts[label], watermark = self.export_model(
+                model_cls, since=parse_datetime(since) if since else None)
+            if watermark:
+                state[label] = watermark.isoformat()
+        self.export_visits()
+        self.export_wide()
+        self.write_state(state)
+        return counts
+
+    def chunks(self, queryset, names):
+        """Yields the primary keys and value tuples of each chunk, in
+        primary key order.
+        """
+        queryset = queryset.order_by('pk').values_list('pk', *names)
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(
+                pk__gt=last_pk)
+            rows = list(chunk[:self.chunk_size])
+            if not rows:
+                break
+            yield [row[0] for row in rows], [row[1:] for row in rows]
+            if len(rows) < self.chunk_size:
+                break
+            last_pk = rows[-1][0]
+
+    def record_batch(self, rows, schema):
+        columns = list(zip(*rows)) if rows else [[] for _ in schema]
+        return pa.RecordBatch.from_arrays(
+            [arrow_array(values, field.type)
+             for values, field in zip(columns, schema)], schema=schema)
+
+    def export_model(self, model_cls, since=None):
+        """Exports the rows of model_cls modified since `since` and
+        their many to many values. Returns the number of rows written
+        and the latest modified datetime.
+        """
+        fields = self.fields(model_cls)
+        names = [field.attname for field in fields]
+        schema = pa.schema(
+            [pa.field(field.attname, arrow_type(field)) for field in fields])
+        m2m_fields = model_cls._meta.many_to_many
+        m2m_schemas = {field.name: self.m2m_schema(model_cls, field)
+                       for field in m2m_fields}
+
+        queryset = model_cls.objects.all()
+        if since:
+            queryset = queryset.filter(modified__gte=since)
+        batches = []
+        m2m_batches = {field.name: [] for field in m2m_fields}
+        for pks, rows in self.chunks(queryset, names):
+            batches.append(self.record_batch(rows, schema))
+            for field in m2m_fields:
+                m2m_batches[field.name].append(self.record_batch(
+                    self.m2m_rows(field, pks), m2m_schemas[field.name]))
+        table = pa.Table.from_batches(batches, schema=schema)
+
+        model_name = model_cls._meta.model_name
+        m2m_tables = {
+            f'{model_name}__{name}': pa.Table.from_batches(
+                m2m_batches[name], schema=m2m_schemas[name])
+            for name in m2m_batches}
+        if since:
+            pks = arrow_array(
+                model_cls.objects.values_list('pk', flat=True),
+                schema.field('id').type)
+            try:
+                table_merged = self.merge(model_name, table, 'id', pks)
+                m2m_tables = {
+                    name: self.merge(name, m2m_table, f'{model_name}_id', pks,
+                                     replaced=table['id'])
+                    for name, m2m_table in m2m_tables.items()}
+            except ParquetExportError:
+                return self.export_model(model_cls)
+        else:
+            table_merged = table
+        self.write_table(table_merged, model_name)
+        for name, m2m_table in m2m_tables.items():
+            self.write_table(m2m_table, name)
+
+        watermark = pc.max(table['modified']).as_py() if table.num_rows else since
+        return table.num_rows, watermark
+
+    def merge(self, name, table, key, pks, replaced=None):
+        """Returns table with the existing rows of the named file that
+        are not replaced by table and whose key is in pks.
+        """
+        path = self.table_path(name)
+        if not os.path.exists(path):
+            return table
+        existing = pq.read_table(path)
+        if not existing.schema.equals(table.schema):
+            raise ParquetExportError(f'The columns of {name} changed.')
+        replaced = table[key] if replaced is None else replaced
+        keep = pc.and_(
+            pc.is_in(existing[key], value_set=pks),
+            pc.invert(pc.is_in(
+                existing[key], value_set=replaced.combine_chunks())))
+        return pa.concat_tables([existing.filter(keep), table])
+
+    def m2m_schema(self, model_cls, field):
+        return pa.schema([
+            pa.field(f'{model_cls._meta.model_name}_id', pa.string()),
+            pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))])
+
+    def m2m_rows(self, field, pks):
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        target_field = 'pk'
+        if 'short_name' in [f.name for f in field.related_model._meta.fields]:
+            target_field = 'short_name'
+        return list(through.objects.filter(**{f'{source}__in': pks}).values_list(
+            through._meta.get_field(source).attname,
+            f'{target}__{target_field}'))
+
+    def export_visits(self):
+        """Writes the visits with their appointment attributes.
+        """
+        visit_cls = django_apps.get_model(self.visit_model)
+        schema = pa.schema([
+            pa.field(name, arrow_type(lookup_field(visit_cls, lookup)))
+            for name, lookup in self.visit_columns])
+        batches = [
+            self.record_batch(rows, schema) for _, rows in self.chunks(
+                visit_cls.objects.all(),
+                [lookup for _, lookup in self.visit_columns])]
+        self.write_table(
+            pa.Table.from_batches(batches, schema=schema), 'subjectvisit')
+
+    def export_wide(self):
+        """Writes one row per visit with the columns of each CRF prefixed
+        by its model name.
+        """
+        wide = pq.read_table(self.table_path('subjectvisit'))
+        for model_cls in crf_models():
+            model_name = model_cls._meta.model_name
+            path = self.table_path(model_name)
+            if not os.path.exists(path):
+                continue
+            crf = pq.read_table(path)
+            indices = pc.index_in(
+                wide['subject_visit_id'], value_set=crf['subject_visit_id'])
+            for name in crf.column_names:
+                if name in audit_columns + ['subject_visit_id']:
+                    continue
+                wide = wide.append_column(
+                    f'{model_name}__{name}', crf[name].take(indices))
+        self.write_table(wide, 'visits_wide')
@@ -43,6 +43,9 @@ SECRET_KEY = '1et5jcq@=j*0+z*q%h8a+0s^qv^1auhbwow73&wc$4pr-wji2d'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# key for the blind indexes of encrypted identity fields
+POTLAKO_BLIND_INDEX_KEY = os.environ.get('POTLAKO_BLIND_INDEX_KEY')
+
 ALLOWED_HOSTS = []
 
 # EDC SMS configuration
@@ -99,6 +102,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'edc_dashboard.middleware.DashboardMiddleware',
     'edc_subject_dashboard.middleware.DashboardMiddleware',
+    'potlako_subject.middleware.AppointmentTimelineMiddleware',
+    'potlako_subject.middleware.BulkDecryptionMiddleware',
+    'potlako_subject.middleware.CascadeTraceMiddleware',
 ]
 
 ROOT_URLCONF = 'potlako_subject.urls'
@@ -192,6 +198,14 @@ EDC_SYNC_FILES_USB_VOLUME = None
 
 COMMUNITIES = config['communities']
 
+POTLAKO_OUTBOX_ASYNC = True
+
+# compress outgoing transaction payloads, only once every node and the
+# central server can read them
+POTLAKO_SYNC_COMPRESS = False
+
+POTLAKO_CASCADE_TRACE = False
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/3.0/howto/static-files/
 
@@ -209,4 +223,6 @@ if 'test' in sys.argv:
 
     MIGRATION_MODULES = DisableMigrations()
     PASSWORD_HASHERS = ('django.contrib.auth.hashers.MD5PasswordHasher',)
+    POTLAKO_OUTBOX_ASYNC = False
+    POTLAKO_BLIND_INDEX_KEY = 'potlako-test-blind-index-key'
     DEFAULT_FILE_STORAGE = 'inmemorystorage.InMemoryStorage'
@@ -0,0 +1,236 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from edc_appointment.appointment_sms_reminder import AppointmentSmsReminder
+from edc_base.utils import get_utcnow
+
+from .constants import FAILED, QUEUED, SENDING, SENT
+
+
+class SmsGatewayError(Exception):
+    pass
+
+
+class AppointmentSmsSender:
+    """Sends a due reminder with edc_appointment's AppointmentSmsReminder,
+    i.e. through the edc_sms gateway at settings.BASE_API_URL.
+    """
+
+    def send(self, reminder=None, recipient_number=None):
+        appt_sms_reminder = AppointmentSmsReminder(
+            subject_identifier=reminder.subject_identifier,
+            appt_datetime=reminder.appt_datetime,
+            sms_message_data=reminder.message,
+            recipient_number=recipient_number)
+        try:
+            appt_sms_reminder.schedule_or_send_sms_reminder(
+                appt_reminder_date=get_utcnow())
+        except Exception as e:
+            raise SmsGatewayError(f'{e.__class__.__name__}: {e}')
+
+
+class RateLimiter:
+    """A token bucket allowing `rate` sends per second with bursts of
+    up to `burst` sends.
+    """
+
+    def __init__(self, rate=None, burst=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.burst
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 0
+                self.updated = self.clock()
+            else:
+                self.tokens -= 1
+
+
+class SmsDispatcher:
+    """Queues appointment reminders and sends due reminders in batches
+    at a configurable rate.
+
+    A batch is claimed in one short transaction by marking it SENDING,
+    sent outside any transaction and the results recorded in a second
+    short transaction, so no rows are locked while the gateway is
+    called. A claim expires after `lease` seconds, e.g. if the worker
+    dies, and the reminder is claimed again.
+
+    Failed sends are retried with exponential backoff and marked FAILED
+    after `max_attempts`. Up to `workers` sends are in flight at once so
+    that gateway latency does not limit throughput below `rate`.
+    Reminders are saved through the model so history and outgoing
+    transactions are kept.
+    """
+
+    reminder_model = 'potlako_subject.smsreminder'
+    consent_model = 'potlako_subject.subjectconsent'
+    sender_cls = AppointmentSmsSender
+
+    def __init__(self, rate=None, batch_size=None, max_attempts=None,
+                 retry_delay=None, workers=None, lease=None, sender=None):
+        self.rate = rate or getattr(settings, 'POTLAKO_SMS_RATE', 5)
+        self.batch_size = batch_size or getattr(
+            settings, 'POTLAKO_SMS_BATCH_SIZE', 100)
+        self.max_attempts = max_attempts or getattr(
+            settings, 'POTLAKO_SMS_MAX_ATTEMPTS', 5)
+        self.retry_delay = retry_delay or getattr(
+            settings, 'POTLAKO_SMS_RETRY_DELAY', 60)
+        self.workers = workers or getattr(settings, 'POTLAKO_SMS_WORKERS', 4)
+        self.lease = lease or getattr(settings, 'POTLAKO_SMS_LEASE', 300)
+        self._sender = sender
+
+    @property
+    def reminder_model_cls(self):
+        return django_apps.get_model(self.reminder_model)
+
+    @property
+    def sender(self):
+        if not self._sender:
+            self._sender = self.sender_cls()
+        return self._sender
+
+    def queue(self, subject_identifier=None, appt_datetime=None,
+              message=None, send_datetime=None):
+        """Returns the reminder of the appointment, queued to be sent on
+        or after send_datetime.
+        """
+        send_datetime = max(send_datetime or get_utcnow(), get_utcnow())
+        reminder, _ = self.reminder_model_cls.objects.get_or_create(
+            subject_identifier=subject_identifier,
+            appt_datetime=appt_datetime,
+            defaults={'message': message,
+                      'next_attempt_datetime': send_datetime})
+        return reminder
+
+    def recipient_numbers(self, subject_identifiers):
+        """Returns a dictionary of recipient number by subject
+        identifier, from SubjectConsent.recipient_number.
+        """
+        consent_cls = django_apps.get_model(self.consent_model)
+        recipient_numbers = {}
+        for consent in consent_cls.objects.filter(
+                subject_identifier__in=subject_identifiers):
+            try:
+                recipient_numbers[consent.subject_identifier] = (
+                    consent.recipient_number)
+            except (ValidationError, TypeError):
+                # no enrollment or no primary cell
+                pass
+        return recipient_numbers
+
+    def claim(self):
+        """Returns a batch of due reminders marked SENDING.
+        """
+        now = get_utcnow()
+        with transaction.atomic():
+            batch = list(self.reminder_model_cls.objects.select_for_update(
+                skip_locked=True).filter(
+                    Q(delivery_status=QUEUED) | Q(delivery_status=SENDING),
+                    next_attempt_datetime__lte=now).order_by(
+                        'next_attempt_datetime')[:self.batch_size])
+            for reminder in batch:
+                reminder.delivery_status = SENDING
+                reminder.delivery_attempts += 1
+                reminder.next_attempt_datetime = now + timedelta(
+                    seconds=self.lease)
+                reminder.save(update_fields=[
+                    'delivery_status', 'delivery_attempts',
+                    'next_attempt_datetime', 'modified'])
+        return batch
+
+    def send(self, batch):
+        """Sends a claimed batch and returns a list of errors, None for
+        each reminder sent.
+        """
+        recipient_numbers = self.recipient_numbers(
+            {reminder.subject_identifier for reminder in batch})
+        rate_limiter = RateLimiter(rate=self.rate)
+
+        def send(reminder):
+            recipient_number = recipient_numbers.get(reminder.subject_identifier)
+            if not recipient_number:
+                return 'Missing recipient number.'
+            rate_limiter.wait()
+            try:
+                self.sender.send(
+                    reminder=reminder, recipient_number=recipient_number)
+            except SmsGatewayError as e:
+                return str(e)
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(send, batch))
+
+    def record(self, batch, errors):
+        """Saves the outcome of each send.
+        """
+        with transaction.atomic():
+            for reminder, error in zip(batch, errors):
+                if error:
+                    reminder.delivery_error = error
+                    if reminder.delivery_attempts >= self.max_attempts:
+                        reminder.delivery_status = FAILED
+                    else:
+                        reminder.delivery_status = QUEUED
+                        reminder.next_attempt_datetime = get_utcnow() + timedelta(
+                            seconds=self.retry_delay * 2 ** (reminder.delivery_attempts - 1))
+                else:
+                    # accepted by the gateway, not a delivery receipt
+                    reminder.delivery_status = SENT
+                    reminder.sent_datetime = get_utcnow()
+                    reminder.delivery_error = None
+                reminder.save(update_fields=[
+                    'delivery_status', 'next_attempt_datetime',
+                    'sent_datetime', 'delivery_error', 'modified'])
+
+    def dispatch(self):
+        """Sends a batch of due reminders and returns a dictionary of
+        counts by delivery status.
+        """
+        batch = self.claim()
+        if not batch:
+            return {}
+        self.record(batch, self.send(batch))
+        counts = {}
+        for reminder in batch:
+            counts[reminder.delivery_status] = counts.get(
+                reminder.delivery_status, 0) + 1
+        return counts
+
+
+sms_dispatcher = SmsDispatcher()
+
+
+def dispatch_due_sms(dispatcher=None):
+    """Sends all due reminders, batch by batch. For use as a django_q
+    schedule, `potlako_subject.sms_dispatcher.dispatch_due_sms`.
+    """
+    dispatcher = dispatcher or sms_dispatcher
+    totals = {}
+    while True:
+        counts = dispatcher.dispatch()
+        for status, count in counts.items():
+            totals[status] = totals.get(status, 0) + count
+        if sum(counts.values()) < dispatcher.batch_size:
+            break
+    return totals
@@ -9,8 +9,13 @@ from model_mommy import mommy
 
 class SubjectHelperMixin:
 
+    # set False when the holidays are already imported, e.g. by a
+    # benchmark that should not time the import
+    import_holidays_on_enrollment = True
+
     def create_enrollment(self, facility, **kwargs):
-        import_holidays()
+        if self.import_holidays_on_enrollment:
+            import_holidays()
 
         clinicial_call_enrolment = mommy.make_recipe(
             'potlako_subject.cliniciancallenrollment',
@@ -0,0 +1,143 @@
+import base64
+import threading
+import zlib
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core import serializers
+from django.db import transaction
+from django_crypto_fields.constants import LOCAL_MODE
+from django_crypto_fields.cryptor import Cryptor
+from edc_sync.sync_model import SyncModel
+
+COMPRESSED_PREFIX = 'zlib:'
+
+
+def compress_sync():
+    return getattr(settings, 'POTLAKO_SYNC_COMPRESS', False)
+
+
+def encode_payload(json_text):
+    """Returns the json text zlib compressed and base64 encoded.
+    """
+    return COMPRESSED_PREFIX + base64.b64encode(
+        zlib.compress(json_text.encode(), 9)).decode()
+
+
+def decode_payload(text):
+    """Returns the json text of a payload, compressed or not.
+    """
+    if text.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(
+            base64.b64decode(text[len(COMPRESSED_PREFIX):])).decode()
+    return text
+
+
+def decrypt_payload(tx):
+    """Returns the json text of an outgoing or incoming transaction's
+    `tx`.
+    """
+    if isinstance(tx, memoryview):
+        tx = tx.tobytes()
+    return decode_payload(Cryptor().aes_decrypt(tx, LOCAL_MODE))
+
+
+def outgoing_transactions(using=None):
+    return django_apps.get_model(
+        'edc_sync', 'outgoingtransaction').objects.using(using)
+
+
+class OutgoingTransactionCoalescer:
+    """Coalesces the outgoing transactions of the objects saved within
+    a database transaction.
+
+    The first save of an object creates its outgoing transaction as
+    usual. Later saves in the same transaction rewrite that outgoing
+    transaction with the object's current state instead of adding
+    another; an object inserted and deleted removes its INSERT instead
+    of sending a DELETE. Outgoing transactions are written in the
+    transaction of the save, so they commit and roll back with it.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def pending(self, using):
+        """Returns the outgoing transactions of the current transaction
+        on `using` as {(label, pk): (outgoing transaction pk, created)}.
+        """
+        if not hasattr(self.local, 'pending'):
+            self.local.pending = {}
+        pending = self.local.pending.get(using)
+        connection = transaction.get_connection(using)
+        if pending is None or not any(
+                callback[1] == pending.clear
+                for callback in connection.run_on_commit):
+            # first save of this transaction, or the previous one
+            # was rolled back together with its callback
+            pending = {}
+            self.local.pending[using] = pending
+            transaction.on_commit(pending.clear, using=using)
+        return pending
+
+    def add(self, wrapped_instance, using=None, created=None, deleted=None):
+        instance = wrapped_instance.instance
+        pending = self.pending(using)
+        key = (instance._meta.label_lower, instance.pk)
+        outgoing = pending.pop(key, None)
+        if deleted:
+            if (outgoing and self.remove(outgoing[0], using=using)
+                    and outgoing[1]):
+                return None
+            return wrapped_instance.send(using, created=False, deleted=True)
+        if outgoing and wrapped_instance.rewrite(outgoing[0], using):
+            pending[key] = outgoing
+            return None
+        outgoing_transaction = wrapped_instance.send(using, created=created)
+        if outgoing_transaction:
+            pending[key] = (outgoing_transaction.pk, created)
+        return outgoing_transaction
+
+    def remove(self, pk, using=None):
+        """Deletes an outgoing transaction of this transaction and
+        returns True, or False if it was rolled back with a savepoint.
+        """
+        deleted, _ = outgoing_transactions(using).filter(pk=pk).delete()
+        return bool(deleted)
+
+
+outgoing_transaction_coalescer = OutgoingTransactionCoalescer()
+
+
+class CoalescingSyncModel(SyncModel):
+    """A SyncModel that keeps one outgoing transaction per object saved
+    in a database transaction, with the object's latest state.
+
+    Payloads are compressed before encryption if POTLAKO_SYNC_COMPRESS
+    is set. Read them with `decrypt_payload`.
+    """
+
+    def to_outgoing_transaction(self, using, created=None, deleted=None):
+        if not transaction.get_connection(using).in_atomic_block:
+            return self.send(using, created=created, deleted=deleted)
+        return outgoing_transaction_coalescer.add(
+            self, using=using, created=created, deleted=deleted)
+
+    def send(self, using, created=None, deleted=None):
+        return super().to_outgoing_transaction(
+            using, created=created, deleted=deleted)
+
+    def rewrite(self, pk, using):
+        """Replaces the payload of outgoing transaction `pk` with the
+        current state of the instance. Returns False if it no longer
+        exists.
+        """
+        return bool(outgoing_transactions(using).filter(
+            pk=pk).update(tx=self.encrypted_json()))
+
+    def encrypted_json(self):
+        if not compress_sync():
+            return super().encrypted_json()
+        json_text = serializers.serialize(
+            'json', [self.instance], use_natural_foreign_keys=True,
+            use_natural_primary_keys=False)
+        return Cryptor().aes_encrypt(encode_payload(json_text), LOCAL_MODE)
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from dateutil.relativedelta import relativedelta
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase, tag
+from edc_action_item.models.action_item import ActionItem
+from edc_appointment.constants import INCOMPLETE_APPT
+from edc_appointment.models import Appointment
+from edc_base.utils import get_utcnow
+from edc_constants.constants import YES, NO, OPEN, NEW
+from edc_facility.import_holidays import import_holidays
+from model_mommy import mommy
+
+from ..action_item_reconciler import ActionItemReconciler
+from ..action_items import SUBJECT_LOCATOR_ACTION
+
+
+@tag('air')
+class TestActionItemReconciler(TestCase):
+
+    def setUp(self):
+        import_holidays()
+
+        clinicial_call_enrolment = mommy.make_recipe(
+            'potlako_subject.cliniciancallenrollment')
+
+        subject_screening = mommy.make_recipe(
+            'potlako_subject.subjectscreening',
+            screening_identifier=clinicial_call_enrolment.screening_identifier)
+
+        self.subject_consent = mommy.make_recipe(
+            'potlako_subject.subjectconsent',
+            screening_identifier=subject_screening.screening_identifier,
+            consent_datetime=get_utcnow() - relativedelta(days=2),
+            identity=clinicial_call_enrolment.national_identity,
+            confirm_identity=clinicial_call_enrolment.national_identity,
+            version='1')
+        self.subject_identifier = self.subject_consent.subject_identifier
+
+        appointment_1000 = Appointment.objects.get(
+            subject_identifier=self.subject_identifier,
+            visit_code='1000')
+        mommy.make_recipe(
+            'potlako_subject.subjectvisit',
+            subject_identifier=self.subject_identifier,
+            report_datetime=get_utcnow(),
+            appointment=appointment_1000)
+        appointment_1000.appt_status = INCOMPLETE_APPT
+        appointment_1000.save()
+
+        self.subject_visit_2000 = mommy.make_recipe(
+            'potlako_subject.subjectvisit',
+            subject_identifier=self.subject_identifier,
+            report_datetime=get_utcnow(),
+            appointment=Appointment.objects.get(
+                subject_identifier=self.subject_identifier,
+                visit_code='2000'))
+
+    def locator_action_items(self):
+        return ActionItem.objects.filter(
+            Q(status=OPEN) | Q(status=NEW),
+            subject_identifier=self.subject_identifier,
+            action_type__name=SUBJECT_LOCATOR_ACTION)
+
+    def test_reconcile_creates_missing_action_item(self):
+        mommy.make_recipe('potlako_subject.patientcallfollowup',
+                          subject_visit=self.subject_visit_2000,
+                          patient_info_change=YES)
+        self.locator_action_items().delete()
+
+        report = ActionItemReconciler(dry_run=True).reconcile()
+        self.assertIn((self.subject_identifier, SUBJECT_LOCATOR_ACTION),
+                      report.get('created'))
+        self.assertEqual(self.locator_action_items().count(), 0)
+
+        ActionItemReconciler().reconcile()
+        self.assertEqual(self.locator_action_items().count(), 1)
+
+    def test_reconcile_deletes_action_item(self):
+        followup = mommy.make_recipe('potlako_subject.patientcallfollowup',
+                                     subject_visit=self.subject_visit_2000,
+                                     patient_info_change=YES)
+        self.assertEqual(self.locator_action_items().count(), 1)
+
+        followup.patient_info_change = NO
+        followup.save()
+        self.assertEqual(self.locator_action_items().count(), 0)
+
+    def test_reconcile_action_items_command(self):
+        mommy.make_recipe('potlako_subject.patientcallfollowup',
+                          subject_visit=self.subject_visit_2000,
+                          patient_info_change=YES)
+        self.locator_action_items().delete()
+
+        out = StringIO()
+        call_command('reconcile_action_items', '--dry-run', stdout=out)
+        self.assertIn('Would have created 1', out.getvalue())
+
+        call_command('reconcile_action_items', stdout=StringIO())
+        self.assertEqual(self.locator_action_items().count(), 1)
@@ -0,0 +1,84 @@
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from ..admin_site import potlako_subject_admin
+from ..benchmark import BenchmarkReport, measure
+from ..subject_helper_mixin import SubjectHelperMixin
+
+facilities = ['mmathethe_clinic', 'bokaa_clinic']
+
+
+@tag('benchmark')
+@skipUnless(os.environ.get('POTLAKO_BENCHMARK'), 'set POTLAKO_BENCHMARK=1')
+class TestAdminBenchmark(TestCase):
+    """Measures the changelist, add and change views of every model
+    registered on potlako_subject_admin against a dataset of
+    POTLAKO_BENCHMARK_SUBJECTS subjects.
+
+    Results are written to POTLAKO_BENCHMARK_REPORT and compared with
+    tests/benchmark_thresholds.json; views without a threshold are
+    written there as a baseline. Set POTLAKO_BENCHMARK_UPDATE=1 to store
+    all results as the new thresholds.
+    """
+
+    suite = 'admin'
+
+    @classmethod
+    def setUpTestData(cls):
+        helper = SubjectHelperMixin()
+        subjects = int(os.environ.get('POTLAKO_BENCHMARK_SUBJECTS', 20))
+        for index in range(subjects):
+            subject_identifier = helper.create_enrollment(
+                facilities[index % len(facilities)])
+            helper.create_visit_1000(subject_identifier)
+        cls.user = User.objects.create_superuser(
+            'benchmark', 'benchmark@example.com', 'pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.report = BenchmarkReport(
+            suite=self.suite,
+            tolerance=float(os.environ.get('POTLAKO_BENCHMARK_TOLERANCE', 1.5)))
+
+    def urls(self):
+        """Yields (name, url) of the admin views to measure.
+        """
+        site = potlako_subject_admin.name
+        for model_cls, model_admin in potlako_subject_admin._registry.items():
+            opts = model_cls._meta
+            prefix = f'{site}:{opts.app_label}_{opts.model_name}'
+            yield f'{opts.model_name}_changelist', reverse(f'{prefix}_changelist')
+            yield f'{opts.model_name}_add', reverse(f'{prefix}_add')
+            obj = model_cls.objects.order_by('pk').first()
+            if obj:
+                yield f'{opts.model_name}_change', reverse(
+                    f'{prefix}_change', args=[obj.pk])
+
+    def test_admin_views(self):
+        for name, url in self.urls():
+            # first request warms caches and url resolution
+            self.client.get(url)
+            measurement = measure(lambda: self.client.get(url), name=name)
+            status = measurement.result.status_code
+            measurement.extra.update(status=status)
+            self.assertLess(status, 500, msg=url)
+            self.report.add(measurement)
+
+        path = os.environ.get(
+            'POTLAKO_BENCHMARK_REPORT',
+            os.path.join(tempfile.gettempdir(), f'{self.suite}_benchmark.json'))
+        results = self.report.write(path)
+        if os.environ.get('POTLAKO_BENCHMARK_UPDATE'):
+            self.report.write_thresholds()
+        else:
+            if results['new']:
+                # baseline for views without a threshold, commit
+                # tests/benchmark_thresholds.json to keep it
+                self.report.write_thresholds(names=results['new'])
+            self.assertEqual(
+                results['regressions'], [], msg=f'See {path}.')
@@ -0,0 +1,92 @@
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, tag
+
+from ..admin import PatientCallInitialAdmin, SubjectConsentAdmin
+from ..admin.paginator_mixins import (
+    KEYSET_VAR, EstimatedCountPaginator, cache_dates)
+from ..models import PatientCallInitial, SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('pg')
+class TestAdminPaginator(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for facility in ['mmathethe_clinic', 'bokaa_clinic', 'mmathethe_clinic']:
+            self.create_enrollment(facility)
+        self.model_admin = SubjectConsentAdmin(SubjectConsent, AdminSite())
+        self.model_admin.list_per_page = 2
+        self.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'pass')
+
+    def changelist(self, params=None, model_admin=None):
+        request = RequestFactory().get('/', params or {})
+        request.user = self.user
+        return (model_admin or self.model_admin).get_changelist_instance(
+            request)
+
+    def test_count_cached(self):
+        queryset = SubjectConsent.objects.all()
+        self.assertEqual(EstimatedCountPaginator(queryset, 2).count, 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(EstimatedCountPaginator(queryset, 2).count, 3)
+
+    def test_dates_cached(self):
+        queryset = cache_dates(SubjectConsent.objects.all())
+        years = queryset.datetimes('modified', 'year')
+        with self.assertNumQueries(0):
+            self.assertEqual(queryset.datetimes('modified', 'year'), years)
+
+    def test_drill_down_dates_cached(self):
+        queryset = cache_dates(SubjectConsent.objects.all())
+        year = queryset.datetimes('modified', 'year')[0].year
+        months = queryset.filter(
+            modified__year=year).datetimes('modified', 'month')
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                queryset.filter(modified__year=year).datetimes(
+                    'modified', 'month'), months)
+
+    def test_keyset_follows_model_admin_ordering(self):
+        self.assertEqual(
+            list(self.model_admin.get_ordering(None)), ['-modified', '-id'])
+        self.model_admin.ordering = ('subject_identifier', )
+        changelist = self.changelist()
+        self.assertFalse(changelist.keyset_enabled)
+        self.assertIsNone(changelist.next_keyset_url)
+
+    def test_keyset(self):
+        changelist = self.changelist()
+        first_page = [obj.pk for obj in changelist.result_list]
+        self.assertEqual(len(first_page), 2)
+
+        next_url = changelist.next_keyset_url
+        self.assertIn(KEYSET_VAR, next_url)
+        last = SubjectConsent.objects.get(pk=first_page[-1])
+        changelist = self.changelist(
+            {KEYSET_VAR: f'{last.modified.isoformat()}_{last.pk}'})
+        second_page = [obj.pk for obj in changelist.result_list]
+        self.assertEqual(len(second_page), 1)
+        self.assertNotIn(second_page[0], first_page)
+        self.assertIsNone(changelist.next_keyset_url)
+
+    def test_keyset_crf_admin(self):
+        for subject_consent in SubjectConsent.objects.all():
+            self.create_visit_1000(subject_consent.subject_identifier)
+        model_admin = PatientCallInitialAdmin(PatientCallInitial, AdminSite())
+        model_admin.list_per_page = 2
+        changelist = self.changelist(model_admin=model_admin)
+        self.assertTrue(changelist.keyset_enabled)
+        first_page = [obj.pk for obj in changelist.result_list]
+        self.assertEqual(len(first_page), 2)
+
+        last = PatientCallInitial.objects.get(pk=first_page[-1])
+        changelist = self.changelist(
+            {KEYSET_VAR: f'{last.modified.isoformat()}_{last.pk}'},
+            model_admin=model_admin)
+        second_page = [obj.pk for obj in changelist.result_list]
+        self.assertEqual(len(second_page), 1)
+        self.assertNotIn(second_page[0], first_page)
@@ -0,0 +1,37 @@
+from django.test import TestCase, tag
+from edc_appointment.models import Appointment
+
+from ..appointment_timeline import appointment_timeline, appointment_timeline_scope
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('timeline')
+class TestAppointmentTimeline(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+
+    def test_timeline(self):
+        timeline = appointment_timeline(self.subject_identifier)
+        self.assertTrue(timeline.exists(visit_code='1000', visit_code_sequence=0))
+        self.assertFalse(timeline.exists(visit_code='1000', visit_code_sequence=1))
+        self.assertEqual(
+            timeline.next_parent_appt_datetime(visit_code='1000'),
+            Appointment.objects.filter(
+                subject_identifier=self.subject_identifier,
+                visit_code='2000').latest('appt_datetime').appt_datetime)
+
+    def test_timeline_scope(self):
+        with appointment_timeline_scope():
+            with self.assertNumQueries(1):
+                appointment_timeline(self.subject_identifier).exists(
+                    visit_code='1000', visit_code_sequence=0)
+                appointment_timeline(self.subject_identifier).exists(
+                    visit_code='2000', visit_code_sequence=0)
+
+            appointment = Appointment.objects.get(
+                subject_identifier=self.subject_identifier,
+                visit_code='1000', visit_code_sequence=0)
+            appointment.save()
+            with self.assertNumQueries(1):
+                appointment_timeline(self.subject_identifier).rows
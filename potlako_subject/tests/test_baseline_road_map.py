@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+
+from ..models.model_mixins import BaselineRoadMapMixin, LazyBaselineRoadMap
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('roadmap')
+class TestBaselineRoadMap(SubjectHelperMixin, TestCase):
+
+    max_queries = 12
+
+    facilities = ['mmathethe_clinic', 'bokaa_clinic']
+
+    def setUp(self):
+        self.subject_identifiers = []
+        self.enroll(2)
+
+    def enroll(self, count):
+        for index in range(count):
+            subject_identifier = self.create_enrollment(
+                self.facilities[index % len(self.facilities)])
+            self.create_visit_1000(subject_identifier)
+            self.subject_identifiers.append(subject_identifier)
+
+    def bulk_query_count(self, subject_identifiers):
+        with CaptureQueriesContext(connection) as context:
+            BaselineRoadMapMixin.bulk(subject_identifiers=subject_identifiers)
+        return len(context.captured_queries)
+
+    def test_baseline_dict(self):
+        baseline_dict = BaselineRoadMapMixin(
+            subject_identifier=self.subject_identifiers[0]).baseline_dict
+        for key in ['cliniciancallenrollment', 'patientcallinitial',
+                    'symptomandcareseekingassessment', 'medicaldiagnosis',
+                    'baselineclinicalsummary', 'navigationsummaryandplan']:
+            self.assertIn(key, baseline_dict)
+        self.assertEqual(
+            baseline_dict.get('patientcallinitial').subject_visit.subject_identifier,
+            self.subject_identifiers[0])
+
+    def test_baseline_dict_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            BaselineRoadMapMixin(subject_identifier=self.subject_identifiers[0])
+        self.assertLessEqual(len(context.captured_queries), self.max_queries)
+
+    def test_bulk_baseline_dict_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            baseline_dicts = BaselineRoadMapMixin.bulk(
+                subject_identifiers=self.subject_identifiers)
+        self.assertLessEqual(len(context.captured_queries), self.max_queries)
+        for subject_identifier in self.subject_identifiers:
+            self.assertEqual(
+                baseline_dicts.get(subject_identifier),
+                BaselineRoadMapMixin(
+                    subject_identifier=subject_identifier).baseline_dict)
+
+    def test_bulk_query_count_independent_of_subjects(self):
+        self.enroll(4)
+        queries = self.bulk_query_count(self.subject_identifiers[:3])
+        self.assertEqual(
+            self.bulk_query_count(self.subject_identifiers), queries)
+        self.assertLessEqual(queries, self.max_queries)
+
+    def test_lazy_baseline_roadmap(self):
+        keys = ['cliniciancallenrollment', 'patientcallinitial']
+        with self.assertNumQueries(0):
+            context = LazyBaselineRoadMap(
+                subject_identifier=self.subject_identifiers[0],
+                keys=keys).lazy_items()
+        self.assertEqual(list(context.keys()), keys)
+        self.assertEqual(
+            context.get('patientcallinitial').subject_visit.subject_identifier,
+            self.subject_identifiers[0])
+        self.assertEqual(
+            context.get('cliniciancallenrollment').subject_identifier,
+            self.subject_identifiers[0])
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+from django.test.utils import override_settings
+
+from ..checks import blind_index_key_check
+from ..forms import ClinicianCallEnrollmentForm
+from ..models import ClinicianCallEnrollment, SubjectConsent
+from ..models.model_mixins import blind_index
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('bidx')
+class TestBlindIndex(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.subject_consent = SubjectConsent.objects.get(
+            subject_identifier=self.subject_identifier)
+
+    def test_blind_index(self):
+        self.assertEqual(blind_index(' 3892 21218 '), blind_index('389221218'))
+        self.assertNotEqual(blind_index('389221218'), '389221218')
+        self.assertIsNone(blind_index(''))
+
+    @override_settings(POTLAKO_BLIND_INDEX_KEY=None)
+    def test_blind_index_key_required(self):
+        errors = blind_index_key_check(None)
+        self.assertEqual([error.id for error in errors], ['potlako_subject.E001'])
+
+    def test_blind_index_key_check(self):
+        self.assertEqual(blind_index_key_check(None), [])
+
+    def test_get_by_identity(self):
+        identity = self.subject_consent.identity
+        self.assertEqual(
+            SubjectConsent.objects.get_by_identity(identity), self.subject_consent)
+        self.assertRaises(
+            SubjectConsent.DoesNotExist,
+            SubjectConsent.objects.get_by_identity, '000000000')
+
+    def test_identity_exists(self):
+        identity = self.subject_consent.identity
+        self.assertEqual(
+            SubjectConsent.objects.filter_by_blind_index(value=identity).get(),
+            self.subject_consent)
+        clinician_call = ClinicianCallEnrollment.objects.get(
+            national_identity=identity)
+        self.assertTrue(
+            ClinicianCallEnrollment.objects.identity_exists(identity))
+        self.assertFalse(
+            ClinicianCallEnrollment.objects.identity_exists(
+                identity, exclude_pk=clinician_call.pk))
+        self.assertFalse(
+            ClinicianCallEnrollment.objects.identity_exists('000000000'))
+
+    def test_duplicate_identity_rejected(self):
+        form = ClinicianCallEnrollmentForm(
+            data={'national_identity': self.subject_consent.identity})
+        form.is_valid()
+        self.assertIn('national_identity', form.errors)
+        self.assertIn(
+            'already enrolled', ' '.join(form.errors['national_identity']))
+
+    def test_backfill_blind_indexes(self):
+        identity = self.subject_consent.identity
+        SubjectConsent.objects.update(identity_bidx=None)
+        ClinicianCallEnrollment.objects.update(national_identity_bidx=None)
+        self.assertFalse(SubjectConsent.objects.identity_exists(identity))
+
+        call_command('backfill_blind_indexes', stdout=StringIO())
+        self.assertTrue(SubjectConsent.objects.identity_exists(identity))
+        self.assertTrue(ClinicianCallEnrollment.objects.identity_exists(identity))
@@ -0,0 +1,80 @@
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase, tag
+
+from ..admin import SubjectConsentAdmin
+from ..bulk_decryption import (
+    bulk_decryptor, bulk_decryption_scope, encrypted_fields)
+from ..models import SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('bulk')
+class TestBulkDecryption(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.create_enrollment('mmathethe_clinic')
+        self.create_enrollment('bokaa_clinic')
+        self.fields = encrypted_fields(SubjectConsent)
+
+    def test_fetch(self):
+        expected = {obj.pk: (obj.first_name, obj.initials)
+                    for obj in SubjectConsent.objects.all()}
+        objs = bulk_decryptor.fetch(
+            SubjectConsent.objects.all(), field_names=['first_name', 'initials'])
+        self.assertEqual(
+            {obj.pk: (obj.first_name, obj.initials) for obj in objs}, expected)
+
+    def test_decrypt_once_per_value(self):
+        values = set()
+        for field in self.fields:
+            values.update(
+                (field.name, value) for value in SubjectConsent.objects.values_list(
+                    field.name, flat=True) if value)
+        with bulk_decryption_scope() as scope:
+            objs = bulk_decryptor.fetch(SubjectConsent.objects.all())
+            with self.assertNumQueries(0):
+                for obj in objs:
+                    for field in self.fields:
+                        getattr(obj, field.attname)
+        self.assertEqual(
+            scope.stats.decrypted + scope.stats.cached, len(values))
+
+    def test_queryset(self):
+        expected = {obj.pk: obj.first_name
+                    for obj in SubjectConsent.objects.all()}
+        queryset = bulk_decryptor.queryset(
+            SubjectConsent.objects.all(), field_names=['first_name'])
+        self.assertIsInstance(queryset, QuerySet)
+        queryset = queryset.order_by('pk')
+        self.assertEqual(
+            {obj.pk: obj.first_name for obj in queryset}, expected)
+        self.assertEqual(
+            list(queryset.values_list('pk', flat=True)), sorted(expected))
+
+    def test_scope_caches_plaintext(self):
+        with bulk_decryption_scope() as scope:
+            bulk_decryptor.fetch(
+                SubjectConsent.objects.all(), field_names=['first_name'])
+            self.assertEqual(scope.stats.decrypted, 2)
+            bulk_decryptor.fetch(
+                SubjectConsent.objects.all(), field_names=['first_name'])
+            self.assertEqual(scope.stats.decrypted, 2)
+            self.assertEqual(scope.stats.cached, 2)
+
+    def test_changelist_list_editable(self):
+        expected = {obj.pk: obj.first_name
+                    for obj in SubjectConsent.objects.all()}
+        model_admin = SubjectConsentAdmin(SubjectConsent, AdminSite())
+        model_admin.list_editable = ('first_name', )
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'pass')
+        changelist = model_admin.get_changelist_instance(request)
+        self.assertIsInstance(changelist.result_list, QuerySet)
+        formset = model_admin.get_changelist_formset(request)(
+            queryset=changelist.result_list)
+        self.assertEqual(
+            {form.instance.pk: form.initial['first_name']
+             for form in formset.forms}, expected)
@@ -0,0 +1,69 @@
+from django.db.models.signals import pre_save
+from django.dispatch import Signal
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+from model_mommy import mommy
+
+from ..cascade_tracer import cascade_tracer, live_receivers
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        yield from walk(child)
+
+
+@tag('tracer')
+class TestCascadeTracer(SubjectHelperMixin, TestCase):
+
+    def test_trace(self):
+        with cascade_tracer.trace('enrollment') as root:
+            self.create_enrollment('mmathethe_clinic')
+        nodes = list(walk(root))
+        consent_save = [node for node in nodes if node.kind == 'save'
+                        and node.name == 'potlako_subject.subjectconsent'][0]
+        receiver = 'potlako_subject.models.signals.subject_consent_on_post_save'
+        handler = [node for node in consent_save.children
+                   if node.kind == 'handler' and node.name == receiver][0]
+        self.assertGreater(handler.seconds, 0)
+        self.assertLessEqual(handler.seconds, consent_save.seconds)
+        self.assertGreater(handler.queries, 0)
+        self.assertIn(
+            receiver,
+            [node.attrs.get('receiver') for node in walk(handler)
+             if node is not handler])
+        self.assertGreater(consent_save.queries, 0)
+        self.assertLessEqual(consent_save.seconds, root.seconds)
+        self.assertTrue(consent_save.attrs.get('origin'))
+        lines = list(root.folded())
+        for line in lines:
+            stack, us = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('trace enrollment'))
+            self.assertGreater(int(us), 0)
+        self.assertTrue([
+            line for line in lines
+            if 'save potlako_subject.subjectconsent;'
+               f'handler {receiver}' in line])
+
+    def test_cascade_delete(self):
+        archive = mommy.make(
+            'potlako_subject.historyarchive', first_history_date=get_utcnow(),
+            last_history_date=get_utcnow())
+        mommy.make('potlako_subject.historyarchiveobject', archive=archive)
+        with cascade_tracer.trace('delete') as root:
+            archive.delete()
+        deletes = [node.name for node in walk(root) if node.kind == 'delete']
+        self.assertEqual(
+            sorted(deletes), ['potlako_subject.historyarchive',
+                              'potlako_subject.historyarchiveobject'])
+
+    def test_not_tracing(self):
+        with cascade_tracer.trace('enrollment') as root:
+            pass
+        self.create_enrollment('mmathethe_clinic')
+        self.assertEqual(root.children, [])
+        self.assertFalse([
+            lookup_key for lookup_key, _ in pre_save.receivers
+            if lookup_key[0] == 'cascade_tracer.on_pre_save'])
+        self.assertIs(Signal._live_receivers, live_receivers)
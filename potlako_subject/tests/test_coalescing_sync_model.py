@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.test import TestCase, tag, override_settings
+from django_crypto_fields.constants import LOCAL_MODE
+from django_crypto_fields.cryptor import Cryptor
+from edc_sync.models import OutgoingTransaction
+from model_mommy import mommy
+
+from ..models import SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+from ..sync_model import (
+    COMPRESSED_PREFIX, decode_payload, decrypt_payload, encode_payload)
+
+
+@tag('coalesce')
+class TestCoalescingSyncModel(SubjectHelperMixin, TestCase):
+
+    def outgoing_transactions(self, instance, pk=None):
+        return OutgoingTransaction.objects.filter(
+            tx_name=instance._meta.label_lower, tx_pk=pk or instance.pk)
+
+    def test_one_transaction_per_object(self):
+        with transaction.atomic():
+            subject_identifier = self.create_enrollment('mmathethe_clinic')
+            subject_consent = SubjectConsent.objects.get(
+                subject_identifier=subject_identifier)
+            subject_consent.save()
+            subject_consent.save()
+            # written in the transaction of the save, not on commit
+            self.assertEqual(
+                self.outgoing_transactions(subject_consent).count(), 1)
+        self.assertEqual(
+            self.outgoing_transactions(
+                subject_consent).get().action, 'I')
+
+    def test_insert_and_delete_not_sent(self):
+        with transaction.atomic():
+            verbal_consent = mommy.make_recipe(
+                'potlako_subject.verbalconsent', screening_identifier='S0001')
+            pk = verbal_consent.pk
+            verbal_consent.save()
+            verbal_consent.delete()
+        self.assertFalse(
+            self.outgoing_transactions(verbal_consent, pk=pk).exists())
+
+    def test_rolled_back_delete_keeps_insert(self):
+        with transaction.atomic():
+            verbal_consent = mommy.make_recipe(
+                'potlako_subject.verbalconsent', screening_identifier='S0001')
+            pk = verbal_consent.pk
+            try:
+                with transaction.atomic():
+                    verbal_consent.delete()
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(
+            list(self.outgoing_transactions(
+                verbal_consent, pk=pk).values_list('action', flat=True)),
+            ['I'])
+
+    def test_payload(self):
+        json_text = '[{"model": "potlako_subject.subjectconsent"}]' * 20
+        payload = encode_payload(json_text)
+        self.assertLess(len(payload), len(json_text))
+        self.assertEqual(decode_payload(payload), json_text)
+        self.assertEqual(decode_payload(json_text), json_text)
+
+    @override_settings(POTLAKO_SYNC_COMPRESS=True)
+    def test_compressed_payload(self):
+        subject_identifier = self.create_enrollment('mmathethe_clinic')
+        subject_consent = SubjectConsent.objects.get(
+            subject_identifier=subject_identifier)
+        tx = self.outgoing_transactions(subject_consent).first().tx
+        self.assertIn(subject_identifier, decrypt_payload(tx))
+
+    def test_payload_not_compressed_by_default(self):
+        subject_identifier = self.create_enrollment('mmathethe_clinic')
+        subject_consent = SubjectConsent.objects.get(
+            subject_identifier=subject_identifier)
+        tx = self.outgoing_transactions(subject_consent).first().tx
+        self.assertIn(subject_identifier, decrypt_payload(tx))
+        self.assertFalse(
+            Cryptor().aes_decrypt(bytes(tx), LOCAL_MODE).startswith(
+                COMPRESSED_PREFIX))
@@ -0,0 +1,89 @@
+from io import StringIO
+
+from dateutil.relativedelta import relativedelta
+from django.core.management import call_command
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+from edc_facility.import_holidays import import_holidays
+from model_mommy import mommy
+
+from ..community_arm import INTERVENTION, STANDARD_OF_CARE
+from ..community_arm import community_arm_for_facility, community_arm_subjects
+from ..models import ClinicianCallEnrollment, OnSchedule, SubjectConsent
+
+
+@tag('ca')
+class TestCommunityArmColumn(TestCase):
+
+    def setUp(self):
+        import_holidays()
+
+        clinicial_call_enrolment = mommy.make_recipe(
+            'potlako_subject.cliniciancallenrollment',
+            facility='mmathethe_clinic')
+
+        self.subject_screening = mommy.make_recipe(
+            'potlako_subject.subjectscreening',
+            screening_identifier=clinicial_call_enrolment.screening_identifier)
+
+        mommy.make_recipe(
+            'potlako_subject.verbalconsent',
+            screening_identifier=self.subject_screening.screening_identifier)
+
+        self.subject_consent = mommy.make_recipe(
+            'potlako_subject.subjectconsent',
+            screening_identifier=self.subject_screening.screening_identifier,
+            consent_datetime=get_utcnow() - relativedelta(days=5),
+            identity=clinicial_call_enrolment.national_identity,
+            confirm_identity=clinicial_call_enrolment.national_identity,
+            version='1')
+
+    def test_community_arm_stored(self):
+        subject_identifier = self.subject_consent.subject_identifier
+        self.assertEqual(ClinicianCallEnrollment.objects.get(
+            screening_identifier=self.subject_screening.screening_identifier
+        ).community_arm, INTERVENTION)
+        self.assertEqual(SubjectConsent.objects.get(
+            subject_identifier=subject_identifier).community_arm, INTERVENTION)
+        self.assertEqual(OnSchedule.objects.get(
+            subject_identifier=subject_identifier).community_arm, INTERVENTION)
+
+    def test_facility_correction_updates_copies(self):
+        subject_identifier = self.subject_consent.subject_identifier
+        enrollment = ClinicianCallEnrollment.objects.get(
+            screening_identifier=self.subject_screening.screening_identifier)
+        enrollment.facility = 'unknown_clinic'
+        enrollment.save()
+        community_arm = community_arm_for_facility('unknown_clinic')
+        self.assertNotEqual(community_arm, INTERVENTION)
+        self.assertEqual(SubjectConsent.objects.get(
+            subject_identifier=subject_identifier).community_arm, community_arm)
+        self.assertEqual(OnSchedule.objects.get(
+            subject_identifier=subject_identifier).community_arm, community_arm)
+
+    def test_community_arm_subjects(self):
+        subject_identifier = self.subject_consent.subject_identifier
+        self.assertIn(
+            subject_identifier,
+            community_arm_subjects(INTERVENTION).values_list(
+                'subject_identifier', flat=True))
+        self.assertFalse(community_arm_subjects(STANDARD_OF_CARE).exists())
+
+    def test_backfill_community_arm(self):
+        ClinicianCallEnrollment.objects.update(community_arm=None)
+        SubjectConsent.objects.update(community_arm=None)
+        OnSchedule.objects.update(community_arm=None)
+
+        out = StringIO()
+        call_command('backfill_community_arm', '--check', stdout=out)
+        self.assertIn('1 of 1 rows mismatched', out.getvalue())
+        self.assertFalse(SubjectConsent.objects.filter(
+            community_arm=INTERVENTION).exists())
+
+        call_command('backfill_community_arm', stdout=StringIO())
+        self.assertEqual(SubjectConsent.objects.filter(
+            community_arm=INTERVENTION).count(), 1)
+        self.assertEqual(OnSchedule.objects.filter(
+            community_arm=INTERVENTION).count(), 1)
+        self.assertEqual(ClinicianCallEnrollment.objects.filter(
+            community_arm=INTERVENTION).count(), 1)
@@ -0,0 +1,60 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase, tag
+from model_mommy import mommy
+
+from ..community_arm import CommunityArmResolver, community_arm_resolver
+from ..community_arm import INTERVENTION, STANDARD_OF_CARE
+
+
+@tag('ca')
+class TestCommunityArmResolver(TestCase):
+
+    def setUp(self):
+        community_arm_resolver.clear()
+        self.clinician_call_enrollment = mommy.make_recipe(
+            'potlako_subject.cliniciancallenrollment',
+            facility='mmathethe_clinic')
+        self.screening_identifier = (
+            self.clinician_call_enrollment.screening_identifier)
+
+    def test_community_arm_cached(self):
+        resolver = CommunityArmResolver()
+        self.assertEqual(
+            resolver.get(screening_identifier=self.screening_identifier),
+            INTERVENTION)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolver.get(screening_identifier=self.screening_identifier),
+                INTERVENTION)
+        self.assertEqual(resolver.stats.get('hits'), 1)
+        self.assertEqual(resolver.stats.get('misses'), 1)
+
+    def test_community_arm_invalidated_on_enrollment_save(self):
+        self.assertEqual(
+            community_arm_resolver.get(
+                screening_identifier=self.screening_identifier),
+            INTERVENTION)
+        self.clinician_call_enrollment.facility = 'bokaa_clinic'
+        self.clinician_call_enrollment.save()
+        self.assertEqual(
+            community_arm_resolver.get(
+                screening_identifier=self.screening_identifier),
+            STANDARD_OF_CARE)
+        self.assertEqual(community_arm_resolver.stats.get('misses'), 2)
+
+    def test_community_arm_lru_eviction(self):
+        resolver = CommunityArmResolver(maxsize=1)
+        other = mommy.make_recipe(
+            'potlako_subject.cliniciancallenrollment',
+            facility='bokaa_clinic')
+        resolver.get(screening_identifier=self.screening_identifier)
+        resolver.get(screening_identifier=other.screening_identifier)
+        self.assertEqual(resolver.stats.get('size'), 1)
+        resolver.get(screening_identifier=self.screening_identifier)
+        self.assertEqual(resolver.stats.get('misses'), 3)
+
+    def test_missing_enrollment_not_cached(self):
+        resolver = CommunityArmResolver()
+        self.assertRaises(
+            ValidationError, resolver.get, screening_identifier='S9999999')
+        self.assertEqual(resolver.stats.get('size'), 0)
@@ -0,0 +1,68 @@
+import json
+
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+from edc_appointment.models import Appointment
+
+from ..models import ClinicianCallEnrollment, OnSchedule, OutboxMessage
+from ..models import SubjectConsent, SubjectScreening
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('consent_enrollment')
+class TestConsentEnrollment(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        app_config = django_apps.get_app_config('edc_appointment')
+        self.addCleanup(
+            setattr, app_config, 'send_sms_reminders',
+            app_config.send_sms_reminders)
+        app_config.send_sms_reminders = True
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.consent = SubjectConsent.objects.get(
+            subject_identifier=self.subject_identifier)
+
+    def test_identifier_propagated(self):
+        screening = SubjectScreening.objects.get(
+            screening_identifier=self.consent.screening_identifier)
+        self.assertEqual(screening.subject_identifier, self.subject_identifier)
+        self.assertTrue(screening.is_consented)
+        self.assertEqual(
+            ClinicianCallEnrollment.objects.get(
+                screening_identifier=self.consent.screening_identifier).subject_identifier,
+            self.subject_identifier)
+
+    def test_screening_saved_once(self):
+        screening = SubjectScreening.objects.get(
+            screening_identifier=self.consent.screening_identifier)
+        # created, then saved once by the consent
+        self.assertEqual(screening.history.count(), 2)
+
+    def test_onschedule_saved_with_community_arm(self):
+        onschedule = OnSchedule.objects.get(
+            subject_identifier=self.subject_identifier)
+        self.assertEqual(onschedule.community_arm, self.consent.community_arm)
+        self.assertEqual(onschedule.history.count(), 1)
+
+    def test_reminders_queued_once(self):
+        self.assertFalse(OutboxMessage.objects.filter(
+            task='schedule_appointment_sms').exists())
+        messages = OutboxMessage.objects.filter(
+            task='schedule_appointment_sms_batch')
+        self.assertEqual(messages.count(), 1)
+        appointments = [str(pk) for pk in Appointment.objects.filter(
+            subject_identifier=self.subject_identifier).values_list(
+                'pk', flat=True)]
+        self.assertTrue(appointments)
+        self.assertEqual(
+            sorted(json.loads(messages.get().kwargs)['appointments']),
+            sorted(appointments))
+
+    def test_resave(self):
+        self.consent.save()
+        screening = SubjectScreening.objects.get(
+            screening_identifier=self.consent.screening_identifier)
+        self.assertEqual(screening.history.count(), 3)
+        self.assertEqual(
+            OnSchedule.objects.filter(
+                subject_identifier=self.subject_identifier).count(), 1)
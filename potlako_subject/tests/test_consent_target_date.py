@@ -0,0 +1,68 @@
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+from edc_constants.constants import DONE, NOT_DONE
+from model_mommy import mommy
+
+from ..models import SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('td')
+class TestConsentTargetDate(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.navigation_plan = mommy.make_recipe(
+            'potlako_subject.navigationsummaryandplan',
+            subject_identifier=self.subject_identifier)
+
+    def target_date(self):
+        return SubjectConsent.objects.get(
+            subject_identifier=self.subject_identifier).target_date
+
+    def test_consent_queryset_not_annotated(self):
+        self.assertNotIn(
+            'evaluationtimeline', str(SubjectConsent.objects.all().query))
+
+    def test_target_date_maintained(self):
+        target_date = (get_utcnow() + relativedelta(days=10)).date()
+        key_step = mommy.make_recipe(
+            'potlako_subject.evaluationtimeline',
+            navigation_plan=self.navigation_plan,
+            key_step='biopsy',
+            target_date=target_date,
+            key_step_status=NOT_DONE)
+        self.assertEqual(self.target_date(), target_date)
+
+        key_step.key_step_status = DONE
+        key_step.save()
+        self.assertIsNone(self.target_date())
+
+    def test_update_target_date_all(self):
+        target_date = (get_utcnow() + relativedelta(days=10)).date()
+        mommy.make_recipe(
+            'potlako_subject.evaluationtimeline',
+            navigation_plan=self.navigation_plan,
+            key_step='biopsy',
+            target_date=target_date,
+            key_step_status=NOT_DONE)
+        SubjectConsent.objects.update(target_date=None)
+        SubjectConsent.objects.update_target_date()
+        self.assertEqual(self.target_date(), target_date)
+
+    def test_target_date_cleared_on_delete(self):
+        target_date = (get_utcnow() + relativedelta(days=10)).date()
+        key_step = mommy.make_recipe(
+            'potlako_subject.evaluationtimeline',
+            navigation_plan=self.navigation_plan,
+            key_step='biopsy',
+            target_date=target_date,
+            key_step_status=NOT_DONE)
+        self.assertEqual(self.target_date(), target_date)
+        key_step.delete()
+        self.assertIsNone(self.target_date())
+        self.assertEqual(
+            SubjectConsent.history.filter(
+                subject_identifier=self.subject_identifier).latest(
+                    'history_date').target_date, None)
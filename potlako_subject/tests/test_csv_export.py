@@ -0,0 +1,69 @@
+import csv
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import Permission, User
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, tag
+from model_mommy import mommy
+
+from ..admin import ClinicianCallEnrollmentAdmin, SubjectConsentAdmin
+from ..admin.actions import export_crf_as_csv
+from ..export import ModelExporter
+from ..models import ClinicianCallEnrollment, SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('csv')
+class TestCsvExport(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        for facility in ['mmathethe_clinic', 'bokaa_clinic', 'mmathethe_clinic']:
+            self.create_enrollment(facility)
+
+    def export(self, queryset, model_admin=None):
+        response = export_crf_as_csv(model_admin, None, queryset)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.DictReader(content.splitlines()))
+
+    def test_export_chunks(self):
+        exporter = ModelExporter(model_cls=SubjectConsent, chunk_size=2)
+        chunks = list(exporter.chunks(SubjectConsent.objects.all()))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+    def test_export_decrypts(self):
+        rows = self.export(SubjectConsent.objects.all())
+        self.assertEqual(
+            sorted(row['first_name'] for row in rows),
+            sorted(SubjectConsent.objects.values_list('first_name', flat=True)))
+
+    def test_export_m2m(self):
+        enrollment = ClinicianCallEnrollment.objects.first()
+        enrollment.symptoms.set([
+            mommy.make('potlako_subject.symptoms', name='Cough', short_name='cough'),
+            mommy.make('potlako_subject.symptoms', name='Pain', short_name='pain')])
+        model_admin = ClinicianCallEnrollmentAdmin(
+            ClinicianCallEnrollment, AdminSite())
+        rows = self.export(ClinicianCallEnrollment.objects.all(), model_admin)
+        symptoms = {row['id']: row['symptoms'] for row in rows}
+        self.assertEqual(symptoms[str(enrollment.pk)], 'cough;pain')
+
+    def test_export_requires_permission(self):
+        model_admin = ClinicianCallEnrollmentAdmin(
+            ClinicianCallEnrollment, AdminSite())
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_user('clerk')
+        self.assertNotIn('export_crf_as_csv', model_admin.get_actions(request))
+
+        request.user.user_permissions.add(Permission.objects.get(
+            content_type__app_label='potlako_subject',
+            codename='export_cliniciancallenrollment'))
+        request.user = User.objects.get(pk=request.user.pk)
+        self.assertIn('export_crf_as_csv', model_admin.get_actions(request))
+
+    def test_export_not_offered_on_other_admins(self):
+        model_admin = SubjectConsentAdmin(SubjectConsent, AdminSite())
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'pass')
+        self.assertNotIn('export_crf_as_csv', model_admin.get_actions(request))
@@ -0,0 +1,106 @@
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, tag
+from edc_appointment.models import Appointment
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NO
+from model_mommy import mommy
+
+from ..constants import APPOINTMENT, AVAILABILITY, REPEAT_CALL
+from ..due_calls import is_source_deleting, rebuild_due_calls, worklist
+from ..models import DueCall, MissedCallRecord, PatientAvailabilityLog, SubjectVisit
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('dc')
+class TestDueCalls(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+
+    def due_calls(self):
+        return set(DueCall.objects.values_list(
+            'source', 'source_id', 'due_date', 'priority'))
+
+    def test_appointment_due_calls(self):
+        appointments = Appointment.objects.filter(
+            subject_identifier=self.subject_identifier)
+        self.assertEqual(DueCall.objects.filter(
+            source=APPOINTMENT).count(), appointments.count())
+
+        self.create_visit_1000(self.subject_identifier)
+        self.assertFalse(DueCall.objects.filter(
+            source=APPOINTMENT,
+            source_id=str(appointments.get(visit_code='1000').pk)).exists())
+
+    def test_repeat_call_due_call(self):
+        self.create_visit_1000(self.subject_identifier)
+        missed_call = mommy.make_recipe(
+            'potlako_subject.missedcall',
+            subject_visit=SubjectVisit.objects.get(
+                subject_identifier=self.subject_identifier, visit_code='1000'))
+        repeat_call = (get_utcnow() + relativedelta(days=2)).date()
+        mommy.make_recipe(
+            'potlako_subject.missedcallrecord',
+            missed_call=missed_call,
+            repeat_call=repeat_call)
+        self.assertEqual(DueCall.objects.get(
+            source=REPEAT_CALL, source_id=str(missed_call.pk)).due_date, repeat_call)
+
+        missed_call.is_complete = True
+        missed_call.save()
+        self.assertFalse(DueCall.objects.filter(source=REPEAT_CALL).exists())
+
+    def test_availability_due_call(self):
+        patient_availability_log = PatientAvailabilityLog.objects.get(
+            clinician_call__subject_identifier=self.subject_identifier)
+        entry = mommy.make(
+            'potlako_subject.patientavailabilitylogentry',
+            patient_availability_log=patient_availability_log,
+            can_take_call=NO)
+        due_call = DueCall.objects.get(source=AVAILABILITY)
+        self.assertEqual(
+            due_call.due_date, entry.report_datetime.date() + relativedelta(days=1))
+        self.assertIn(due_call, worklist(
+            due_date=due_call.due_date))
+
+    def test_rebuild_due_calls(self):
+        due_calls = self.due_calls()
+        DueCall.objects.all().delete()
+        rebuild_due_calls()
+        self.assertEqual(self.due_calls(), due_calls)
+
+    def test_due_call_deleted_with_missed_call(self):
+        self.create_visit_1000(self.subject_identifier)
+        missed_call = mommy.make_recipe(
+            'potlako_subject.missedcall',
+            subject_visit=SubjectVisit.objects.get(
+                subject_identifier=self.subject_identifier, visit_code='1000'))
+        mommy.make_recipe(
+            'potlako_subject.missedcallrecord',
+            missed_call=missed_call,
+            repeat_call=(get_utcnow() + relativedelta(days=2)).date())
+        MissedCallRecord.objects.filter(missed_call=missed_call).delete()
+        self.assertFalse(DueCall.objects.filter(source=REPEAT_CALL).exists())
+        DueCall.objects.create(
+            source=REPEAT_CALL, source_id=str(missed_call.pk),
+            due_date=get_utcnow().date(), priority=1)
+        missed_call_pk = missed_call.pk
+        missed_call.delete()
+        self.assertFalse(DueCall.objects.filter(source=REPEAT_CALL).exists())
+        self.assertFalse(is_source_deleting(
+            source=REPEAT_CALL, source_id=missed_call_pk))
+
+    def test_due_call_deleted_with_availability_log(self):
+        patient_availability_log = PatientAvailabilityLog.objects.get(
+            clinician_call__subject_identifier=self.subject_identifier)
+        mommy.make(
+            'potlako_subject.patientavailabilitylogentry',
+            patient_availability_log=patient_availability_log,
+            can_take_call=NO)
+        patient_availability_log.patientavailabilitylogentry_set.all().delete()
+        self.assertFalse(DueCall.objects.filter(source=AVAILABILITY).exists())
+        DueCall.objects.create(
+            source=AVAILABILITY, source_id=str(patient_availability_log.pk),
+            due_date=get_utcnow().date(), priority=2)
+        patient_availability_log.delete()
+        self.assertFalse(DueCall.objects.filter(source=AVAILABILITY).exists())
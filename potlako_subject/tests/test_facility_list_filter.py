@@ -0,0 +1,46 @@
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, tag
+
+from ..admin import SubjectConsentAdmin
+from ..admin.admin_filter_mixins import FacilityListFilter
+from ..models import SubjectConsent
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('ff')
+class TestFacilityListFilter(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.intervention = self.create_enrollment('mmathethe_clinic')
+        self.soc = self.create_enrollment('bokaa_clinic')
+        self.model_admin = SubjectConsentAdmin(SubjectConsent, AdminSite())
+
+    def facility_filter(self, facility=None):
+        params = {'facility': facility} if facility else {}
+        request = RequestFactory().get('/', params)
+        return FacilityListFilter(
+            request, dict(params), SubjectConsent, self.model_admin)
+
+    def test_queryset(self):
+        queryset = self.facility_filter('mmathethe_clinic').queryset(
+            None, SubjectConsent.objects.all())
+        self.assertEqual(
+            list(queryset.values_list('subject_identifier', flat=True)),
+            [self.intervention])
+
+    def test_queryset_no_value(self):
+        queryset = self.facility_filter().queryset(
+            None, SubjectConsent.objects.all())
+        self.assertEqual(queryset.count(), 2)
+
+    def test_facility_counts_cached(self):
+        facility_filter = self.facility_filter()
+        cache.clear()
+        with self.assertNumQueries(1):
+            counts = facility_filter.facility_counts(SubjectConsent)
+        self.assertEqual(counts.get('mmathethe_clinic'), 1)
+        self.assertEqual(counts.get('bokaa_clinic'), 1)
+        with self.assertNumQueries(0):
+            facility_filter.facility_counts(SubjectConsent)
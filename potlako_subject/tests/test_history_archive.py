@@ -0,0 +1,50 @@
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+
+from ..history_archive import (
+    HistoryArchiver, archived_history, restore_archive)
+from ..models import ClinicianCallEnrollment, HistoryArchive
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('history_archive')
+class TestHistoryArchive(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.enrollment = ClinicianCallEnrollment.objects.get(
+            subject_identifier=self.subject_identifier)
+        self.history_cls = ClinicianCallEnrollment.history.model
+        self.path = tempfile.mkdtemp()
+
+    def archive(self, **kwargs):
+        return HistoryArchiver(path=self.path, **kwargs).archive(
+            models=[self.history_cls])
+
+    def test_archive_before(self):
+        rows = self.history_cls.objects.count()
+        self.assertEqual(
+            self.archive(before=get_utcnow() - timedelta(days=1)),
+            {self.history_cls._meta.label_lower: 0})
+        counts = self.archive(before=get_utcnow() + timedelta(days=1), chunk_size=1)
+        self.assertEqual(counts[self.history_cls._meta.label_lower], rows)
+        self.assertEqual(self.history_cls.objects.count(), 0)
+        self.assertEqual(
+            len(archived_history(
+                ClinicianCallEnrollment, self.enrollment.pk, path=self.path)),
+            rows)
+
+    def test_restore(self):
+        rows = self.history_cls.objects.count()
+        self.archive(before=get_utcnow() + timedelta(days=1))
+        for archive in HistoryArchive.objects.all():
+            restore_archive(archive, path=self.path)
+        self.assertEqual(self.history_cls.objects.count(), rows)
+        self.assertFalse(HistoryArchive.objects.exists())
+        self.assertEqual(
+            self.history_cls.objects.filter(
+                id=self.enrollment.pk).latest('history_date').facility,
+            self.enrollment.facility)
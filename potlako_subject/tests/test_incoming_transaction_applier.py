@@ -0,0 +1,71 @@
+from django.test import TestCase, tag
+from edc_sync.models import IncomingTransaction, OutgoingTransaction
+
+from ..incoming_transactions import (
+    IncomingTransactionApplier, NaturalKeyResolver)
+from ..models import ClinicianCallEnrollment, SubjectVisit
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('incoming')
+class TestIncomingTransactionApplier(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        # outgoing transactions are written in the transaction of the
+        # save, so they exist without running the on_commit callbacks
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.create_visit_1000(self.subject_identifier)
+
+    def receive(self, model_cls):
+        for outgoing in OutgoingTransaction.objects.filter(
+                tx_name=model_cls._meta.label_lower):
+            IncomingTransaction.objects.create(
+                tx_name=outgoing.tx_name, tx_pk=outgoing.tx_pk,
+                tx=outgoing.tx, timestamp=outgoing.timestamp,
+                producer='other-default', action=outgoing.action)
+
+    def test_apply(self):
+        enrollment = ClinicianCallEnrollment.objects.get(
+            subject_identifier=self.subject_identifier)
+        facility = enrollment.facility
+        ClinicianCallEnrollment.objects.filter(pk=enrollment.pk).update(
+            facility='bokaa_clinic')
+        self.receive(ClinicianCallEnrollment)
+        self.receive(SubjectVisit)
+
+        consumed = IncomingTransactionApplier(chunk_size=2).apply()
+
+        self.assertEqual(consumed, IncomingTransaction.objects.count())
+        self.assertFalse(
+            IncomingTransaction.objects.filter(is_consumed=False).exists())
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.facility, facility)
+
+    def test_failed_chunk_applied_one_at_a_time(self):
+        self.receive(ClinicianCallEnrollment)
+        IncomingTransaction.objects.create(
+            tx_name='potlako_subject.cliniciancallenrollment', tx_pk='bad',
+            tx=b'not a payload', timestamp='20200101000000000000',
+            producer='other-default', action='I')
+
+        applier = IncomingTransactionApplier()
+        consumed = applier.apply()
+
+        self.assertEqual(applier.errors, 1)
+        self.assertEqual(consumed, IncomingTransaction.objects.count() - 1)
+        failed = IncomingTransaction.objects.get(tx_pk='bad')
+        self.assertTrue(failed.is_error)
+        self.assertFalse(failed.is_consumed)
+        self.assertTrue(failed.error)
+        self.assertFalse(IncomingTransaction.objects.filter(
+            is_consumed=False, is_error=False).exists())
+
+    def test_resolver_prefetch(self):
+        subject_visit = SubjectVisit.objects.get(
+            subject_identifier=self.subject_identifier, visit_code='1000')
+        natural_key = list(subject_visit.natural_key())
+        resolver = NaturalKeyResolver()
+        resolver.prefetch(SubjectVisit, [natural_key])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolver.resolve(SubjectVisit, natural_key), subject_visit.pk)
@@ -0,0 +1,65 @@
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+from dateutil.relativedelta import relativedelta
+from model_mommy import mommy
+
+from ..missed_call_counter import missed_call_records_bulk
+from ..models import MissedCall, MissedCallRecord, OutboxMessage, SubjectVisit
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('mc')
+class TestMissedCallCounter(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.create_visit_1000(subject_identifier)
+        subject_visit = SubjectVisit.objects.get(
+            subject_identifier=subject_identifier, visit_code='1000')
+        self.missed_call = mommy.make_recipe(
+            'potlako_subject.missedcall',
+            subject_visit=subject_visit)
+
+    def add_records(self, count):
+        self.add_records_from(1, count)
+
+    def add_records_from(self, first_day, count):
+        for day in range(first_day, first_day + count):
+            mommy.make_recipe(
+                'potlako_subject.missedcallrecord',
+                missed_call=self.missed_call,
+                repeat_call=(get_utcnow() + relativedelta(days=day)).date())
+
+    def rule_runs(self):
+        return OutboxMessage.objects.filter(
+            task='run_missed_call_metadata_rules').count()
+
+    def test_record_count(self):
+        self.add_records(2)
+        self.assertEqual(MissedCall.objects.get(
+            pk=self.missed_call.pk).record_count, 2)
+        MissedCallRecord.objects.filter(missed_call=self.missed_call).first().delete()
+        self.assertEqual(MissedCall.objects.get(
+            pk=self.missed_call.pk).record_count, 1)
+
+    def test_rules_run_once(self):
+        self.add_records(2)
+        self.assertEqual(self.rule_runs(), 0)
+        self.add_records(2)
+        self.assertEqual(self.rule_runs(), 1)
+
+    def test_bulk(self):
+        with missed_call_records_bulk():
+            self.add_records(3)
+            self.assertEqual(MissedCall.objects.get(
+                pk=self.missed_call.pk).record_count, 0)
+        self.assertEqual(MissedCall.objects.get(
+            pk=self.missed_call.pk).record_count, 3)
+        self.assertEqual(self.rule_runs(), 1)
+
+    def test_rules_run_again_after_crossing_again(self):
+        self.add_records(3)
+        self.assertEqual(self.rule_runs(), 1)
+        MissedCallRecord.objects.filter(missed_call=self.missed_call).first().delete()
+        self.add_records_from(4, 1)
+        self.assertEqual(self.rule_runs(), 2)
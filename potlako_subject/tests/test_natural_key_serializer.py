@@ -0,0 +1,42 @@
+import json
+
+from django.core import serializers
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+
+from ..models import PatientCallInitial
+from ..natural_key_serializer import NaturalKeySerializer, select_related_paths
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('natural_key')
+class TestNaturalKeySerializer(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.create_visit_1000(subject_identifier)
+
+    def count_queries(self, serializer):
+        with CaptureQueriesContext(connection) as context:
+            serializer.serialize([PatientCallInitial.objects.all()])
+        return len(context.captured_queries)
+
+    def test_serialize(self):
+        output = NaturalKeySerializer(chunk_size=1).serialize(
+            [PatientCallInitial.objects.all()])
+        self.assertEqual(
+            json.loads(output),
+            json.loads(serializers.serialize(
+                'json', PatientCallInitial.objects.order_by('pk'),
+                use_natural_foreign_keys=True)))
+        self.assertIn('subject_visit', select_related_paths(PatientCallInitial))
+
+    def test_queries_do_not_grow_with_rows(self):
+        serializer = NaturalKeySerializer()
+        self.count_queries(serializer)
+        queries = self.count_queries(serializer)
+        subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.create_visit_1000(subject_identifier)
+        self.assertEqual(PatientCallInitial.objects.count(), 2)
+        self.assertEqual(self.count_queries(serializer), queries)
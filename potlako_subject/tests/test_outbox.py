@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.test import TestCase, tag
+from django.test.utils import override_settings
+from edc_base.utils import get_utcnow
+
+from ..constants import FAILED, PENDING, PROCESSED
+from ..models import OutboxMessage
+from ..outbox import enqueue, outbox_handler, process_message, process_pending
+from ..outbox import purge_processed
+
+calls = []
+
+
+@outbox_handler('test_outbox_task')
+def outbox_task(fail=False, **kwargs):
+    if fail:
+        raise ValueError('Failed')
+    calls.append(kwargs)
+
+
+@tag('outbox')
+class TestOutbox(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_processed_immediately(self):
+        message = enqueue('test_outbox_task', idempotency_key='1', value=1)
+        message.refresh_from_db()
+        self.assertEqual(message.status, PROCESSED)
+        self.assertEqual(calls, [{'value': 1}])
+
+    def test_enqueue_idempotency_key(self):
+        enqueue('test_outbox_task', idempotency_key='1', value=1)
+        enqueue('test_outbox_task', idempotency_key='1', value=1)
+        self.assertEqual(OutboxMessage.objects.filter(
+            idempotency_key='1').count(), 1)
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(POTLAKO_OUTBOX_ASYNC=True)
+    def test_enqueue_async_waits_for_commit(self):
+        message = enqueue('test_outbox_task', idempotency_key='1', value=1)
+        self.assertEqual(message.status, PENDING)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(process_pending(), 1)
+        self.assertEqual(calls, [{'value': 1}])
+        self.assertIsNone(process_message(message.pk))
+
+    @override_settings(POTLAKO_OUTBOX_ASYNC=True,
+                       POTLAKO_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_message_retried(self):
+        message = enqueue('test_outbox_task', idempotency_key='1', fail=True)
+
+        message = process_message(message.pk)
+        self.assertEqual(message.status, PENDING)
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_datetime, get_utcnow())
+        self.assertEqual(message.last_error, 'ValueError: Failed')
+        self.assertEqual(process_pending(), 0)
+
+        message = process_message(message.pk)
+        self.assertEqual(message.status, FAILED)
+        self.assertEqual(message.attempts, 2)
+
+    def test_default_idempotency_key(self):
+        report_date = get_utcnow().date()
+        enqueue('test_outbox_task', report_date=report_date)
+        enqueue('test_outbox_task', report_date=report_date)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(calls, [{'report_date': report_date.isoformat()}])
+
+    @override_settings(POTLAKO_OUTBOX_ASYNC=True)
+    def test_failed_message_not_counted(self):
+        enqueue('test_outbox_task', idempotency_key='1', fail=True)
+        enqueue('test_outbox_task', idempotency_key='2', value=2)
+        self.assertEqual(process_pending(), 1)
+
+    def test_purge_processed(self):
+        enqueue('test_outbox_task', idempotency_key='1', value=1)
+        enqueue('test_outbox_task', idempotency_key='2', value=2)
+        OutboxMessage.objects.filter(idempotency_key='1').update(
+            processed_datetime=get_utcnow() - timedelta(days=30))
+        self.assertEqual(purge_processed(days=14), 1)
+        self.assertEqual(list(OutboxMessage.objects.values_list(
+            'idempotency_key', flat=True)), ['2'])
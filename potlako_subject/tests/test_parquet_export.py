@@ -0,0 +1,45 @@
+import os
+import tempfile
+from unittest import skipIf
+
+from django.test import TestCase, tag
+
+from ..models import PatientCallInitial
+from ..parquet_export import ParquetExporter, pc, pq
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('parquet')
+@skipIf(pq is None, 'pyarrow is not installed')
+class TestParquetExport(SubjectHelperMixin, TestCase):
+
+    def setUp(self):
+        self.subject_identifier = self.create_enrollment('mmathethe_clinic')
+        self.create_visit_1000(self.subject_identifier)
+        self.path = tempfile.mkdtemp()
+
+    def read_table(self, name):
+        return pq.read_table(os.path.join(self.path, f'{name}.parquet'))
+
+    def test_export(self):
+        counts = ParquetExporter(path=self.path).export()
+        self.assertEqual(
+            counts.get('potlako_subject.patientcallinitial'),
+            PatientCallInitial.objects.count())
+        self.assertEqual(
+            self.read_table('patientcallinitial').num_rows,
+            PatientCallInitial.objects.count())
+        wide = self.read_table('visits_wide')
+        self.assertIn('patientcallinitial__id', wide.column_names)
+        self.assertIn('appt_status', wide.column_names)
+
+    def test_export_incremental(self):
+        ParquetExporter(path=self.path).export()
+        obj = PatientCallInitial.objects.first()
+        obj.save()
+        ParquetExporter(path=self.path).export()
+        table = self.read_table('patientcallinitial')
+        self.assertEqual(table.num_rows, PatientCallInitial.objects.count())
+        self.assertEqual(
+            table.filter(pc.equal(table['id'], str(obj.pk)))['modified'][0].as_py(),
+            PatientCallInitial.objects.get(pk=obj.pk).modified)
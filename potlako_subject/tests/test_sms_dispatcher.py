@@ -0,0 +1,139 @@
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase, tag
+from django.test.utils import override_settings
+from django_q.models import Schedule
+from edc_base.utils import get_utcnow
+from edc_facility.import_holidays import import_holidays
+from model_mommy import mommy
+
+from ..constants import FAILED, QUEUED, SENDING, SENT
+from ..models import SMS, SmsReminder
+from ..outbox import create_schedules
+from ..sms_dispatcher import RateLimiter, SmsDispatcher, SmsGatewayError
+
+
+class Sender:
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    def send(self, reminder=None, recipient_number=None):
+        if self.fail:
+            raise SmsGatewayError('Gateway unavailable.')
+        self.sent.append((recipient_number, reminder.message))
+
+
+@tag('sms')
+class TestSmsDispatcher(TestCase):
+
+    def setUp(self):
+        import_holidays()
+
+        self.clinicial_call_enrolment = mommy.make_recipe(
+            'potlako_subject.cliniciancallenrollment',
+            facility='mmathethe_clinic')
+
+        subject_screening = mommy.make_recipe(
+            'potlako_subject.subjectscreening',
+            screening_identifier=self.clinicial_call_enrolment.screening_identifier)
+
+        self.subject_consent = mommy.make_recipe(
+            'potlako_subject.subjectconsent',
+            screening_identifier=subject_screening.screening_identifier,
+            consent_datetime=get_utcnow() - relativedelta(days=2),
+            identity=self.clinicial_call_enrolment.national_identity,
+            confirm_identity=self.clinicial_call_enrolment.national_identity,
+            version='1')
+
+    def queue(self, dispatcher):
+        return dispatcher.queue(
+            subject_identifier=self.subject_consent.subject_identifier,
+            appt_datetime=get_utcnow() + relativedelta(days=2),
+            message='Reminder')
+
+    def test_dispatch_sent(self):
+        sender = Sender()
+        dispatcher = SmsDispatcher(sender=sender)
+        reminder = self.queue(dispatcher)
+
+        self.assertEqual(dispatcher.dispatch(), {SENT: 1})
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.delivery_status, SENT)
+        self.assertEqual(sender.sent, [
+            ('267' + self.clinicial_call_enrolment.primary_cell, 'Reminder')])
+        self.assertEqual(
+            [obj.delivery_status for obj in reminder.history.order_by('history_date')],
+            [QUEUED, SENDING, SENT])
+
+    def test_sms_crf_not_written(self):
+        dispatcher = SmsDispatcher(sender=Sender())
+        self.queue(dispatcher)
+        dispatcher.dispatch()
+        self.assertFalse(SMS.objects.exists())
+
+    def test_queue_once_per_appointment(self):
+        dispatcher = SmsDispatcher(sender=Sender())
+        appt_datetime = get_utcnow() + relativedelta(days=2)
+        for _ in range(2):
+            dispatcher.queue(
+                subject_identifier=self.subject_consent.subject_identifier,
+                appt_datetime=appt_datetime,
+                message='Reminder')
+        self.assertEqual(SmsReminder.objects.count(), 1)
+
+    def test_dispatch_not_due(self):
+        dispatcher = SmsDispatcher(sender=Sender())
+        dispatcher.queue(
+            subject_identifier=self.subject_consent.subject_identifier,
+            appt_datetime=get_utcnow() + relativedelta(days=2),
+            message='Reminder',
+            send_datetime=get_utcnow() + relativedelta(days=1))
+        self.assertEqual(dispatcher.dispatch(), {})
+
+    def test_claim_expires(self):
+        dispatcher = SmsDispatcher(sender=Sender())
+        reminder = self.queue(dispatcher)
+        self.assertEqual(dispatcher.claim(), [reminder])
+        self.assertEqual(dispatcher.claim(), [])
+
+        SmsReminder.objects.filter(pk=reminder.pk).update(
+            next_attempt_datetime=get_utcnow())
+        self.assertEqual(dispatcher.dispatch(), {SENT: 1})
+
+    def test_dispatch_retried_then_failed(self):
+        dispatcher = SmsDispatcher(sender=Sender(fail=True), max_attempts=2)
+        reminder = self.queue(dispatcher)
+
+        self.assertEqual(dispatcher.dispatch(), {QUEUED: 1})
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.delivery_attempts, 1)
+        self.assertGreater(reminder.next_attempt_datetime, get_utcnow())
+        self.assertEqual(dispatcher.dispatch(), {})
+
+        reminder.next_attempt_datetime = get_utcnow()
+        reminder.save()
+        self.assertEqual(dispatcher.dispatch(), {FAILED: 1})
+
+    @override_settings(POTLAKO_SMS_SCHEDULE_MINUTES=2)
+    def test_dispatch_scheduled(self):
+        create_schedules()
+        schedule = Schedule.objects.get(
+            func='potlako_subject.sms_dispatcher.dispatch_due_sms')
+        self.assertEqual(schedule.schedule_type, Schedule.MINUTES)
+        self.assertEqual(schedule.minutes, 2)
+        self.assertEqual(schedule.repeats, -1)
+
+    def test_rate_limiter(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        rate_limiter = RateLimiter(
+            rate=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            rate_limiter.wait()
+        self.assertEqual(sleeps, [0.5, 0.5])
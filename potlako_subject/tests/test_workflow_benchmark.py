@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+from unittest import skipUnless
+
+from django.test import TransactionTestCase, tag
+
+from ..benchmark import WorkflowBenchmark
+from ..subject_helper_mixin import SubjectHelperMixin
+
+
+@tag('benchmark')
+@skipUnless(os.environ.get('POTLAKO_BENCHMARK'), 'set POTLAKO_BENCHMARK=1')
+class TestWorkflowBenchmark(SubjectHelperMixin, TransactionTestCase):
+    """Runs the subject workflow for each number of subjects in
+    POTLAKO_BENCHMARK_SIZES, e.g. `10,100,1000,10000`, and writes the
+    checkpoints to POTLAKO_BENCHMARK_WORKFLOW_REPORT.
+
+    Runs outside a test transaction so that each step commits and its
+    on_commit callbacks, e.g. the outbox, are measured with it.
+
+    Fails if the queries of a step grow with the number of subjects.
+    """
+
+    # restore the data of the migrations, e.g. the sites, for the
+    # TestCases that run after this one
+    serialized_rollback = True
+
+    def test_workflow(self):
+        sizes = [int(size) for size in os.environ.get(
+            'POTLAKO_BENCHMARK_SIZES', '10,50,100').split(',')]
+        benchmark = WorkflowBenchmark(helper=self)
+        checkpoints = benchmark.run(sizes)
+        growth = benchmark.growth(checkpoints)
+
+        path = os.environ.get(
+            'POTLAKO_BENCHMARK_WORKFLOW_REPORT',
+            os.path.join(tempfile.gettempdir(), 'workflow_benchmark.json'))
+        with open(path, 'w') as f:
+            json.dump(dict(checkpoints=checkpoints, growth=growth), f, indent=2)
+
+        for name, ratios in growth.items():
+            self.assertLessEqual(
+                ratios['queries'] or 1, 1.1,
+                msg=f'Queries of {name} grow with the number of subjects. See {path}.')
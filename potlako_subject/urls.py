@@ -2,10 +2,12 @@ from django.urls.conf import path
 from django.views.generic.base import RedirectView
 
 from .admin_site import potlako_subject_admin
+from .views import DueCallWorklistView
 
 app_name = 'potlako_subject'
 
 urlpatterns = [
     path('admin/', potlako_subject_admin.urls),
+    path('worklist/', DueCallWorklistView.as_view(), name='due_call_worklist_url'),
     path('', RedirectView.as_view(url='admin/'), name='home_url'),
 ]
@@ -0,0 +1,11 @@
+def chunked(queryset, chunk_size):
+    """Yields lists of rows from a values_list queryset ordered by pk.
+    """
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,27 @@
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.views.generic.base import View
+
+from .due_calls import worklist
+
+
+class DueCallWorklistView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """Returns the due calls up to `due_date` (default today) as JSON,
+    highest priority and earliest due first.
+    """
+
+    permission_required = 'potlako_subject.view_duecall'
+
+    default_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        due_date = parse_date(request.GET.get('due_date') or '')
+        try:
+            limit = int(request.GET.get('limit') or self.default_limit)
+        except ValueError:
+            limit = self.default_limit
+        due_calls = worklist(due_date=due_date).values(
+            'subject_identifier', 'screening_identifier', 'source',
+            'due_date', 'priority')[:limit]
+        return JsonResponse({'results': list(due_calls)})
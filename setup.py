@@ -22,6 +22,7 @@ setup(
     description='Potlako Plus Subject',
     long_description=README,
     zip_safe=False,
+    extras_require={'parquet': ['pyarrow']},
     keywords='django potlako plus',
     classifiers=[
         'Environment :: Web Environment',